@@ -0,0 +1,120 @@
+"""partition_audit_tables
+
+Revision ID: a3f1c9d27e64
+Revises: 50b9f558bd97
+Create Date: 2026-10-18 10:12:41.518203
+
+Converts the append-only audit tables into tables range partitioned by month on created_at.
+
+Postgres cannot partition a table in place, so each table is renamed, recreated as a partitioned parent with the
+same columns, backfilled and dropped. The primary key becomes (id, created_at) since a partitioned table's unique
+constraints must include the partition key, and foreign keys that point *at* an audit table are dropped because
+Postgres 11 does not support them on partitioned tables. Foreign keys from the audit tables to the regular tables
+(workflow, contact, queue, ...) and all secondary indexes are carried over.
+
+Each table also gets a DEFAULT partition, so rows outside the monthly partitions are still accepted when
+`flask partitions create` (run with every migration, see bin/entrypoint.sh) falls behind.
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+from ivr_gateway.partitions import AUDIT_PARTITIONED_TABLES, add_months, create_default_partition_statement, \
+    create_partition_statement, month_start
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f1c9d27e64'
+down_revision = '50b9f558bd97'
+branch_labels = None
+depends_on = None
+
+# Number of monthly partitions created ahead of the current month, `flask partitions create` keeps this topped up
+MONTHS_AHEAD = 3
+
+# Restored by downgrade, upgrade drops whatever foreign keys reference the audit tables at the time
+CROSS_AUDIT_FOREIGN_KEYS = (
+    # (constraint name, table, column, referenced table, ondelete)
+    ('step_state_step_run_id_fkey', 'step_state', 'step_run_id', 'step_run', 'CASCADE'),
+    ('workflow_step_run_workflow_run_id_fkey', 'workflow_step_run', 'workflow_run_id', 'workflow_run', None),
+    ('workflow_step_run_step_run_id_fkey', 'workflow_step_run', 'step_run_id', 'step_run', None),
+    ('workflow_step_run_step_state_id_fkey', 'workflow_step_run', 'step_state_id', 'step_state', None),
+    # Created on call_leg, renaming the table to contact_leg kept the constraint name
+    ('call_leg_workflow_run_id_fkey', 'contact_leg', 'workflow_run_id', 'workflow_run', None),
+)
+
+
+def _index_definitions(bind, table):
+    return [row[0] for row in bind.execute(sa.text(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = :table AND indexname <> :pkey"
+    ), table=table, pkey=f"{table}_pkey").fetchall()]
+
+
+def _foreign_key_definitions(bind, table):
+    return [(row[0], row[1]) for row in bind.execute(sa.text(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+    ), table=table).fetchall()]
+
+
+def _referencing_foreign_keys(bind, tables):
+    return [(row[0], row[1]) for row in bind.execute(sa.text(
+        "SELECT conname, CAST(CAST(conrelid AS regclass) AS text) FROM pg_constraint "
+        "WHERE contype = 'f' AND confrelid = ANY(CAST(:tables AS regclass[]))"
+    ), tables=list(tables)).fetchall()]
+
+
+def _rebuild_table(bind, table, partitioned):
+    indexes = _index_definitions(bind, table)
+    foreign_keys = _foreign_key_definitions(bind, table)
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_rebuild")
+    if partitioned:
+        op.execute(f"CREATE TABLE {table} (LIKE {table}_rebuild INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)")
+        oldest = bind.execute(sa.text(f"SELECT min(created_at) FROM {table}_rebuild")).scalar()
+        current_month = month_start(datetime.utcnow())
+        month = month_start(oldest) if oldest is not None else current_month
+        while month <= add_months(current_month, MONTHS_AHEAD):
+            op.execute(create_partition_statement(table, month))
+            month = add_months(month, 1)
+        op.execute(create_default_partition_statement(table))
+    else:
+        op.execute(f"CREATE TABLE {table} (LIKE {table}_rebuild INCLUDING DEFAULTS)")
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_rebuild")
+    op.execute(f"DROP TABLE {table}_rebuild")
+    if partitioned:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, created_at)")
+    else:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)")
+    for index in indexes:
+        op.execute(index)
+    for name, definition in foreign_keys:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+
+
+def upgrade():
+    bind = op.get_bind()
+    for name, table in _referencing_foreign_keys(bind, AUDIT_PARTITIONED_TABLES):
+        op.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"')
+
+    op.add_column('workflow_step_run', sa.Column('created_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE workflow_step_run SET created_at = workflow_run.created_at "
+               "FROM workflow_run WHERE workflow_run.id = workflow_step_run.workflow_run_id")
+
+    for table in AUDIT_PARTITIONED_TABLES:
+        # The partition key can't be null, rows without a timestamp are filed under the migration date
+        op.execute(f"UPDATE {table} SET created_at = now() at time zone 'utc' WHERE created_at IS NULL")
+        op.alter_column(table, 'created_at', nullable=False)
+        _rebuild_table(bind, table, partitioned=True)
+
+
+def downgrade():
+    bind = op.get_bind()
+    for table in AUDIT_PARTITIONED_TABLES:
+        _rebuild_table(bind, table, partitioned=False)
+        op.alter_column(table, 'created_at', nullable=True)
+
+    op.drop_column('workflow_step_run', 'created_at')
+
+    for name, table, column, referenced_table, ondelete in CROSS_AUDIT_FOREIGN_KEYS:
+        op.create_foreign_key(name, table, referenced_table, [column], ['id'], ondelete=ondelete)
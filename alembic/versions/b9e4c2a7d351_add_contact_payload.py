@@ -0,0 +1,40 @@
+"""add_contact_payload
+
+Revision ID: b9e4c2a7d351
+Revises: f2b6d81a4c37
+Create Date: 2026-10-18 17:12:40.318052
+
+Vendor payloads (customer summary and customer lookup) move out of contact.session into their own table. Payloads
+already in a session are left there and still read as a fallback.
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy_utils
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'b9e4c2a7d351'
+down_revision = 'f2b6d81a4c37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('contact_payload',
+    sa.Column('encryption_key_fingerprint', sa.String(), nullable=False),
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('contact_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('payload_type', sa.String(), nullable=False),
+    sa.Column('payload', sqlalchemy_utils.types.encrypted.encrypted_type.StringEncryptedType(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['contact_id'], ['contact.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('contact_id', 'payload_type', name='contact_payload_type_unique_constraint')
+    )
+    op.create_index(op.f('ix_contact_payload_contact_id'), 'contact_payload', ['contact_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_contact_payload_contact_id'), table_name='contact_payload')
+    op.drop_table('contact_payload')
@@ -0,0 +1,38 @@
+"""add_webhook_response
+
+Revision ID: c81e4d0f5a92
+Revises: a3f1c9d27e64
+Create Date: 2026-10-18 14:02:17.380511
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import sqlalchemy_utils
+
+# revision identifiers, used by Alembic.
+revision = 'c81e4d0f5a92'
+down_revision = 'a3f1c9d27e64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('webhook_response',
+    sa.Column('encryption_key_fingerprint', sa.String(), nullable=False),
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('call_sid', sa.String(), nullable=False),
+    sa.Column('endpoint', sa.String(), nullable=False),
+    sa.Column('payload_hash', sa.String(length=64), nullable=False),
+    sa.Column('response', sqlalchemy_utils.types.encrypted.encrypted_type.StringEncryptedType(), nullable=True),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('call_sid', 'endpoint', 'payload_hash', name='webhook_response_request_unique_constraint')
+    )
+    op.create_index(op.f('ix_webhook_response_created_at'), 'webhook_response', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_webhook_response_created_at'), table_name='webhook_response')
+    op.drop_table('webhook_response')
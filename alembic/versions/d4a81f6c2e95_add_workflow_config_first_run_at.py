@@ -0,0 +1,34 @@
+"""add_workflow_config_first_run_at
+
+Revision ID: d4a81f6c2e95
+Revises: b9e4c2a7d351
+Create Date: 2026-10-18 17:48:03.552910
+
+Configs that have been run are immutable. The marker replaces counting their runs on every update of a config.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd4a81f6c2e95'
+down_revision = 'b9e4c2a7d351'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('workflow_config', sa.Column('first_run_at', sa.DateTime(), nullable=True))
+    op.execute("""
+        UPDATE workflow_config
+        SET first_run_at = runs.first_run_at
+        FROM (
+            SELECT workflow_config_id, min(created_at) AS first_run_at
+            FROM workflow_run
+            GROUP BY workflow_config_id
+        ) AS runs
+        WHERE workflow_config.id = runs.workflow_config_id
+    """)
+
+
+def downgrade():
+    op.drop_column('workflow_config', 'first_run_at')
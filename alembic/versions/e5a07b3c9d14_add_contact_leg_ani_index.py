@@ -0,0 +1,23 @@
+"""add_contact_leg_ani_index
+
+Revision ID: e5a07b3c9d14
+Revises: c81e4d0f5a92
+Create Date: 2026-10-18 15:21:44.902137
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e5a07b3c9d14'
+down_revision = 'c81e4d0f5a92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_contact_leg_ani_created_at', 'contact_leg', ['ani', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_contact_leg_ani_created_at', table_name='contact_leg')
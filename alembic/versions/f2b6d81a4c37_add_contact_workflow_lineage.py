@@ -0,0 +1,65 @@
+"""add_contact_workflow_lineage
+
+Revision ID: f2b6d81a4c37
+Revises: e5a07b3c9d14
+Create Date: 2026-10-18 16:05:09.114620
+
+Contacts now carry the names (and config versions) of the workflows run for them. Only contacts from the last day are
+backfilled, lineage is only read while a call is in progress.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'f2b6d81a4c37'
+down_revision = 'e5a07b3c9d14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('contact', sa.Column('visited_workflows', postgresql.ARRAY(sa.String()), server_default='{}',
+                                       nullable=False))
+    op.add_column('contact', sa.Column('visited_workflow_configs', postgresql.ARRAY(sa.String()), server_default='{}',
+                                       nullable=False))
+    # Ordered by when each workflow (and config) was first entered, as record_workflow_visit appends them
+    op.execute("""
+        WITH visit AS (
+            SELECT contact_leg.contact_id,
+                   workflow.workflow_name,
+                   workflow.workflow_name || ':' ||
+                       coalesce(workflow_config.tag, workflow_config.step_tree_sha) AS workflow_config,
+                   contact_leg.created_at
+            FROM contact_leg
+            JOIN workflow_run ON workflow_run.id = contact_leg.workflow_run_id
+            JOIN workflow ON workflow.id = workflow_run.workflow_id
+            JOIN workflow_config ON workflow_config.id = workflow_run.workflow_config_id
+            WHERE contact_leg.created_at > now() - interval '1 day'
+        ), workflows AS (
+            SELECT contact_id, array_agg(workflow_name ORDER BY first_seen) AS workflows
+            FROM (
+                SELECT contact_id, workflow_name, min(created_at) AS first_seen
+                FROM visit
+                GROUP BY contact_id, workflow_name
+            ) AS first_visit
+            GROUP BY contact_id
+        ), configs AS (
+            SELECT contact_id, array_agg(workflow_config ORDER BY first_seen) AS configs
+            FROM (
+                SELECT contact_id, workflow_config, min(created_at) AS first_seen
+                FROM visit
+                GROUP BY contact_id, workflow_config
+            ) AS first_visit
+            GROUP BY contact_id
+        )
+        UPDATE contact
+        SET visited_workflows = workflows.workflows, visited_workflow_configs = configs.configs
+        FROM workflows
+        JOIN configs ON configs.contact_id = workflows.contact_id
+        WHERE contact.id = workflows.contact_id
+    """)
+
+def downgrade():
+    op.drop_column('contact', 'visited_workflow_configs')
+    op.drop_column('contact', 'visited_workflows')
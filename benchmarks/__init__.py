@@ -0,0 +1,81 @@
+"""
+Micro-benchmarks for the engine and step hot paths.
+
+Run with `flask benchmark run`, results are compared against benchmarks/baseline.json. Bump SUITE_VERSION whenever a
+case changes what it measures so stale baselines are not compared against.
+"""
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import orm
+
+SUITE_VERSION = 1
+
+
+class BenchmarkCase(NamedTuple):
+    """
+    :param name: unique, stable identifier the baseline is keyed by
+    :param setup: called once with a database session, returns the callable to time. When per_call_setup is set it
+                  instead returns a callable that prepares (untimed) and returns a fresh callable for every iteration,
+                  for cases that consume the state they run against
+    :param per_call_setup:
+    """
+    name: str
+    setup: Callable[[orm.Session], Callable[[], Any]]
+    per_call_setup: bool = False
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    seconds_per_call: float
+    baseline: Optional[float] = None
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if not self.baseline:
+            return None
+        return self.seconds_per_call / self.baseline
+
+
+def measure(case: BenchmarkCase, db_session: orm.Session, rounds: int = 5, min_round_time: float = 0.1) -> float:
+    """
+    Times a benchmark case, returning the best mean time per call over all rounds
+
+    :param case:
+    :param db_session:
+    :param rounds: number of timed rounds
+    :param min_round_time: the number of calls per round is calibrated so a round takes at least this long
+    :return: seconds per call
+    """
+    target = case.setup(db_session)
+    timed = target() if case.per_call_setup else target
+    started = time.perf_counter()
+    timed()
+    calls_per_round = max(1, int(min_round_time / max(time.perf_counter() - started, 1e-9)))
+
+    best = float("inf")
+    for _ in range(rounds):
+        elapsed = 0.0
+        if case.per_call_setup:
+            for _ in range(calls_per_round):
+                timed = target()
+                started = time.perf_counter()
+                timed()
+                elapsed += time.perf_counter() - started
+        else:
+            started = time.perf_counter()
+            for _ in range(calls_per_round):
+                timed()
+            elapsed = time.perf_counter() - started
+        best = min(best, elapsed / calls_per_round)
+    return best
+
+
+def find_regressions(results: List[BenchmarkResult], threshold: float) -> List[BenchmarkResult]:
+    return [result for result in results if result.ratio is not None and result.ratio > 1 + threshold]
+
+
+def baseline_results(baseline: Optional[dict]) -> Dict[str, float]:
+    if not baseline or baseline.get("suite_version") != SUITE_VERSION:
+        return {}
+    return baseline.get("results", {})
@@ -0,0 +1,25 @@
+from datetime import time
+
+from sqlalchemy import orm
+
+from benchmarks import BenchmarkCase
+from ivr_gateway.services.calls import CallService
+from ivr_gateway.services.queues import QueueService, QueueStatusService
+from tests.factories import queues as qf
+
+
+def _queue_status_setup(db_session: orm.Session):
+    queue = qf.queue_factory(db_session).create(
+        name="benchmark.queue",
+        hours_of_operation=[
+            {"day_of_week": day, "start_time": time(0, 0), "end_time": time(23, 59)} for day in range(7)
+        ],
+    )
+    queue_status_service = QueueStatusService(CallService(db_session), QueueService(db_session))
+    return lambda: queue_status_service.get_current_transfer_routing_mode_and_maybe_holiday_for_queue(queue, "CISCO")
+
+
+CASES = [
+    BenchmarkCase("services.QueueStatusService.get_current_transfer_routing_mode_and_maybe_holiday_for_queue",
+                  _queue_status_setup),
+]
@@ -0,0 +1,67 @@
+"""
+Cold start measurements for a web worker, every run imports the app in a fresh interpreter.
+"""
+import os
+import subprocess  # nosec
+import sys
+from typing import List, NamedTuple, Optional
+
+STARTUP_MODULE = "ivr_gateway.app"
+# Printed by the child once the import finishes, ru_maxrss is in kilobytes on linux
+_MEASURE_SCRIPT = (
+    "import resource, time\n"
+    "started = time.perf_counter()\n"
+    "import {module}\n"
+    "print(time.perf_counter() - started, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+)
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+class StartupProfile(NamedTuple):
+    seconds: float
+    max_rss_kb: int
+    import_times: List[ImportTime]
+
+
+def parse_import_times(stderr: str) -> List[ImportTime]:
+    """
+    Parses the report written by `python -X importtime`, lines look like
+
+        import time:       412 |       1804 |   ivr_gateway.steps.inputs
+
+    :param stderr:
+    :return: one entry per imported module, in import order
+    """
+    import_times = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            # header line
+            continue
+        import_times.append(ImportTime(module.strip(), int(self_us), int(cumulative_us)))
+    return import_times
+
+
+def profile_startup(module: str = STARTUP_MODULE, env: Optional[dict] = None) -> StartupProfile:
+    """
+    Imports the module in a new interpreter the way a gunicorn worker would
+
+    :param module:
+    :param env: extra environment variables for the child
+    :return:
+    """
+    child_env = dict(os.environ, GUNICORN_WEBSERVER_ENABLED="true")
+    child_env.update(env or {})
+    completed = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", _MEASURE_SCRIPT.format(module=module)],
+        env=child_env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    seconds, max_rss_kb = completed.stdout.strip().splitlines()[-1].split()
+    return StartupProfile(float(seconds), int(max_rss_kb), parse_import_times(completed.stderr))
@@ -0,0 +1,121 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Type
+
+from sqlalchemy import orm
+
+from benchmarks import BenchmarkCase
+from ivr_gateway.adapters.livevox import LiveVoxRequestAdapter
+from ivr_gateway.adapters.ssml import SSML
+from ivr_gateway.dates import DTMF_DATE_FORMAT, parse_date
+from ivr_gateway.steps.action import NumberedStepAction, StepAction
+from ivr_gateway.steps.api.v1 import PlayMessageStep
+from ivr_gateway.steps.inputs import BirthdayInput, CardPaymentDateInput, CompoundStepInput, CurrencyInput, \
+    CurrencyTextInput, DateInput, IntegerInput, Last4CreditCardInput, Last4SSNInput, MenuActionInput, \
+    NumberedMenuActionInput, PhoneNumberInput, SSNInput, StepInput, StringInput, TextInput, ZipCodeInput
+
+# Input value and constructor kwargs that bind successfully for every concrete input type
+INPUT_SAMPLES: Dict[Type[StepInput], Callable[[], Dict[str, Any]]] = {
+    StringInput: lambda: {"input_value": "1234"},
+    TextInput: lambda: {"input_value": "  Hello There "},
+    IntegerInput: lambda: {"input_value": "42"},
+    DateInput: lambda: {"input_value": "01151990"},
+    BirthdayInput: lambda: {"input_value": "01151990"},
+    CardPaymentDateInput: lambda: {"input_value": (date.today() + timedelta(days=1)).strftime("%m%d%Y")},
+    SSNInput: lambda: {"input_value": "123456789"},
+    Last4SSNInput: lambda: {"input_value": "6789"},
+    Last4CreditCardInput: lambda: {"input_value": "4321"},
+    CurrencyInput: lambda: {"input_value": "25*50"},
+    CurrencyTextInput: lambda: {"input_value": "$1,025.50"},
+    PhoneNumberInput: lambda: {"input_value": "5555551234"},
+    ZipCodeInput: lambda: {"input_value": "10001"},
+    MenuActionInput: lambda: {"input_value": "2", "menu_actions": [
+        StepAction("application", "For questions about an application"),
+        StepAction("existing", "For questions about an existing product"),
+    ]},
+    NumberedMenuActionInput: lambda: {"input_value": "2", "menu_actions": {
+        1: NumberedStepAction("application", "For questions about an application", number="1"),
+        2: NumberedStepAction("existing", "For questions about an existing product", number="2"),
+    }},
+    CompoundStepInput: lambda: {"input_value": "5555551234",
+                                "compound_types": [Last4SSNInput, SSNInput, PhoneNumberInput]},
+}
+
+MESSAGE_TEMPLATE = (
+    "Your payment of {{ session.amount | currency }} for the card ending in "
+    "{{ session.card_number | last_characters(4) | individual }} is scheduled for "
+    "{{ session.payment_date | date_with_day }}. Your confirmation number is "
+    "{{ session.confirmation | grouped([3, 3, 4]) }}."
+)
+MESSAGE_SESSION = {
+    "amount": 12550,
+    "card_number": "4111111111111234",
+    "payment_date": "2021-09-15",
+    "confirmation": "1234567890",
+}
+
+
+def _input_bind_case(input_cls: Type[StepInput]) -> BenchmarkCase:
+    def setup(db_session: orm.Session):
+        sample = INPUT_SAMPLES[input_cls]()
+
+        def run():
+            input_cls(input_key="benchmark", **sample).bind()
+
+        return run
+
+    return BenchmarkCase(f"steps.inputs.{input_cls.__name__}.bind", setup)
+
+
+def _play_message_setup(db_session: orm.Session):
+    step = PlayMessageStep("benchmark-message", template=MESSAGE_TEMPLATE)
+    # message only reads the session off the step run's workflow run
+    step.step_run = SimpleNamespace(workflow_run=SimpleNamespace(session=MESSAGE_SESSION))
+    return lambda: step.message
+
+
+def _ssml_setup(db_session: orm.Session):
+    def run():
+        SSML('<speak>Thank you for calling. <break time="500ms"/> Please listen closely.</speak>')
+        SSML("Your balance is $125.50, to make a payment press 1.")
+
+    return run
+
+
+def _update_text_array_setup(db_session: orm.Session):
+    sentence = "Your payment of $125.50 for the loan ending in 1234 is scheduled for Wednesday, September 15, 2021."
+
+    def run():
+        text_array = [""]
+        for i in range(10):
+            LiveVoxRequestAdapter.update_text_array(text_array, sentence, start_new_message=(i % 4 == 0))
+
+    return run
+
+
+def _parse_date_setup(db_session: orm.Session):
+    def run():
+        parse_date("01151990", date_formats=[DTMF_DATE_FORMAT])
+        parse_date("2021-09-15")
+
+    return run
+
+
+def _dateparser_setup(db_session: orm.Session):
+    # The same dates through dateparser, as parsed before the strict formats were tried first
+    import dateparser
+
+    def run():
+        dateparser.parse("01151990", date_formats=[DTMF_DATE_FORMAT])
+        dateparser.parse("2021-09-15")
+
+    return run
+
+
+CASES = [_input_bind_case(input_cls) for input_cls in INPUT_SAMPLES] + [
+    BenchmarkCase("steps.PlayMessageStep.message", _play_message_setup),
+    BenchmarkCase("adapters.SSML", _ssml_setup),
+    BenchmarkCase("adapters.LiveVoxRequestAdapter.update_text_array", _update_text_array_setup),
+    BenchmarkCase("dates.parse_date", _parse_date_setup),
+    BenchmarkCase("dates.dateparser", _dateparser_setup),
+]
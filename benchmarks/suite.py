@@ -0,0 +1,3 @@
+from benchmarks import queues, steps, workflows
+
+SUITE = steps.CASES + workflows.CASES + queues.CASES
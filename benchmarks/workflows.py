@@ -0,0 +1,198 @@
+from sqlalchemy import orm
+
+from benchmarks import BenchmarkCase
+from ivr_gateway.engines.workflows import WorkflowEngine
+from ivr_gateway.exit_paths import HangUpExitPath
+from ivr_gateway.models.workflows import Workflow, WorkflowRun
+from ivr_gateway.services.workflows import WorkflowService
+from ivr_gateway.steps.api.v1 import BooleanLogicStep, BranchMapWorkflowStep, DecisionTableStep, \
+    NumberedInputActionStep, PlayMessageStep
+from ivr_gateway.steps.config import Step, StepBranch, StepTree
+from tests.factories import workflow as wcf
+
+benchmark_step_tree = StepTree(
+    branches=[
+        StepBranch(
+            name="root",
+            steps=[
+                Step(
+                    name="greeting",
+                    step_type=PlayMessageStep.get_type_string(),
+                    step_kwargs={
+                        "template": "Thanks for calling {{ session.get('company', 'us') }}.",
+                    },
+                ),
+                Step(
+                    name="menu",
+                    step_type=NumberedInputActionStep.get_type_string(),
+                    step_kwargs={
+                        "input_key": "inquiry",
+                        "actions": [
+                            {"name": "application", "display_name": "For questions about an application",
+                             "number": "1"},
+                            {"name": "existing", "display_name": "For questions about an existing product",
+                             "number": "2"},
+                            {"name": "repeat", "display_name": "To hear this again", "number": "9",
+                             "is_replay": True},
+                        ]
+                    },
+                ),
+                Step(
+                    name="goodbye",
+                    step_type=PlayMessageStep.get_type_string(),
+                    step_kwargs={
+                        "template": "Goodbye.",
+                    },
+                    exit_path={
+                        "exit_path_type": HangUpExitPath.get_type_string(),
+                    },
+                ),
+            ]
+        )
+    ]
+)
+
+
+# Routes a caller with neither a card nor a loan to the "other" branch, the worst case for both forms: every rule is
+# evaluated
+ROUTING_SESSION = {"card_count": 0, "loan_id": None}
+ROUTED_BRANCHES = [
+    StepBranch(
+        name=branch_name,
+        steps=[
+            Step(
+                name=f"{branch_name}-message",
+                step_type=PlayMessageStep.get_type_string(),
+                step_kwargs={"template": f"Routed to {branch_name}."},
+                exit_path={"exit_path_type": HangUpExitPath.get_type_string()},
+            )
+        ]
+    )
+    for branch_name in ("card", "loan", "other")
+]
+
+chained_routing_step_tree = StepTree(
+    branches=[
+        StepBranch(
+            name="root",
+            steps=[
+                Step(
+                    name="has-card",
+                    step_type=BooleanLogicStep.get_type_string(),
+                    step_kwargs={"fieldset": ["session.card_count", 0], "op": ">", "result_field": "has_card"},
+                ),
+                Step(
+                    name="branch-on-card",
+                    step_type=BranchMapWorkflowStep.get_type_string(),
+                    step_kwargs={"field": "session.has_card", "branches": {"True": "card"},
+                                 "default_branch": "check_loan"},
+                ),
+            ]
+        ),
+        StepBranch(
+            name="check_loan",
+            steps=[
+                Step(
+                    name="has-loan",
+                    step_type=BooleanLogicStep.get_type_string(),
+                    step_kwargs={"fieldset": ["session.loan_id"], "op": "nonnull", "result_field": "has_loan"},
+                ),
+                Step(
+                    name="branch-on-loan",
+                    step_type=BranchMapWorkflowStep.get_type_string(),
+                    step_kwargs={"field": "session.has_loan", "branches": {"True": "loan"}, "default_branch": "other"},
+                ),
+            ]
+        ),
+        *ROUTED_BRANCHES,
+    ]
+)
+
+decision_table_routing_step_tree = StepTree(
+    branches=[
+        StepBranch(
+            name="root",
+            steps=[
+                Step(
+                    name="route",
+                    step_type=DecisionTableStep.get_type_string(),
+                    step_kwargs={
+                        "rules": [
+                            {"fieldset": ["session.card_count", 0], "op": ">", "branch": "card"},
+                            {"fieldset": ["session.loan_id"], "op": "nonnull", "branch": "loan"},
+                        ],
+                        "default_branch": "other",
+                    },
+                ),
+            ]
+        ),
+        *ROUTED_BRANCHES,
+    ]
+)
+
+
+def _workflow(db_session: orm.Session) -> Workflow:
+    return wcf.workflow_factory(db_session, "benchmark.workflow", step_tree=benchmark_step_tree).create()
+
+
+def _initialized_engine(db_session: orm.Session, workflow: Workflow, session: dict = None) -> WorkflowEngine:
+    workflow_run = WorkflowRun(workflow=workflow, workflow_config=workflow.latest_config, session=dict(session or {}))
+    db_session.add(workflow_run)
+    db_session.commit()
+    engine = WorkflowEngine(db_session, workflow_run)
+    engine.initialize()
+    return engine
+
+
+def _create_step_setup(db_session: orm.Session):
+    engine = _initialized_engine(db_session, _workflow(db_session))
+    workflow_service = WorkflowService(db_session)
+    return lambda: workflow_service.create_step_for_workflow(engine.workflow_run, "menu", branch_name="root")
+
+
+def _process_step_result_setup(db_session: orm.Session):
+    engine = _initialized_engine(db_session, _workflow(db_session))
+    workflow_service = WorkflowService(db_session)
+    return lambda: workflow_service.process_step_result(engine.workflow_run)
+
+
+def _run_current_workflow_step_setup(db_session: orm.Session):
+    workflow = _workflow(db_session)
+
+    def prepare():
+        engine = _initialized_engine(db_session, workflow)
+        return engine.run_current_workflow_step
+
+    return prepare
+
+
+def _routing_setup(workflow_name: str, step_tree: StepTree):
+    def setup(db_session: orm.Session):
+        workflow = wcf.workflow_factory(db_session, workflow_name, step_tree=step_tree).create()
+
+        def prepare():
+            engine = _initialized_engine(db_session, workflow, session=ROUTING_SESSION)
+
+            def route():
+                # Run the routing steps until the routed branch's message is up
+                while not isinstance(engine.get_current_step(), PlayMessageStep):
+                    engine.run_current_workflow_step()
+
+            return route
+
+        return prepare
+
+    return setup
+
+
+CASES = [
+    BenchmarkCase("services.WorkflowService.create_step_for_workflow", _create_step_setup),
+    BenchmarkCase("services.WorkflowService.process_step_result", _process_step_result_setup),
+    BenchmarkCase("engines.WorkflowEngine.run_current_workflow_step", _run_current_workflow_step_setup,
+                  per_call_setup=True),
+    BenchmarkCase("engines.WorkflowEngine.routing.chained",
+                  _routing_setup("benchmark.routing.chained", chained_routing_step_tree), per_call_setup=True),
+    BenchmarkCase("engines.WorkflowEngine.routing.decision_table",
+                  _routing_setup("benchmark.routing.decision_table", decision_table_routing_step_tree),
+                  per_call_setup=True),
+]
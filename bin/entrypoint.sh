@@ -3,13 +3,16 @@
 set -ea
 set +x
 
+# gunicorn's default access log format plus the per-request database totals from ivr_gateway.logger.BearerLogger
+ACCESS_LOG_FORMAT='%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" db_statements=%(db_statements)s db_commits=%(db_commits)s db_rows=%(db_rows)s db_ms=%(db_time)s'
+
 if [ "$1" = 'web' ]; then
   export GUNICORN_WEBSERVER_ENABLED="true"
-  exec gunicorn -t 60 -w 2 --logger-class=ivr_gateway.logger.BearerLogger --log-level="$LOG_LEVEL" --access-logfile=- --error-logfile=- -b 0.0.0.0:9000 ivr_gateway.app:app --reload
+  exec gunicorn -c gunicorn.conf.py -t 60 -w 2 --logger-class=ivr_gateway.logger.BearerLogger --log-level="$LOG_LEVEL" --access-logfile=- --access-logformat="$ACCESS_LOG_FORMAT" --error-logfile=- -b 0.0.0.0:9000 ivr_gateway.app:app --reload
 elif [ "$1" = 'prod_web' ]; then
   export GUNICORN_WEBSERVER_ENABLED="true"
   # exec gunicorn -t 60 -w 2 --worker-class=gevent --worker-connections=500 --log-level=info --access-logfile=- --error-logfile=- -b 0.0.0.0:9000 ivr_gateway.app:app
-  exec gunicorn -t 60 -w 3 --logger-class=ivr_gateway.logger.BearerLogger --log-level="$LOG_LEVEL" --access-logfile=- --error-logfile=- -b 0.0.0.0:9000 ivr_gateway.app:app
+  exec gunicorn -c gunicorn.conf.py -t 60 -w 3 --logger-class=ivr_gateway.logger.BearerLogger --log-level="$LOG_LEVEL" --access-logfile=- --access-logformat="$ACCESS_LOG_FORMAT" --error-logfile=- -b 0.0.0.0:9000 ivr_gateway.app:app
 elif [ "$1" = 'test' ]; then
   pipenv install --dev
   pipenv run tox .env.test
@@ -23,7 +26,12 @@ elif [ "$1" = 'create_revision' ]; then
   PYTHONPATH=. exec alembic revision --autogenerate -m "$2"
 elif [ "$1" = 'db_migrate' ]; then
   bin/wait_for_postgres.sh
-  PYTHONPATH=. exec alembic upgrade head
+  PYTHONPATH=. alembic upgrade head
+  # Every deploy tops up the monthly audit table partitions, partitions_create is meant for a monthly scheduled job
+  PYTHONPATH=. FLASK_APP=ivr_gateway.app:app exec flask partitions create
+elif [ "$1" = 'partitions_create' ]; then
+  bin/wait_for_postgres.sh
+  PYTHONPATH=. FLASK_APP=ivr_gateway.app:app exec flask partitions create
 elif [ "$1" = 'db_downgrade' ]; then
   revision=${2:-"-1"}
   bin/wait_for_postgres.sh
@@ -1,13 +1,19 @@
 from flask import Flask
 from commands.admin.admin_user import Admin
+from commands.benchmark import Benchmark
 from commands.db import Db
+from commands.load_test import LoadTest
+from commands.partitions import Partitions
 from commands.scaffold import Scaffold
 from commands.update import Update
 
 cli_command_class_registry = [
     Admin,
+    Benchmark,
     Scaffold,
     Db,
+    LoadTest,
+    Partitions,
     Update
 ]
 
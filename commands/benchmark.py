@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+from typing import Optional
+
+import click
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks import SUITE_VERSION, BenchmarkResult, baseline_results, find_regressions, measure
+from commands.base import Base
+from ivr_gateway.db import create_sqlalchemy_engine, get_sqlalchemy_url
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks", "baseline.json")
+
+
+class Benchmark(Base):
+
+    @click.command(help="Run the micro-benchmark suite and compare it against the stored baseline")
+    @click.option("--baseline", "baseline_path", default=DEFAULT_BASELINE_PATH, show_default=True,
+                  type=click.Path(dir_okay=False))
+    @click.option("--threshold", default=0.2, show_default=True, type=click.FLOAT,
+                  help="Fail when a case is this much slower than its baseline (0.2 == 20%).")
+    @click.option("--rounds", default=5, show_default=True, type=click.IntRange(1))
+    @click.option("--filter", "name_filter", default=None, type=click.STRING,
+                  help="Only run cases whose name contains this string.")
+    @click.option("--update-baseline", is_flag=True, default=False,
+                  help="Write these results as the new baseline instead of comparing.")
+    def run(self, baseline_path: str, threshold: float, rounds: int, name_filter: Optional[str],
+            update_baseline: bool) -> None:
+        if os.getenv("IVR_APP_ENV") not in ["local", "dev", "test"]:
+            click.echo("Exiting because command cannot be run in production mode")
+            sys.exit(1)
+        from benchmarks.suite import SUITE
+
+        baseline = None
+        if os.path.exists(baseline_path):
+            with open(baseline_path) as f:
+                baseline = json.load(f)
+        baseline_by_name = baseline_results(baseline)
+        if baseline is not None and not baseline_by_name:
+            click.echo(f"Ignoring baseline for suite version {baseline.get('suite_version')}, "
+                       f"current version is {SUITE_VERSION}")
+
+        cases = [case for case in SUITE if name_filter is None or name_filter in case.name]
+        # Everything the cases write is rolled back, the engine commits only release a nested transaction
+        connection = create_sqlalchemy_engine(get_sqlalchemy_url()).connect()
+        transaction = connection.begin()
+        db_session = sessionmaker(bind=connection, expire_on_commit=False)()
+        results = []
+        try:
+            for case in cases:
+                result = BenchmarkResult(case.name, measure(case, db_session, rounds=rounds),
+                                         baseline_by_name.get(case.name))
+                results.append(result)
+                ratio = f"{result.ratio:6.2f}x" if result.ratio is not None else "    n/a"
+                click.echo(f"{result.name:<100}{result.seconds_per_call * 1e6:>12.1f} us {ratio}")
+        finally:
+            db_session.close()
+            transaction.rollback()
+            connection.close()
+
+        if update_baseline:
+            merged = dict(baseline_by_name)
+            merged.update({result.name: result.seconds_per_call for result in results})
+            with open(baseline_path, "w") as f:
+                json.dump({"suite_version": SUITE_VERSION, "results": merged}, f, indent=2, sort_keys=True)
+            click.echo(f"Baseline written to {baseline_path}")
+            return
+
+        regressions = find_regressions(results, threshold)
+        for result in regressions:
+            click.echo(f"REGRESSION {result.name}: {result.ratio:.2f}x baseline")
+        if regressions:
+            sys.exit(1)
+
+    @click.command(help="Measure web worker cold start time and RSS and report the slowest imports")
+    @click.option("--module", default=None, type=click.STRING, help="Module to import, defaults to the web app.")
+    @click.option("--runs", default=3, show_default=True, type=click.IntRange(1))
+    @click.option("--top", default=20, show_default=True, type=click.IntRange(0),
+                  help="Number of modules to list by their own import time.")
+    @click.option("--max-seconds", default=None, type=click.FLOAT, help="Fail when the best cold start is slower.")
+    @click.option("--max-rss-mb", default=None, type=click.FLOAT, help="Fail when the worker uses more memory.")
+    def startup(self, module: Optional[str], runs: int, top: int, max_seconds: Optional[float],
+                max_rss_mb: Optional[float]) -> None:
+        from benchmarks.startup import STARTUP_MODULE, profile_startup
+
+        profiles = [profile_startup(module or STARTUP_MODULE) for _ in range(runs)]
+        best = min(profiles, key=lambda profile: profile.seconds)
+        rss_mb = max(profile.max_rss_kb for profile in profiles) / 1024
+        click.echo(f"cold start: {best.seconds * 1000:.1f} ms, max rss: {rss_mb:.1f} MB, "
+                   f"{len(best.import_times)} modules imported")
+        for import_time in sorted(best.import_times, key=lambda i: i.self_us, reverse=True)[:top]:
+            click.echo(f"{import_time.module:<80}{import_time.self_us / 1000:>10.1f} ms"
+                       f"{import_time.cumulative_us / 1000:>10.1f} ms cumulative")
+
+        failed = False
+        if max_seconds is not None and best.seconds > max_seconds:
+            click.echo(f"REGRESSION cold start {best.seconds:.2f}s exceeds {max_seconds:.2f}s")
+            failed = True
+        if max_rss_mb is not None and rss_mb > max_rss_mb:
+            click.echo(f"REGRESSION rss {rss_mb:.1f} MB exceeds {max_rss_mb:.1f} MB")
+            failed = True
+        if failed:
+            sys.exit(1)
@@ -1,16 +1,58 @@
 import os
 import sys
+from datetime import datetime, timedelta
+from typing import Optional
 
 import click
 import json
+from sqlalchemy import text
 
 from commands.base import DbCommandBase
+from commands.partitions import MINIMUM_RETENTION_MONTHS
 from ivr_gateway.models.admin import AdminCall, ScheduledCall, AdminCallFrom, AdminCallTo
 from ivr_gateway.models.contacts import Contact, TransferRouting, InboundRouting, Greeting, ContactLeg
 from ivr_gateway.models.queues import Queue, QueueHoursOfOperation, QueueHoliday
-from ivr_gateway.models.workflows import WorkflowRun, Workflow, WorkflowConfig
+from ivr_gateway.models.workflows import Workflow, WorkflowConfig
+from ivr_gateway.partitions import add_months, month_start
+from ivr_gateway.services.webhooks import REPLAY_WINDOW_SECONDS, WebhookReplayService
 from ivr_gateway.services.workflows import WorkflowService
 
+DEFAULT_PURGE_BATCH_SIZE = 1000
+
+# Deletes one batch of the oldest matching workflow runs together with everything hanging off them, children first.
+# Every step is a set based DELETE ... USING driven off the ids RETURNed by the previous one, so nothing is loaded
+# into the ORM and none of the encrypted columns are read. Contact legs outlive their workflow run and are unlinked.
+PURGE_WORKFLOW_RUN_BATCH = text("""
+    WITH batch AS (
+        SELECT id FROM workflow_run
+        WHERE (CAST(:before AS timestamp) IS NULL OR created_at < CAST(:before AS timestamp))
+          AND (CAST(:workflow_id AS uuid) IS NULL OR workflow_id = CAST(:workflow_id AS uuid))
+        ORDER BY created_at
+        LIMIT :batch_size
+    ), deleted_workflow_step_runs AS (
+        DELETE FROM workflow_step_run USING batch
+        WHERE workflow_step_run.workflow_run_id = batch.id
+        RETURNING workflow_step_run.step_run_id
+    ), deleted_step_states AS (
+        DELETE FROM step_state USING deleted_workflow_step_runs
+        WHERE step_state.step_run_id = deleted_workflow_step_runs.step_run_id
+        RETURNING step_state.id
+    ), deleted_step_runs AS (
+        DELETE FROM step_run USING deleted_workflow_step_runs
+        WHERE step_run.id = deleted_workflow_step_runs.step_run_id
+        RETURNING step_run.id
+    ), unlinked_contact_legs AS (
+        UPDATE contact_leg SET workflow_run_id = NULL FROM batch
+        WHERE contact_leg.workflow_run_id = batch.id
+        RETURNING contact_leg.id
+    ), deleted_workflow_runs AS (
+        DELETE FROM workflow_run USING batch
+        WHERE workflow_run.id = batch.id
+        RETURNING workflow_run.id
+    )
+    SELECT count(*) FROM deleted_workflow_runs
+""")
+
 
 class Db(DbCommandBase):
 
@@ -19,25 +61,66 @@ class Db(DbCommandBase):
         return WorkflowService(self.db_session)
 
     @click.command()
-    def clear_workflow_runs(self):
+    @click.option("--batch-size", default=DEFAULT_PURGE_BATCH_SIZE, show_default=True, type=click.IntRange(1),
+                  help="Number of workflow runs deleted per transaction.")
+    def clear_workflow_runs(self, batch_size: int):
         """Clear DB"""
         if os.getenv("IVR_APP_ENV") not in ["local", "dev", "test"]:
             click.echo("Exiting because command cannot be run in production mode")
             sys.exit(1)
-        for wr in self.db_session.query(WorkflowRun).all():
-            step_runs = {}
-            for wsr in wr.workflow_step_runs:
-                if wsr.step_run.id not in step_runs:
-                    step_runs[wsr.step_run.id] = wsr.step_run
-                self.db_session.delete(wsr)
-            for _, sr in step_runs.items():
-                self.db_session.delete(sr)
-            self.db_session.delete(wr)
-            self.db_session.flush()
-        self.db_session.commit()
+        self._purge_workflow_runs(None, None, batch_size)
 
         click.echo("Runs Cleared.")
 
+    @click.command(help="Delete workflow runs and their step audit trail in batches")
+    @click.option("--before", required=True, type=click.DateTime(formats=["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"]),
+                  help="Only delete workflow runs created before this UTC date (e.g. 2021-01-31).")
+    @click.option("--workflow", "workflow_name", default=None, type=click.STRING,
+                  help="Only delete runs of this workflow (e.g. Iivr.workflow_name).")
+    @click.option("--batch-size", default=DEFAULT_PURGE_BATCH_SIZE, show_default=True, type=click.IntRange(1),
+                  help="Number of workflow runs deleted per transaction.")
+    def purge_workflow_runs(self, before: datetime, workflow_name: Optional[str], batch_size: int):
+        if os.getenv("IVR_APP_ENV") not in ["local", "dev", "test"]:
+            retention_cutoff = add_months(month_start(datetime.utcnow()), -MINIMUM_RETENTION_MONTHS)
+            if before.date() > retention_cutoff:
+                click.echo(f"Exiting because only runs created before {retention_cutoff} can be purged in production")
+                sys.exit(1)
+
+        workflow_id = None
+        if workflow_name is not None:
+            workflow = self.workflow_service.get_workflow_by_name(workflow_name)
+            if workflow is None:
+                click.echo("Specified workflow does not exist")
+                sys.exit(1)
+            workflow_id = str(workflow.id)
+
+        deleted = self._purge_workflow_runs(before, workflow_id, batch_size)
+        click.echo(f"Purged {deleted} workflow runs.")
+
+    def _purge_workflow_runs(self, before: Optional[datetime], workflow_id: Optional[str], batch_size: int) -> int:
+        total = 0
+        while True:
+            deleted = self.db_session.execute(PURGE_WORKFLOW_RUN_BATCH, {
+                "before": before,
+                "workflow_id": workflow_id,
+                "batch_size": batch_size,
+            }).scalar()
+            # Commit every batch so locks are held briefly and an interrupted purge keeps its progress
+            self.db_session.commit()
+            total += deleted
+            if deleted == 0:
+                return total
+            click.echo(f"Deleted {deleted} workflow runs ({total} so far)")
+
+    @click.command(help="Delete stored webhook responses that can no longer be replayed")
+    @click.option("--older-than-hours", default=24, show_default=True, type=click.IntRange(1),
+                  help="Only delete responses stored more than this many hours ago.")
+    def purge_webhook_responses(self, older_than_hours: int):
+        before = datetime.utcnow() - max(timedelta(hours=older_than_hours), timedelta(seconds=REPLAY_WINDOW_SECONDS))
+        deleted = WebhookReplayService(self.db_session).purge(before)
+        self.db_session.commit()
+        click.echo(f"Purged {deleted} webhook responses.")
+
     @click.command()
     def clear_call_inbound_transfer_and_admin_data(self):
         """Clear DB"""
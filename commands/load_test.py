@@ -0,0 +1,251 @@
+import json
+import math
+import os
+import sys
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+import click
+import requests
+from twilio.request_validator import RequestValidator
+
+from commands.base import DbCommandBase
+from commands.workflow_registry import workflow_step_tree_registry
+from ivr_gateway.models.contacts import InboundRouting
+from ivr_gateway.models.enums import ContactType
+from ivr_gateway.models.workflows import Workflow
+from ivr_gateway.query_stats import QUERY_COUNT_HEADER
+from ivr_gateway.steps.api.v1 import InputStep, InputActionStep, NumberedInputActionStep, ConfirmationStep, \
+    AgreementStep
+from ivr_gateway.steps.config import StepTree
+from ivr_gateway.steps.inputs import BirthdayInput, CardPaymentDateInput, CurrencyInput, CurrencyTextInput, \
+    DateInput, IntegerInput, Last4CreditCardInput, Last4SSNInput, PhoneNumberInput, SSNInput, ZipCodeInput
+
+TWILIO_API_PATH = "/api/v1/twilio"
+LIVEVOX_SMS_PATH = "/api/v1/livevox/sms"
+DEFAULT_DIGITS = "1"
+
+SAMPLE_DIGITS_BY_INPUT_TYPE = {
+    DateInput.get_type_string(): "01151990",
+    BirthdayInput.get_type_string(): "01151990",
+    SSNInput.get_type_string(): "123456789",
+    Last4SSNInput.get_type_string(): "6789",
+    Last4CreditCardInput.get_type_string(): "4321",
+    CurrencyInput.get_type_string(): "25",
+    CurrencyTextInput.get_type_string(): "25.00",
+    PhoneNumberInput.get_type_string(): "5555551234",
+    ZipCodeInput.get_type_string(): "10001",
+    IntegerInput.get_type_string(): "1",
+}
+ACTION_STEP_TYPES = (
+    InputActionStep.get_type_string(),
+    NumberedInputActionStep.get_type_string(),
+    ConfirmationStep.get_type_string(),
+    AgreementStep.get_type_string(),
+)
+
+
+def sample_digits_for_input_type(input_type: Optional[str]) -> str:
+    if input_type == CardPaymentDateInput.get_type_string():
+        return (date.today() + timedelta(days=1)).strftime("%m%d%Y")
+    return SAMPLE_DIGITS_BY_INPUT_TYPE.get(input_type, DEFAULT_DIGITS)
+
+
+def build_dtmf_script(step_tree: StepTree) -> List[str]:
+    """
+    Derives the happy path inputs for the root branch of a step tree: the first non replay action of every menu and a
+    value that binds for every other input step. Once a call branches away from root the script runs out and the load
+    generator keeps answering with DEFAULT_DIGITS.
+
+    :param step_tree:
+    :return: list of digits to send, one entry per gather
+    """
+    root = next((branch for branch in step_tree.branches if branch.name == "root"), step_tree.branches[0])
+    script = []
+    for step in root.steps:
+        if step.step_type in ACTION_STEP_TYPES:
+            actions = step.step_kwargs.get("actions") or []
+            numbers = [str(a.get("number")) for a in actions
+                       if isinstance(a, dict) and a.get("number") is not None and not a.get("is_replay", False)]
+            script.append(numbers[0] if numbers else DEFAULT_DIGITS)
+        elif step.step_type == InputStep.get_type_string():
+            script.append(sample_digits_for_input_type(step.step_kwargs.get("input_type")))
+    return script
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    # nearest rank
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+class EndpointStats:
+
+    def __init__(self):
+        self._lock = Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.query_counts: Dict[str, List[int]] = defaultdict(list)
+
+    def record(self, endpoint: str, latency: float, ok: bool, query_count: Optional[int]):
+        with self._lock:
+            self.latencies[endpoint].append(latency)
+            if not ok:
+                self.errors[endpoint] += 1
+            if query_count is not None:
+                self.query_counts[endpoint].append(query_count)
+
+    def report(self) -> List[str]:
+        lines = [f"{'endpoint':<24}{'requests':>10}{'errors':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+                 f"{'avg queries':>13}"]
+        for endpoint in sorted(self.latencies):
+            latencies = [latency * 1000 for latency in self.latencies[endpoint]]
+            queries = self.query_counts.get(endpoint)
+            avg_queries = f"{sum(queries) / len(queries):.1f}" if queries else "n/a"
+            error_rate = self.errors[endpoint] / len(latencies) * 100
+            lines.append(f"{endpoint:<24}{len(latencies):>10}{error_rate:>8.1f}%"
+                         f"{percentile(latencies, 50):>10.1f}{percentile(latencies, 95):>10.1f}"
+                         f"{percentile(latencies, 99):>10.1f}{avg_queries:>13}")
+        return lines
+
+
+class LoadTest(DbCommandBase):
+
+    @click.command(help="Drive synthetic calls and SMS conversations through a running IVR gateway")
+    @click.option("--base-url", default="http://localhost:9000", show_default=True, type=click.STRING)
+    @click.option("--calls", default=100, show_default=True, type=click.IntRange(0),
+                  help="Number of voice calls to place, spread across the routed workflows.")
+    @click.option("--sms", default=0, show_default=True, type=click.IntRange(0),
+                  help="Number of LiveVox SMS conversations to run.")
+    @click.option("--concurrency", default=10, show_default=True, type=click.IntRange(1))
+    @click.option("--workflow", "workflow_names", multiple=True, type=click.STRING,
+                  help="Restrict the run to these workflows, defaults to every routed workflow in the registry.")
+    @click.option("--script-file", default=None, type=click.Path(exists=True, dir_okay=False),
+                  help="JSON object of workflow name to a list of digits, overriding the derived DTMF paths.")
+    @click.option("--max-turns", default=25, show_default=True, type=click.IntRange(1),
+                  help="Hang up a call after this many gathers.")
+    @click.option("--account-sid", default="ACloadtest", show_default=True, type=click.STRING)
+    @click.option("--auth-token", default=lambda: os.getenv("TWILIO_AUTH_TOKEN", ""), type=click.STRING,
+                  help="Token used to sign requests, defaults to TWILIO_AUTH_TOKEN.")
+    def run(self, base_url: str, calls: int, sms: int, concurrency: int, workflow_names: Tuple[str],
+            script_file: Optional[str], max_turns: int, account_sid: str, auth_token: str) -> None:
+        if os.getenv("IVR_APP_ENV") not in ["local", "dev", "test"]:
+            click.echo("Exiting because command cannot be run in production mode")
+            sys.exit(1)
+
+        scripts = {name: build_dtmf_script(tree) for name, tree in workflow_step_tree_registry.items()}
+        if script_file is not None:
+            with open(script_file) as f:
+                scripts.update(json.load(f))
+
+        call_targets = self._routed_workflows(ContactType.IVR, workflow_names)
+        sms_targets = self._routed_workflows(ContactType.SMS, workflow_names)
+        if calls and not call_targets:
+            click.echo("No active voice routings found for the requested workflows")
+            sys.exit(1)
+        if sms and not sms_targets:
+            click.echo("No active SMS routings found for the requested workflows")
+            sys.exit(1)
+
+        stats = EndpointStats()
+        client = LoadTestClient(base_url, account_sid, RequestValidator(auth_token), stats, max_turns)
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = []
+            for i in range(calls):
+                workflow_name, target = call_targets[i % len(call_targets)]
+                futures.append(executor.submit(client.run_call, target, scripts.get(workflow_name, [])))
+            for i in range(sms):
+                workflow_name, target = sms_targets[i % len(sms_targets)]
+                futures.append(executor.submit(client.run_sms, target, scripts.get(workflow_name, [])))
+            for future in futures:
+                future.result()
+        elapsed = time.monotonic() - started
+
+        click.echo(f"Ran {calls} calls and {sms} SMS conversations in {elapsed:.1f}s at concurrency {concurrency}")
+        for line in stats.report():
+            click.echo(line)
+        if not stats.query_counts:
+            click.echo(f"No {QUERY_COUNT_HEADER} headers received, start the server with IVR_EXPOSE_QUERY_COUNT=true "
+                       f"to collect query counts")
+
+    def _routed_workflows(self, contact_type: ContactType, workflow_names: Tuple[str]) -> List[Tuple[str, str]]:
+        query = (self.db_session.query(Workflow.workflow_name, InboundRouting.inbound_target)
+                 .select_from(InboundRouting)
+                 .join(InboundRouting.workflow)
+                 .filter(InboundRouting.active)
+                 .filter(InboundRouting.contact_type == contact_type)
+                 .filter(Workflow.workflow_name.in_(workflow_names or list(workflow_step_tree_registry.keys()))))
+        return [(name, target) for name, target in query.all()]
+
+
+class LoadTestClient:
+
+    def __init__(self, base_url: str, account_sid: str, validator: RequestValidator, stats: EndpointStats,
+                 max_turns: int):
+        self.base_url = base_url.rstrip("/")
+        self.account_sid = account_sid
+        self.validator = validator
+        self.stats = stats
+        self.max_turns = max_turns
+
+    def run_call(self, inbound_target: str, script: List[str]):
+        http = requests.Session()
+        form = {
+            "AccountSid": self.account_sid,
+            "CallSid": f"CA{uuid.uuid4().hex}",
+            "From": "+15555550100",
+            "To": f"+{inbound_target}",
+        }
+        twiml = self._post_twilio(http, "new", form)
+        turn = 0
+        while twiml is not None and "<Gather" in twiml and turn < self.max_turns:
+            digits = script[turn] if turn < len(script) else DEFAULT_DIGITS
+            twiml = self._post_twilio(http, "continue", dict(form, Digits=digits))
+            turn += 1
+        self._post_twilio(http, "status", dict(form, CallStatus="completed"))
+
+    def run_sms(self, inbound_target: str, script: List[str]):
+        http = requests.Session()
+        payload = {
+            "thread_id": uuid.uuid4().hex,
+            "workflow": inbound_target,
+            "phone_number": "5555550100",
+        }
+        response = self._post(http, "livevox/sms", f"{self.base_url}{LIVEVOX_SMS_PATH}", json=payload)
+        turn = 0
+        while response is not None and not response.get("finished", True) and turn < self.max_turns:
+            text = script[turn] if turn < len(script) else DEFAULT_DIGITS
+            response = self._post(http, "livevox/sms", f"{self.base_url}{LIVEVOX_SMS_PATH}",
+                                  json=dict(payload, input=text))
+            turn += 1
+
+    def _post_twilio(self, http: requests.Session, endpoint: str, form: dict) -> Optional[str]:
+        url = f"{self.base_url}{TWILIO_API_PATH}/{endpoint}"
+        headers = {"X-Twilio-Signature": self.validator.compute_signature(url, form)}
+        return self._post(http, f"twilio/{endpoint}", url, data=form, headers=headers)
+
+    def _post(self, http: requests.Session, endpoint: str, url: str, **kwargs):
+        started = time.monotonic()
+        try:
+            response = http.post(url, timeout=30, **kwargs)
+        except requests.RequestException:
+            self.stats.record(endpoint, time.monotonic() - started, ok=False, query_count=None)
+            return None
+        latency = time.monotonic() - started
+        query_count = response.headers.get(QUERY_COUNT_HEADER)
+        self.stats.record(endpoint, latency, ok=response.ok,
+                          query_count=int(query_count) if query_count is not None else None)
+        if not response.ok:
+            return None
+        if "json" in response.headers.get("Content-Type", ""):
+            return response.json()
+        return response.text
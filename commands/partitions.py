@@ -0,0 +1,100 @@
+import gzip
+import os
+import sys
+from datetime import date, datetime
+
+import click
+from sqlalchemy.exc import OperationalError
+
+from commands.base import DbCommandBase
+from ivr_gateway.partitions import AUDIT_PARTITIONED_TABLES, add_months, attach_partition_statement, \
+    create_default_partition_statement, create_partition, list_partitions, month_start, \
+    partition_bounds_check_statement
+
+# Partitions newer than this many months can never be archived, regardless of the requested cut off
+MINIMUM_RETENTION_MONTHS = int(os.getenv("AUDIT_MINIMUM_RETENTION_MONTHS", "6"))
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+class Partitions(DbCommandBase):
+
+    @click.command(help="Create the monthly audit table partitions ahead of time")
+    @click.option("--months-ahead", default=3, show_default=True, type=click.IntRange(0, 24),
+                  help="Number of months after the current month to create partitions for.")
+    def create(self, months_ahead: int) -> None:
+        current_month = month_start(datetime.utcnow())
+        connection = self.db_session.connection()
+        for table in AUDIT_PARTITIONED_TABLES:
+            connection.execute(create_default_partition_statement(table))
+            for offset in range(months_ahead + 1):
+                month = add_months(current_month, offset)
+                moved = create_partition(connection, table, month)
+                if moved:
+                    click.echo(f"Moved {moved} rows of {table} for {month:%Y-%m} out of the default partition")
+        self.db_session.commit()
+        click.echo(f"Partitions created through {add_months(current_month, months_ahead):%Y-%m}.")
+
+    @click.command(help="Detach, export and drop audit table partitions older than the retention window")
+    @click.option("--older-than-months", default=MINIMUM_RETENTION_MONTHS, show_default=True, type=click.INT,
+                  help="Archive partitions whose month ended more than this many months ago.")
+    @click.option("--output-dir", required=True, type=click.Path(file_okay=False, writable=True),
+                  help="Directory the gzipped CSV exports are written to.")
+    @click.option("--lock-timeout", default="5s", show_default=True, type=click.STRING,
+                  help="Give up on a partition instead of waiting longer than this for the detach lock.")
+    @click.option("--dry-run", is_flag=True, default=False, help="Only list the partitions that would be archived.")
+    def archive(self, older_than_months: int, output_dir: str, lock_timeout: str, dry_run: bool) -> None:
+        if older_than_months < MINIMUM_RETENTION_MONTHS:
+            click.echo(f"Exiting because partitions newer than {MINIMUM_RETENTION_MONTHS} months cannot be archived")
+            sys.exit(1)
+        cutoff = add_months(month_start(datetime.utcnow()), -older_than_months)
+        os.makedirs(output_dir, exist_ok=True)
+
+        for table in AUDIT_PARTITIONED_TABLES:
+            for name, month in list_partitions(self.db_session.connection(), table):
+                if month >= cutoff:
+                    break
+                if dry_run:
+                    click.echo(f"Would archive {name}")
+                    continue
+                if not self._detach_partition(table, name, lock_timeout):
+                    click.echo(f"Skipping {name}, could not acquire the detach lock within {lock_timeout}")
+                    continue
+                # The partition is now a standalone table, exporting and dropping it does not touch the live table
+                export_path = os.path.join(output_dir, f"{name}.csv.gz")
+                try:
+                    rows = self._export_table(name, export_path)
+                except Exception:
+                    self._reattach_partition(table, name, month, export_path)
+                    raise
+                self.db_session.execute(f"DROP TABLE {name}")
+                self.db_session.commit()
+                click.echo(f"Archived {name}: {rows} rows written to {export_path}")
+
+    def _detach_partition(self, table: str, name: str, lock_timeout: str) -> bool:
+        try:
+            self.db_session.execute("SELECT set_config('lock_timeout', :timeout, true)", {"timeout": lock_timeout})
+            self.db_session.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+            self.db_session.commit()
+            return True
+        except OperationalError as e:
+            self.db_session.rollback()
+            if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE:
+                raise
+            return False
+
+    def _reattach_partition(self, table: str, name: str, month: date, export_path: str) -> None:
+        self.db_session.rollback()
+        if os.path.exists(export_path):
+            os.remove(export_path)
+        # The CHECK constraint is validated under a lock on the detached table only, attaching then skips the scan
+        self.db_session.execute(partition_bounds_check_statement(table, month))
+        self.db_session.execute(attach_partition_statement(table, month))
+        self.db_session.execute(f"ALTER TABLE {name} DROP CONSTRAINT {name}_bounds")
+        self.db_session.commit()
+        click.echo(f"Reattached {name} after its export failed")
+
+    def _export_table(self, name: str, export_path: str) -> int:
+        cursor = self.db_session.connection().connection.cursor()
+        with gzip.open(export_path, "wt") as export_file:
+            cursor.copy_expert(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)", export_file)
+        return cursor.rowcount
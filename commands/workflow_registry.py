@@ -1,27 +1,43 @@
-from tests.fixtures.step_trees.ingress import ingress_step_tree
-from tests.fixtures.step_trees.main_menu import main_menu_step_tree
-from tests.fixtures.step_trees.make_payment import make_payment_step_tree
-from tests.fixtures.step_trees.secure_call import secure_call_step_tree
-from tests.fixtures.step_trees.self_service_menu import self_service_step_tree
-from tests.fixtures.step_trees.loan_origination import loan_origination_step_tree
-from step_trees.shared.ivr.telco_customer_lookup import ivr_telco_customer_lookup
-from step_trees.Iivr.ivr.activate_card import activate_card_step_tree
-from step_trees.shared.ivr.customer_lookup import ivr_customer_lookup
-from step_trees.Iivr.sms.make_payment_sms import make_payment_sms_step_tree
-from step_trees.shared.ivr.noop_queue_transfer import noop_queue_transfer_step_tree
-from step_trees.shared.ivr.banking_menu import banking_menu_step_tree
-
-workflow_step_tree_registry = {
-    "Iivr.ingress": ingress_step_tree,
-    "Iivr.main_menu": main_menu_step_tree,
-    "Iivr.secure_call": secure_call_step_tree,
-    "Iivr.self_service_menu": self_service_step_tree,
-    "Iivr.make_payment": make_payment_step_tree,
-    "Iivr.loan_origination": loan_origination_step_tree,
-    "Iivr.sms.make_payment_sms": make_payment_sms_step_tree,
-    "shared.ivr.noop_queue_transfer": noop_queue_transfer_step_tree,
-    "shared.ivr.telco_customer_lookup": ivr_telco_customer_lookup,
-    "Iivr.ivr.activate_card": activate_card_step_tree,
-    "shared.ivr.customer_lookup": ivr_customer_lookup,
-    "shared.ivr.banking_menu": banking_menu_step_tree
-}
\ No newline at end of file
+import importlib
+from typing import Dict, Iterator, Mapping
+
+from ivr_gateway.steps.config import StepTree
+
+
+class StepTreeRegistry(Mapping):
+    """
+    Maps workflow names to step trees, importing a tree's module only the first time it is looked up so the web
+    workers never load trees (or test fixtures) they do not serve
+    """
+
+    def __init__(self, locations: Dict[str, str]):
+        self._locations = locations
+        self._loaded: Dict[str, StepTree] = {}
+
+    def __getitem__(self, workflow_name: str) -> StepTree:
+        if workflow_name not in self._loaded:
+            module_name, attribute = self._locations[workflow_name].split(":")
+            self._loaded[workflow_name] = getattr(importlib.import_module(module_name), attribute)
+        return self._loaded[workflow_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._locations)
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+
+workflow_step_tree_registry = StepTreeRegistry({
+    "Iivr.ingress": "tests.fixtures.step_trees.ingress:ingress_step_tree",
+    "Iivr.main_menu": "tests.fixtures.step_trees.main_menu:main_menu_step_tree",
+    "Iivr.secure_call": "tests.fixtures.step_trees.secure_call:secure_call_step_tree",
+    "Iivr.self_service_menu": "tests.fixtures.step_trees.self_service_menu:self_service_step_tree",
+    "Iivr.make_payment": "tests.fixtures.step_trees.make_payment:make_payment_step_tree",
+    "Iivr.loan_origination": "tests.fixtures.step_trees.loan_origination:loan_origination_step_tree",
+    "Iivr.sms.make_payment_sms": "step_trees.Iivr.sms.make_payment_sms:make_payment_sms_step_tree",
+    "shared.ivr.noop_queue_transfer": "step_trees.shared.ivr.noop_queue_transfer:noop_queue_transfer_step_tree",
+    "shared.ivr.telco_customer_lookup": "step_trees.shared.ivr.telco_customer_lookup:ivr_telco_customer_lookup",
+    "Iivr.ivr.activate_card": "step_trees.Iivr.ivr.activate_card:activate_card_step_tree",
+    "shared.ivr.customer_lookup": "step_trees.shared.ivr.customer_lookup:ivr_customer_lookup",
+    "shared.ivr.banking_menu": "step_trees.shared.ivr.banking_menu:banking_menu_step_tree"
+})
@@ -0,0 +1,26 @@
+"""
+Server hooks for the web and prod_web entrypoints, command line flags in bin/entrypoint.sh take precedence.
+"""
+import os
+
+# Load the app once in the master and fork workers from it, incompatible with --reload
+preload_app = os.getenv("GUNICORN_PRELOAD", "false") == "true"
+
+
+def when_ready(server):
+    # Runs in the master before the first worker is forked
+    if server.cfg.preload_app:
+        from ivr_gateway.warmup import warm_up
+        warm_up()
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        from ivr_gateway.warmup import after_fork
+        after_fork()
+
+
+def worker_exit(server, worker):
+    # Drain queued log records (LOG_QUEUE_ENABLED) before the worker process goes away
+    from ivr_gateway.logger import flush_queued_logging
+    flush_queued_logging()
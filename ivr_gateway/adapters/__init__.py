@@ -118,7 +118,7 @@ class BaseCallAdapter:
         call_id = self.get_call_id(request)
         # Logging this guy here rather than in the specific call adapter b/c we don't really have a hook to log this
         # elsewhere
-        ivr_logger.warning(f"BaseAdapter.continue_call, call: {call_id}")
+        ivr_logger.warning("BaseAdapter.continue_call, call: %s", call_id)
         call_leg = self.call_service.get_active_call_leg_for_call_system_and_id(self.name, call_id)
         return self.process_call_leg(request, call_leg)
 
@@ -221,7 +221,7 @@ class BaseSMSAdapter:
         sms_id = self.get_contact_id(request)
         # Logging this guy here rather than in the specific sms adapter b/c we don't really have a hook to log this
         # elsewhere
-        ivr_logger.warning(f"BaseSMSAdapter.continue_or_create_sms, sms: {sms_id}")
+        ivr_logger.warning("BaseSMSAdapter.continue_or_create_sms, sms: %s", sms_id)
         contact_leg = self.sms_service.get_active_contact_leg_for_sms_system_and_id(self.name, sms_id)
         if contact_leg is None:
             return self.new_sms(request)
@@ -292,7 +292,7 @@ class BaseSMSAdapter:
         sms_id = self.get_contact_id(request)
         # Logging this guy here rather than in the specific sms adapter b/c we don't really have a hook to log this
         # elsewhere
-        ivr_logger.warning(f"BaseSMSAdapter.continue_sms, sms: {sms_id}")
+        ivr_logger.warning("BaseSMSAdapter.continue_sms, sms: %s", sms_id)
         contact_leg = self.sms_service.get_active_contact_leg_for_sms_system_and_id(self.name, sms_id)
         return self.process_sms_leg(request, contact_leg)
 
@@ -60,15 +60,15 @@ class LiveVoxRequestAdapter(BaseSMSAdapter):
         return final_settings
 
     def process_new_sms(self, sms_leg: ContactLeg, routing: InboundRouting, request: Request):
-        ivr_logger.warning(f"LiveVoxRequestAdapter.process_new_sms, SMS: {sms_leg.contact_id}")
-        ivr_logger.debug(f"sms_leg: {sms_leg}, routing: {routing}, request: {request}")
+        ivr_logger.warning("LiveVoxRequestAdapter.process_new_sms, SMS: %s", sms_leg.contact_id)
+        ivr_logger.debug("sms_leg: %s, routing: %s, request: %s", sms_leg, routing, request)
         return self.process_sms_leg(request, sms_leg)
 
     def process_sms_leg(self, request: Request, sms_leg: ContactLeg):
         # Logging as an info here as we may run this method multiple times for the same request
         # so we go to INFO to see inter and intra request spanning info
-        ivr_logger.info(f"LiveVoxRequestAdapter.process_sms_leg, SMS: {sms_leg.contact_id}")
-        ivr_logger.debug(f"request: {request}, sms_leg: {sms_leg}")
+        ivr_logger.info("LiveVoxRequestAdapter.process_sms_leg, SMS: %s", sms_leg.contact_id)
+        ivr_logger.debug("request: %s, sms_leg: %s", request, sms_leg)
 
         # If we are currently in the requesting_user_input state then we are applying input
         applying_input = sms_leg.workflow_run.state == WorkflowState.requesting_user_input
@@ -77,9 +77,10 @@ class LiveVoxRequestAdapter(BaseSMSAdapter):
             json_response = request.get_json()
             engine, current_step, result, next_step_or_exit = \
                 self._run_workflow_step_for_sms_leg(sms_leg, user_input=json_response.get('input', None))
-            ivr_logger.debug(f"current_step: {current_step}, result: {result}, next_step_or_exit: {next_step_or_exit}")
+            ivr_logger.debug("current_step: %s, result: %s, next_step_or_exit: %s",
+                             current_step, result, next_step_or_exit)
         except WorkflowEngineUnrecoverableException as wee:
-            ivr_logger.error(f"caught workflow engine exception: {wee}")
+            ivr_logger.error("caught workflow engine exception: %s", wee)
             exit_path = SMSExitPath(exit_msg="Sorry! There was an issue processing your payment. Call 800-712-5407 "
                                              "to speak to an agent.",
                                     overwrite_response=True)
@@ -118,8 +119,8 @@ class LiveVoxRequestAdapter(BaseSMSAdapter):
                 return self.process_sms_leg(request, sms_leg)
 
     def process_exit_path(self, request: Request, exit_path: ExitPath, sms_leg: ContactLeg = None):
-        ivr_logger.warning(f"LiveVoxRequestAdapter.process_exit_path, SMS: {sms_leg.contact_id}")
-        ivr_logger.debug(f"request: {request}, exit_path: {exit_path}, sms_leg: {sms_leg}")
+        ivr_logger.warning("LiveVoxRequestAdapter.process_exit_path, SMS: %s", sms_leg.contact_id)
+        ivr_logger.debug("request: %s, exit_path: %s, sms_leg: %s", request, exit_path, sms_leg)
 
         # need to end the sms_leg for other exit paths
         self.sms_service.end_sms_leg(sms_leg, exit_path.get_type_string(), exit_path.kwargs)
@@ -135,19 +136,19 @@ class LiveVoxRequestAdapter(BaseSMSAdapter):
         elif isinstance(exit_path, WorkflowExitPath):
             ivr_logger.info("WorkflowExitPath")
             workflow_name = exit_path.workflow
-            ivr_logger.debug(f"exit path workflow: {workflow_name}")
+            ivr_logger.debug("exit path workflow: %s", workflow_name)
             new_sms_leg = self.sms_service.transfer_sms_leg_to_workflow(sms_leg, workflow_name)
-            ivr_logger.debug(f"new sms_leg id: {new_sms_leg.id}")
+            ivr_logger.debug("new sms_leg id: %s", new_sms_leg.id)
             return self.process_sms_leg(request, new_sms_leg)
 
     def _run_workflow_step_for_sms_leg(self, sms_leg: ContactLeg, user_input: str = None) \
             -> Tuple[WorkflowEngine, Step, StepResult, NextStepOrExit]:
         ivr_logger.info("LiveVoxRequestAdapter._run_workflow_step_for_sms_leg")
-        ivr_logger.debug(f"Call Leg: {sms_leg}, User Input: {user_input}")
+        ivr_logger.debug("Call Leg: %s, User Input: %s", sms_leg, user_input)
         engine = WorkflowEngine(self.session, sms_leg.workflow_run)
         engine.initialize()
         current_step = engine.get_current_step()
-        ivr_logger.debug(f"current_step: {current_step}")
+        ivr_logger.debug("current_step: %s", current_step)
         if engine.workflow_run.state == WorkflowState.requesting_user_input:
             current_step = engine.get_current_step()
             if isinstance(current_step, InputActionStep):
@@ -163,12 +164,12 @@ class LiveVoxRequestAdapter(BaseSMSAdapter):
             else:
                 step_input = None
             result, next_step_or_exit = engine.run_current_workflow_step(step_input=step_input)
-            ivr_logger.debug(f"WorkflowState.requesting_user_input result: {result}")
+            ivr_logger.debug("WorkflowState.requesting_user_input result: %s", result)
 
             return engine, current_step, result, next_step_or_exit
         else:
             result, next_step_or_exit = engine.run_current_workflow_step(step_input=None)
-            ivr_logger.debug(f"WorkflowState.requesting_user_input result: {result}")
+            ivr_logger.debug("WorkflowState.requesting_user_input result: %s", result)
             return engine, current_step, result, next_step_or_exit
 
     def _build_message_for_step(self, step: Step, previous_error: StepError = None) -> None:
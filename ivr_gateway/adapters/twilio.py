@@ -20,7 +20,6 @@ from ivr_gateway.models.contacts import ContactLeg, InboundRouting, TransferRout
 from ivr_gateway.models.enums import TransferType, WorkflowState, AdminRole, OperatingMode
 from ivr_gateway.models.exceptions import MissingTransferRoutingException
 from ivr_gateway.models.queues import Queue
-from ivr_gateway.models.workflows import WorkflowRun
 from ivr_gateway.services.admin import AdminService
 from ivr_gateway.services.screenpop import ScreenPopService
 from ivr_gateway.steps.api.v1 import InputStep, PlayMessageStep, InputActionStep, NumberedInputActionStep
@@ -67,16 +66,16 @@ class TwilioRequestAdapter(BaseCallAdapter):
         pass
 
     def process_new_call(self, call_leg: ContactLeg, routing: InboundRouting, request: Request) -> TwiML:
-        ivr_logger.warning(f"TwilioRequestAdapter.process_new_call, call: {call_leg.contact_id}")
-        ivr_logger.debug(f"call_leg: {call_leg}, routing: {routing}, request: {request}")
+        ivr_logger.warning("TwilioRequestAdapter.process_new_call, call: %s", call_leg.contact_id)
+        ivr_logger.debug("call_leg: %s, routing: %s, request: %s", call_leg, routing, request)
         nest_say_in_response(self.current_voice_response, routing.greeting.message)
         return self.process_call_leg(request, call_leg)
 
     def process_call_leg(self, request: Request, call_leg: ContactLeg) -> TwiML:
         # Logging as an info here as we may run this method multiple times for the same request
         # so we go to INFO to see inter and intra request spanning info
-        ivr_logger.info(f"TwilioRequestAdapter.process_call_leg, call: {call_leg.contact_id}")
-        ivr_logger.debug(f"request: {request}, call_leg: {call_leg}")
+        ivr_logger.info("TwilioRequestAdapter.process_call_leg, call: %s", call_leg.contact_id)
+        ivr_logger.debug("request: %s, call_leg: %s", request, call_leg)
 
         # If we are currently in the requesting_user_input state then we are applying input
         applying_input = call_leg.workflow_run.state == WorkflowState.requesting_user_input
@@ -84,9 +83,10 @@ class TwilioRequestAdapter(BaseCallAdapter):
         try:
             engine, current_step, result, next_step_or_exit = \
                 self._run_workflow_step_for_call_leg(call_leg, user_input=request.form.get('Digits', None))
-            ivr_logger.debug(f"current_step: {current_step}, result: {result}, next_step_or_exit: {next_step_or_exit}")
+            ivr_logger.debug("current_step: %s, result: %s, next_step_or_exit: %s",
+                             current_step, result, next_step_or_exit)
         except WorkflowEngineUnrecoverableException as wee:
-            ivr_logger.error(f"caught workflow engine exception: {wee}")
+            ivr_logger.error("caught workflow engine exception: %s", wee)
             exit_path = ErrorTransferToCurrentQueueExitPath(error=repr(wee))
             return self.process_exit_path(
                 request, exit_path, call_leg
@@ -123,8 +123,8 @@ class TwilioRequestAdapter(BaseCallAdapter):
                 return self.process_call_leg(request, call_leg)
 
     def process_exit_path(self, request: Request, exit_path: ExitPath, call_leg: ContactLeg = None) -> TwiML:
-        ivr_logger.warning(f"TwilioRequestAdapter.process_exit_path, call: {call_leg.contact_id}")
-        ivr_logger.debug(f"request: {request}, exit_path: {exit_path}, call_leg: {call_leg}")
+        ivr_logger.warning("TwilioRequestAdapter.process_exit_path, call: %s", call_leg.contact_id)
+        ivr_logger.debug("request: %s, exit_path: %s, call_leg: %s", request, exit_path, call_leg)
 
         # transfer to queue methods handle end the call_leg
         if isinstance(exit_path, (CurrentQueueExitPath, ErrorTransferToCurrentQueueExitPath)):
@@ -132,7 +132,7 @@ class TwilioRequestAdapter(BaseCallAdapter):
             return self.transfer_to_current_queue(call_leg, exit_path)
         elif isinstance(exit_path, QueueExitPath):
             ivr_logger.info("Exiting to exit path queue")
-            ivr_logger.debug(f"exit path queue: {exit_path.queue_name}")
+            ivr_logger.debug("exit path queue: %s", exit_path.queue_name)
             queue = self.queue_service.get_queue_by_name(exit_path.queue_name)
             return self.transfer_to_queue(call_leg, queue, exit_path)
 
@@ -145,24 +145,24 @@ class TwilioRequestAdapter(BaseCallAdapter):
         elif isinstance(exit_path, WorkflowExitPath):
             ivr_logger.info("WorkflowExitPath")
             workflow_name = exit_path.workflow
-            ivr_logger.debug(f"exit path workflow: {workflow_name}")
+            ivr_logger.debug("exit path workflow: %s", workflow_name)
             new_call_leg = self.call_service.transfer_call_leg_to_workflow(call_leg, workflow_name)
-            ivr_logger.debug(f"new call_leg id: {new_call_leg.id}")
+            ivr_logger.debug("new call_leg id: %s", new_call_leg.id)
             return self.process_call_leg(request, new_call_leg)
         elif isinstance(exit_path, PSTNExitPath):
             ivr_logger.info("PSTNExitPath")
-            ivr_logger.debug(f"PSTN Phone Number: {exit_path.phone_number}")
+            ivr_logger.debug("PSTN Phone Number: %s", exit_path.phone_number)
             self.dial_out(exit_path.phone_number)
             return self.current_voice_response
 
     def _run_workflow_step_for_call_leg(self, call_leg: ContactLeg, user_input: str = None) \
             -> Tuple[WorkflowEngine, Step, StepResult, NextStepOrExit]:
         ivr_logger.info("TwilioRequestAdapter._run_workflow_step_for_call_leg")
-        ivr_logger.debug(f"Call Leg: {call_leg}, User Input: {user_input}")
+        ivr_logger.debug("Call Leg: %s, User Input: %s", call_leg, user_input)
         engine = WorkflowEngine(self.session, call_leg.workflow_run)
         engine.initialize()
         current_step = engine.get_current_step()
-        ivr_logger.debug(f"current_step: {current_step}")
+        ivr_logger.debug("current_step: %s", current_step)
         if engine.workflow_run.state == WorkflowState.requesting_user_input:
             current_step = engine.get_current_step()
             if isinstance(current_step, InputActionStep):
@@ -178,12 +178,12 @@ class TwilioRequestAdapter(BaseCallAdapter):
             else:
                 step_input = None
             result, next_step_or_exit = engine.run_current_workflow_step(step_input=step_input)
-            ivr_logger.debug(f"WorkflowState.requesting_user_input result: {result}")
+            ivr_logger.debug("WorkflowState.requesting_user_input result: %s", result)
 
             return engine, current_step, result, next_step_or_exit
         else:
             result, next_step_or_exit = engine.run_current_workflow_step(step_input=None)
-            ivr_logger.debug(f"StepResult: {result}")
+            ivr_logger.debug("StepResult: %s", result)
             return engine, current_step, result, next_step_or_exit
 
     def _build_message_for_step(self, step: Step, previous_error: StepError = None) -> None:
@@ -220,7 +220,7 @@ class TwilioRequestAdapter(BaseCallAdapter):
             transfer_routing, routing_operating_mode, maybe_holiday = \
                 self.queue_status_service.get_current_transfer_routing_mode_and_maybe_holiday_for_queue(queue, "twilio")
         except MissingTransferRoutingException as e:
-            ivr_logger.critical(f"Missing Transfer routing for queue: {queue.name}, Exception: {e}")
+            ivr_logger.critical("Missing Transfer routing for queue: %s, Exception: %s", queue.name, e)
             # TODO: handle queue fallback logic (emergency sip, pstn, message)
             nest_say_in_response(
                 self.current_voice_response,
@@ -264,7 +264,7 @@ class TwilioRequestAdapter(BaseCallAdapter):
             return self.current_voice_response
 
         if transfer_routing.transfer_type == TransferType.SIP:
-            ivr_logger.debug(f"SIPing out: {transfer_routing.destination}")
+            ivr_logger.debug("SIPing out: %s", transfer_routing.destination)
             # response.refer()
             pass
         elif transfer_routing.transfer_type == TransferType.PSTN:
@@ -274,7 +274,7 @@ class TwilioRequestAdapter(BaseCallAdapter):
         return self.current_voice_response
 
     def dial_out(self, phone_number: str):
-        ivr_logger.debug(f"Dialing out: {phone_number}")
+        ivr_logger.debug("Dialing out: %s", phone_number)
         self.current_voice_response.dial(phone_number)
 
     def transfer_to_flex(self, call_leg: ContactLeg, transfer_routing: TransferRouting):
@@ -318,25 +318,22 @@ class TwilioRequestAdapter(BaseCallAdapter):
 
     def update_call_status(self, request: Request):
         call_id = self.get_call_id(request)
-        ivr_logger.warning(f"TwilioRequestAdapter.update_call_status, call: {call_id}")
-        call_leg = self.call_service.get_active_call_leg_for_call_system_and_id(self.name, call_id)
-        if call_leg is None:
-            ivr_logger.info(f"call: {call_id} is already complete")
-            return
+        ivr_logger.warning("TwilioRequestAdapter.update_call_status, call: %s", call_id)
         call_status = request.form.get("CallStatus", "unknown")
-        maybe_workflow_run: Optional[WorkflowRun] = call_leg.workflow_run
-        if maybe_workflow_run is not None and call_status == self.COMPLETED_STATUS and call_leg.end_time is None:
-            if maybe_workflow_run.state != WorkflowState.finished:
-                self.call_service.end_call_leg(call_leg, AdapterStatusCallBackExitPath.get_type_string(),
-                                               {"call_status": "disconnect"})
-
-        if call_status == self.COMPLETED_STATUS and call_leg.end_time is None:
-            self.call_service.end_call_leg(call_leg, AdapterStatusCallBackExitPath.get_type_string(),
-                                           {"call_status": call_status})
+        if call_status != self.COMPLETED_STATUS:
+            # Only the final callback changes the call leg
+            return
+        ended_leg_ids = self.call_service.end_active_call_legs(
+            self.name, call_id, AdapterStatusCallBackExitPath.get_type_string(),
+            disposition_kwargs={"call_status": call_status},
+            unfinished_workflow_disposition_kwargs={"call_status": "disconnect"},
+        )
+        if not ended_leg_ids:
+            ivr_logger.info("call: %s is already complete", call_id)
 
     def verify_call_auth(self, request: Request):
         should_authenticate = os.getenv("TELEPHONY_AUTHENTICATION_REQUIRED", "true")
-        ivr_logger.debug(f"call should authenticate: {should_authenticate}")
+        ivr_logger.debug("call should authenticate: %s", should_authenticate)
         if should_authenticate != "true":
             return True
         try:
@@ -452,7 +449,7 @@ class TwilioRequestAdapter(BaseCallAdapter):
         admin_user = admin_call.user
 
         ani = request.form.get('Digits', None)
-        ivr_logger.debug(f"ani input: {ani}")
+        ivr_logger.debug("ani input: %s", ani)
         if len(ani) < 10:
             admin_shortcut = self.admin_service.find_shortcut_ani(ani)
             if admin_shortcut is None:
@@ -463,7 +460,7 @@ class TwilioRequestAdapter(BaseCallAdapter):
                 ani = f"1{ani}"
         else:
             return self.gather_admin_ani(admin_user, invalid=True)
-        ivr_logger.debug(f"ani: {ani}")
+        ivr_logger.debug("ani: %s", ani)
         self.admin_service.add_ani(admin_call, ani)
 
         return self.gather_admin_dnis(admin_user)
@@ -477,7 +474,7 @@ class TwilioRequestAdapter(BaseCallAdapter):
         admin_user = admin_call.user
 
         dnis = request.form.get('Digits', None)
-        ivr_logger.debug(f"dnis input: {dnis}")
+        ivr_logger.debug("dnis input: %s", dnis)
         if len(dnis) < 10:
             admin_shortcut = self.admin_service.find_shortcut_dnis(dnis)
             if admin_shortcut is None:
@@ -489,7 +486,7 @@ class TwilioRequestAdapter(BaseCallAdapter):
         else:
             return self.gather_admin_dnis(admin_user, invalid=True)
 
-        ivr_logger.debug(f"dnis: {dnis}")
+        ivr_logger.debug("dnis: %s", dnis)
         call_routings = self.call_service.get_routings_for_number(dnis)
         if len(call_routings) == 0:
             return self.gather_admin_dnis(admin_user, invalid=True)
@@ -510,14 +507,14 @@ class TwilioRequestAdapter(BaseCallAdapter):
         digits = request.form.get('Digits', None)
 
         priority = int(digits)
-        ivr_logger.debug(f"priority: {priority}")
+        ivr_logger.debug("priority: %s", priority)
         call_routings = self.call_service.get_routings_for_number(admin_call.dnis)
         routing = None
         for call_routing in call_routings:
             if call_routing.priority == priority:
                 routing = call_routing
         if routing is None:
-            ivr_logger.debug(f"invalid routing priority: {digits}")
+            ivr_logger.debug("invalid routing priority: %s", digits)
             return self.gather_admin_routing(invalid=True)
         return self.process_admin_call(request, admin_call, routing)
 
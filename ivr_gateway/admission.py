@@ -0,0 +1,127 @@
+"""
+Priority-aware admission for Twilio webhooks.
+
+Callers already in the IVR (/continue, /status, transfers and the admin flow) are always admitted. Once this worker is
+saturated, new calls are shed with a prerendered TwiML response before the request opens a database session, so the
+capacity that is left goes to calls in progress.
+
+Saturation is either too many webhooks in flight in this worker (threaded and gevent workers) or, when the load
+balancer stamps X-Request-Start, a request that already waited too long to be picked up (sync workers, where a worker
+only ever has one request in flight and the backlog builds up in the listen queue instead).
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from flask import Request, Response
+from twilio.twiml.voice_response import VoiceResponse
+
+from ivr_gateway.logger import ivr_logger
+
+# New calls are shed once this many webhooks are in flight in the worker, counting the new call itself
+SHED_NEW_CALLS_AT = int(os.getenv("IVR_ADMISSION_SHED_NEW_CALLS_AT", "8"))
+# ... or once a new call waited this long between the load balancer and the worker, 0 disables the check
+SHED_NEW_CALLS_QUEUE_MS = float(os.getenv("IVR_ADMISSION_SHED_NEW_CALLS_QUEUE_MS", "0"))
+# Twilio queue shed calls are placed in, they hang up with SHED_MESSAGE when unset
+SHED_ENQUEUE_QUEUE = os.getenv("IVR_ADMISSION_SHED_ENQUEUE_QUEUE")
+SHED_MESSAGE = os.getenv("IVR_ADMISSION_SHED_MESSAGE",
+                         "We are experiencing a high volume of calls. Please try your call again in a few minutes.")
+REQUEST_START_HEADER = "X-Request-Start"
+
+
+def render_shed_response(enqueue_queue: Optional[str] = SHED_ENQUEUE_QUEUE, message: str = SHED_MESSAGE) -> str:
+    response = VoiceResponse()
+    if enqueue_queue:
+        response.enqueue(enqueue_queue)
+    else:
+        response.say(message)
+        response.hangup()
+    return str(response)
+
+
+SHED_RESPONSE = render_shed_response()
+
+
+def queue_time_ms(request: Request, now: Optional[float] = None) -> Optional[float]:
+    """
+    How long the request waited before reaching the worker, from a "t=<epoch>" or bare epoch X-Request-Start header in
+    seconds, milliseconds or microseconds
+
+    :param request:
+    :param now:
+    :return: None when the header is missing or malformed
+    """
+    header = request.headers.get(REQUEST_START_HEADER)
+    if not header:
+        return None
+    try:
+        started = float(header[2:] if header.startswith("t=") else header)
+    except ValueError:
+        return None
+    # Normalize to seconds
+    while started > 1e11:
+        started /= 1000
+    now = time.time() if now is None else now
+    return max(0.0, (now - started) * 1000)
+
+
+class AdmissionController:
+
+    def __init__(self, shed_new_calls_at: int = SHED_NEW_CALLS_AT,
+                 shed_new_calls_queue_ms: float = SHED_NEW_CALLS_QUEUE_MS):
+        self.shed_new_calls_at = shed_new_calls_at
+        self.shed_new_calls_queue_ms = shed_new_calls_queue_ms
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+        self._lock = threading.Lock()
+
+    def should_shed(self, request: Request) -> bool:
+        if self.in_flight >= self.shed_new_calls_at:
+            return True
+        if self.shed_new_calls_queue_ms > 0:
+            waited = queue_time_ms(request)
+            return waited is not None and waited >= self.shed_new_calls_queue_ms
+        return False
+
+    @contextmanager
+    def admit(self, request: Request, sheddable: bool) -> Iterator[bool]:
+        """
+        Counts the webhook as in flight for its duration
+
+        :param request:
+        :param sheddable: whether the webhook may be turned away, only new calls are
+        :return: whether the request was admitted, a request that was not must be answered with SHED_RESPONSE
+        """
+        with self._lock:
+            self.in_flight += 1
+            shed = sheddable and self.should_shed(request)
+            if shed:
+                self.shed += 1
+            else:
+                self.admitted += 1
+        if shed:
+            ivr_logger.warning("shedding new call %s, %s webhooks in flight", request.form.get("CallSid"),
+                               self.in_flight)
+        try:
+            yield not shed
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def snapshot(self) -> Dict:
+        return {
+            "in_flight": self.in_flight,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "shed_new_calls_at": self.shed_new_calls_at,
+        }
+
+
+admission_controller = AdmissionController()
+
+
+def shed_response() -> Response:
+    return Response(SHED_RESPONSE, content_type='text/xml; charset=utf-8')
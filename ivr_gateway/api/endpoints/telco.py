@@ -6,6 +6,7 @@ import xml.etree.ElementTree as ET  # nosec
 
 
 from ivr_gateway.api.v1.resources import APIV1AdminResource
+from ivr_gateway.recent_transfers import recent_transfers
 from ivr_gateway.utils import returns_xml
 
 ns = Namespace(name="telco", description="Telco API")
@@ -24,7 +25,12 @@ class TransferCallResource(APIV1AdminResource):
             return result
         full_ani = ani if len(ani) > 10 else f"1{ani}"
         full_dnis = dnis if len(dnis) > 10 else f"1{dnis}"
-        maybe_call, no_call_reason = self.call_service.get_recent_transferred_call(full_ani, full_dnis)
+        maybe_call = recent_transfers.find(full_ani, full_dnis)
+        # The caller may have called again since, on another worker or still in progress
+        if maybe_call is not None and maybe_call.leg_id != self.call_service.get_most_recent_call_leg_id(full_ani):
+            maybe_call = None
+        if maybe_call is None:
+            maybe_call, no_call_reason = self.call_service.get_recent_transferred_call(full_ani, full_dnis)
 
         response_type = ET.SubElement(result, 'type')
         if maybe_call is None:
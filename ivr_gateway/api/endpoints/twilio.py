@@ -9,6 +9,9 @@ ns = Namespace(name="twilio", description="Twilio API")
 
 @ns.route('/new')
 class TwilioNewCallResource(APIV1TwilioResource):
+    sheddable = True
+    replayable = True
+
     @returns_twiml
     def post(self):
         return self.twilio_adapter.new_call(request)
@@ -16,6 +19,8 @@ class TwilioNewCallResource(APIV1TwilioResource):
 
 @ns.route('/transfer')
 class TwilioTransferCallResource(APIV1TwilioResource):
+    replayable = True
+
     @returns_twiml
     def post(self):
         return self.twilio_adapter.transfer_call_in(request)
@@ -23,6 +28,8 @@ class TwilioTransferCallResource(APIV1TwilioResource):
 
 @ns.route('/continue')
 class TwilioContinueCallResource(APIV1TwilioResource):
+    replayable = True
+
     @returns_twiml
     def post(self):
         return self.twilio_adapter.continue_call(request)
@@ -1,4 +1,5 @@
-from flask import Blueprint, jsonify, current_app
+from ddtrace import tracer
+from flask import Blueprint, jsonify, current_app, request
 from flask_restx import Api
 
 from ivr_gateway.api.endpoints.admin import ns as admin_namespace
@@ -23,7 +24,10 @@ from ivr_gateway.api.endpoints.schemas.output.admin import (admin_user_schema,
                                                             admin_call_schema,
                                                             scheduled_call_schema, admin_api_credential_schema,
                                                             token_response_schema)
-from ivr_gateway.utils import log_request_info
+from ivr_gateway.logger import log_queue_dropped_count, log_queue_enabled
+from ivr_gateway.query_stats import QUERY_COUNT_HEADER, QUERY_STATS_ENVIRON_KEY, get_request_query_stats, \
+    query_count_header_enabled
+from ivr_gateway.utils import log_request_info, log_response_info
 
 
 def get_logger():
@@ -68,9 +72,31 @@ def log_before_request_info():
 
 @api_v1_blueprint.after_request
 def log_after_request(response):
-    get_logger().debug('Response Data: %s', response.json)
+    log_response_info(get_logger(), response)
+    record_query_stats(response)
+    record_log_queue_drops()
     return response
 
+
+def record_query_stats(response):
+    query_stats = get_request_query_stats()
+    span = tracer.current_root_span()
+    if span is not None:
+        for tag, value in query_stats.as_tags().items():
+            span.set_tag(tag, value)
+    # Picked up by BearerLogger for the access log line, after the request context is gone
+    request.environ[QUERY_STATS_ENVIRON_KEY] = query_stats
+    if query_count_header_enabled():
+        response.headers[QUERY_COUNT_HEADER] = str(query_stats.statements)
+
+
+def record_log_queue_drops():
+    span = tracer.current_root_span()
+    if span is not None and log_queue_enabled():
+        # Running total for the worker, records dropped since the last request show up as an increase
+        span.set_tag("log_queue.dropped", log_queue_dropped_count())
+
+
 @api_v1_blueprint.app_errorhandler(404)
 def resource_not_found(e):
     return jsonify(error=str(e)), 404
@@ -1,20 +1,28 @@
 from typing import Optional
 
+import sqlalchemy
 from ddtrace import tracer
-from flask import request, has_request_context
+from flask import Response, request, has_request_context
+from flask_restx import Resource
 from sqlalchemy import orm
 
 from ivr_gateway.adapters.exceptions import InvalidAuthenticationException
 from ivr_gateway.adapters.livevox import LiveVoxRequestAdapter
-from ivr_gateway.api.exceptions import InvalidAPIAuthenticationException
+from ivr_gateway.api.exceptions import DuplicateDatabaseEntryException, InvalidAPIAuthenticationException
 from ivr_gateway.adapters.twilio import TwilioRequestAdapter
+from ivr_gateway.admission import admission_controller, shed_response
 from ivr_gateway.api import APIResource
 from ivr_gateway.db import session_scope
+from ivr_gateway.deadline import current_deadline, record_deadline, start_deadline
+from ivr_gateway.logger import ivr_logger
 from ivr_gateway.services.admin import AdminService
 from ivr_gateway.services.calls import CallService
 from ivr_gateway.services.queues import QueueService
+from ivr_gateway.services.webhooks import REPLAY_WAIT_SECONDS, WebhookReplayService, webhook_payload_hash
 from ivr_gateway.services.workflows import WorkflowService
 
+IDEMPOTENCY_TOKEN_HEADER = "I-Twilio-Idempotency-Token"  # nosec - a header name, not a credential
+
 
 class APIV1AdminResource(APIResource):
     _db_session: Optional[orm.Session] = None
@@ -39,8 +47,29 @@ class APIV1AdminResource(APIResource):
 class APIV1TwilioResource(APIResource):
     _db_session: Optional[orm.Session] = None
     _twilio_adapter: Optional[TwilioRequestAdapter] = None
+    # Only webhooks for calls that are not in the IVR yet may be shed under load
+    sheddable: bool = False
+    # Whether a retry of the webhook is answered with the response stored for the original
+    replayable: bool = False
 
     def dispatch_request(self, *args, **kwargs):
+        with admission_controller.admit(request, self.sheddable) as admitted:
+            span = tracer.current_root_span()
+            if span is not None:
+                span.set_tag("admission.in_flight", admission_controller.in_flight)
+                span.set_tag("admission.shed", not admitted)
+            if not admitted:
+                return shed_response()
+            return self._dispatch_request_with_deadline(*args, **kwargs)
+
+    def _dispatch_request_with_deadline(self, *args, **kwargs):
+        deadline = start_deadline()
+        try:
+            return self._dispatch_request_in_session(*args, **kwargs)
+        finally:
+            record_deadline(deadline, tracer.current_root_span())
+
+    def _dispatch_request_in_session(self, *args, **kwargs):
         with session_scope() as session:
             self._db_session = session
 
@@ -58,8 +87,54 @@ class APIV1TwilioResource(APIResource):
             except InvalidAuthenticationException as e:
                 raise InvalidAPIAuthenticationException(*e.args)
 
+            if not self.replayable:
+                return super().dispatch_request(*args, **kwargs)
+            return self._dispatch_replayable_request(*args, **kwargs)
+
+    def _dispatch_replayable_request(self, *args, **kwargs):
+        # Twilio sends the same token with every retry of a request, without it a caller pressing the same digits at
+        # two consecutive prompts is indistinguishable from a retry
+        idempotency_token = request.headers.get(IDEMPOTENCY_TOKEN_HEADER)
+        if not idempotency_token:
             return super().dispatch_request(*args, **kwargs)
 
+        call_sid = self.twilio_adapter.get_call_id(request)
+        payload_hash = webhook_payload_hash(request.form.items(multi=True), idempotency_token)
+        replay_service = WebhookReplayService(self.get_db_session())
+        claimed_id, previous = replay_service.claim(call_sid, request.path, payload_hash)
+        if previous is not None and previous.response is None:
+            # The original committed some of its work (vendor responses) and is still running
+            deadline = current_deadline()
+            timeout = REPLAY_WAIT_SECONDS if deadline is None else min(REPLAY_WAIT_SECONDS, deadline.remaining() / 2)
+            previous = replay_service.wait_for_response(previous, timeout)
+        span = tracer.current_root_span()
+        if span is not None:
+            span.set_tag("webhook.replayed", previous is not None)
+        if previous is not None:
+            ivr_logger.warning("replaying the response to a retried %s for call: %s", request.path, call_sid)
+            return Response(previous.response, status=previous.status_code, content_type='text/xml; charset=utf-8')
+
+        # Skips APIResource's nested session scope so the response is recorded before the request commits. The step
+        # engine and vendor services commit mid-request though, which makes the claim visible to a retry early, so a
+        # claim that ends up without a response is released rather than left for retries to wait on.
+        try:
+            response = Resource.dispatch_request(self, *args, **kwargs)
+        except Exception as e:
+            if claimed_id is not None:
+                # session_scope rolls the request's own work back anyway, the release has to outlive that rollback
+                self.get_db_session().rollback()
+                replay_service.release(claimed_id)
+                self.get_db_session().commit()
+            if isinstance(e, sqlalchemy.exc.IntegrityError):
+                raise DuplicateDatabaseEntryException(*e.args)
+            raise
+        if claimed_id is not None:
+            if response.status_code == 200:
+                replay_service.record(claimed_id, response.get_data(as_text=True), response.status_code)
+            else:
+                replay_service.release(claimed_id)
+        return response
+
     @property
     def twilio_adapter(self) -> TwilioRequestAdapter:
         if self._twilio_adapter is None:
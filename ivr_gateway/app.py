@@ -5,7 +5,7 @@ from ddtrace import patch_all
 from flask.logging import default_handler
 from flask_request_id_header.middleware import RequestID
 
-from ivr_gateway.logger import setup_log_handler, ivr_logger
+from ivr_gateway.logger import enable_queued_logging, ivr_logger, log_queue_enabled, setup_log_handler
 
 if os.environ.get("DATADOG_ENV", False):  # pragma: no cover
     patch_all()
@@ -19,7 +19,9 @@ import ivr_gateway.steps.dynamic_import  # noqa: F401
 
 from ivr_gateway.api.exceptions import InvalidAPIRequestException, serialize_exception_to_response
 from ivr_gateway.api.v1 import api_v1_blueprint
-from commands import register_cli
+from ivr_gateway.invalidation import install_invalidation_publisher
+from ivr_gateway.query_stats import install_query_counter
+from ivr_gateway.recent_transfers import install_recent_transfers_recorder
 
 
 app = Flask(__name__)
@@ -42,6 +44,9 @@ if __name__ != "__main__":
     else:
         setup_log_handler(app.logger, handler=default_handler)
         setup_log_handler(ivr_logger)
+    if log_queue_enabled():
+        enable_queued_logging(app.logger)
+        enable_queued_logging(ivr_logger)
 
 
 @app.errorhandler(InvalidAPIRequestException)
@@ -50,9 +55,15 @@ def invalid_api_usage_error(err: InvalidAPIRequestException) -> Response:
     return resp
 
 
+install_query_counter()
+install_invalidation_publisher()
+install_recent_transfers_recorder()
 app.register_blueprint(core_blueprint)
 app.register_blueprint(api_v1_blueprint)
-register_cli(app)
+# The CLI pulls in every command (and the step tree registry), web workers never need it
+if os.environ.get("GUNICORN_WEBSERVER_ENABLED", "false") != "true":
+    from commands import register_cli
+    register_cli(app)
 
 
 # if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,171 @@
+"""
+Per-endpoint circuit breakers for outbound vendor calls.
+
+A breaker opens once the failure rate over its recent calls crosses a threshold, calls then fail fast until the open
+period passes and a limited number of half-open probes decide whether to close it again. Each breaker also bounds the
+number of concurrent calls to its endpoint (a bulkhead). State is per process.
+"""
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List
+
+from requests.exceptions import ConnectionError, HTTPError, Timeout
+
+from ivr_gateway.deadline import DeadlineExceeded
+from ivr_gateway.logger import ivr_logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+FAILURE_RATE_THRESHOLD = float(os.getenv("IVR_BREAKER_FAILURE_RATE", "0.5"))
+MINIMUM_CALLS = int(os.getenv("IVR_BREAKER_MINIMUM_CALLS", "10"))
+WINDOW_SIZE = int(os.getenv("IVR_BREAKER_WINDOW_SIZE", "20"))
+OPEN_SECONDS = float(os.getenv("IVR_BREAKER_OPEN_SECONDS", "30"))
+HALF_OPEN_PROBES = int(os.getenv("IVR_BREAKER_HALF_OPEN_PROBES", "1"))
+MAX_CONCURRENT_CALLS = int(os.getenv("IVR_BULKHEAD_MAX_CONCURRENT_CALLS", "10"))
+
+
+class CircuitOpenError(ConnectionError):
+    """
+    The call was not attempted because the endpoint's circuit is open. It is a requests ConnectionError so callers
+    take the same error branch they take when the vendor is unreachable.
+    """
+
+
+class BulkheadFullError(ConnectionError):
+    """
+    The call was not attempted because too many calls to the endpoint are already in flight
+    """
+
+
+def is_failure(exception: BaseException) -> bool:
+    """
+    Only failures that point at the vendor count, client errors (4xx) and our own rejections do not
+
+    :param exception:
+    :return:
+    """
+    if isinstance(exception, (CircuitOpenError, BulkheadFullError, DeadlineExceeded)):
+        return False
+    if isinstance(exception, HTTPError):
+        return exception.response is None or exception.response.status_code >= 500
+    return isinstance(exception, (Timeout, ConnectionError))
+
+
+class CircuitBreaker:
+
+    def __init__(self, name: str, failure_rate_threshold: float = FAILURE_RATE_THRESHOLD,
+                 minimum_calls: int = MINIMUM_CALLS, window_size: int = WINDOW_SIZE, open_seconds: float = OPEN_SECONDS,
+                 half_open_probes: int = HALF_OPEN_PROBES, max_concurrent_calls: int = MAX_CONCURRENT_CALLS):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.max_concurrent_calls = max_concurrent_calls
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.in_flight = 0
+        self.probes_in_flight = 0
+        self.rejected_calls = 0
+        # True for a failed call
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    @property
+    def failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(self.outcomes) / len(self.outcomes)
+
+    def _transition(self, state: str):
+        ivr_logger.warning("circuit breaker %s: %s -> %s (failure rate %.2f over %s calls)",
+                           self.name, self.state, state, self.failure_rate, len(self.outcomes))
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+        elif state == CLOSED:
+            self.outcomes.clear()
+
+    def _acquire(self) -> bool:
+        """
+        :return: whether the call is a half-open probe
+        """
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.open_seconds:
+                self._transition(HALF_OPEN)
+            if self.state == OPEN or (self.state == HALF_OPEN and self.probes_in_flight >= self.half_open_probes):
+                self.rejected_calls += 1
+                raise CircuitOpenError(f"circuit for {self.name} is {self.state}")
+            if self.in_flight >= self.max_concurrent_calls:
+                self.rejected_calls += 1
+                raise BulkheadFullError(f"{self.in_flight} calls to {self.name} already in flight")
+            self.in_flight += 1
+            is_probe = self.state == HALF_OPEN
+            if is_probe:
+                self.probes_in_flight += 1
+            return is_probe
+
+    def _release(self, is_probe: bool, failed: bool):
+        with self._lock:
+            self.in_flight -= 1
+            if is_probe:
+                self.probes_in_flight -= 1
+                self._transition(OPEN if failed else CLOSED)
+                return
+            if self.state != CLOSED:
+                return
+            self.outcomes.append(failed)
+            if len(self.outcomes) >= self.minimum_calls and self.failure_rate >= self.failure_rate_threshold:
+                self._transition(OPEN)
+
+    @contextmanager
+    def call(self) -> Iterator[None]:
+        """
+        Wraps one call to the endpoint, raising CircuitOpenError or BulkheadFullError instead of running it when the
+        endpoint should not be called. Exceptions raised by the call are recorded and re-raised.
+
+        :return:
+        """
+        is_probe = self._acquire()
+        try:
+            yield
+        except Exception as e:
+            self._release(is_probe, failed=is_failure(e))
+            raise
+        self._release(is_probe, failed=False)
+
+    def snapshot(self) -> Dict:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "failure_rate": round(self.failure_rate, 3),
+            "calls_in_window": len(self.outcomes),
+            "in_flight": self.in_flight,
+            "rejected_calls": self.rejected_calls,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker_for(name: str) -> CircuitBreaker:
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker(name))
+    return breaker
+
+
+def circuit_breaker_snapshots() -> List[Dict]:
+    return [breaker.snapshot() for breaker in sorted(_breakers.values(), key=lambda breaker: breaker.name)]
+
+
+def reset_circuit_breakers():
+    with _breakers_lock:
+        _breakers.clear()
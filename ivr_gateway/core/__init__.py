@@ -1,7 +1,9 @@
-from flask import Blueprint
+from flask import Blueprint, jsonify
 from flask_restx import A000pi
 
 import ivr_gateway.steps.dynamic_import  # noqa: F401
+from ivr_gateway.admission import admission_controller
+from ivr_gateway.circuit_breaker import circuit_breaker_snapshots
 from ivr_gateway.db import session_scope
 
 blueprint = Blueprint('core', __name__)
@@ -27,3 +29,15 @@ def heartbeat():
 @blueprint.route("/ping", methods=["GET"])
 def ping():
     return "pong"
+
+
+@blueprint.route("/circuit_breakers", methods=["GET"])
+def circuit_breakers():
+    # State of this worker's breakers, each gunicorn worker keeps its own
+    return jsonify(circuit_breakers=circuit_breaker_snapshots())
+
+
+@blueprint.route("/admission", methods=["GET"])
+def admission():
+    # Counters of the worker that served this request
+    return jsonify(admission_controller.snapshot())
@@ -0,0 +1,37 @@
+"""
+Strict date parsing for the fixed formats the IVR handles on every call: DTMF entries ("mmddyyyy") and the ISO dates
+returned by vendors. dateparser (and its locale detection) is only imported for free-form input that matches none of
+them, so a call that never sees such input never loads it.
+"""
+from datetime import datetime
+from typing import Optional, Sequence
+
+DTMF_DATE_FORMAT = "%m%d%Y"
+
+
+def parse_date(value: Optional[str], date_formats: Sequence[str] = ()) -> Optional[datetime]:
+    """
+    :param value:
+    :param date_formats: strptime formats tried before ISO 8601
+    :return: None when the value is not a date, as with dateparser.parse
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    if not value:
+        return None
+    for date_format in date_formats:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            pass
+    if value.isdigit():
+        # Digits that match none of the formats are not a date, dateparser does not parse them either. Checked before
+        # fromisoformat, which accepts compact dates ("20210915") from Python 3.11 on.
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    import dateparser
+    return dateparser.parse(value, date_formats=list(date_formats) or None)
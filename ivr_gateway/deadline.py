@@ -0,0 +1,94 @@
+import os
+import time
+from typing import Optional
+
+from flask import g, has_request_context
+from requests.exceptions import Timeout
+
+from ivr_gateway.logger import ivr_logger
+
+# Twilio gives up on a webhook after 15 seconds, keep headroom for rendering the response and committing
+WEBHOOK_DEADLINE_SECONDS = float(os.getenv("IVR_WEBHOOK_DEADLINE_SECONDS", "12"))
+# Below this an outbound call is not attempted at all, it could not complete anyway
+MINIMUM_REQUEST_SECONDS = float(os.getenv("IVR_DEADLINE_MINIMUM_REQUEST_SECONDS", "0.5"))
+
+
+class DeadlineExceeded(Timeout):
+    """
+    Raised instead of making an outbound request once the webhook deadline is (nearly) spent. It is a requests Timeout
+    so callers take the same error branch they take when the vendor times out.
+    """
+
+
+class Deadline:
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.skipped_requests = 0
+        self.truncated_requests = 0
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def request_timeout(self, default: float) -> float:
+        """
+        :param default: the timeout the request would use without a deadline
+        :return: the timeout to use, never past the deadline
+        """
+        remaining = self.remaining()
+        if remaining < MINIMUM_REQUEST_SECONDS:
+            self.skipped_requests += 1
+            raise DeadlineExceeded(f"{remaining:.3f}s left of the {self.seconds:.1f}s webhook deadline")
+        if remaining < default:
+            self.truncated_requests += 1
+            return remaining
+        return default
+
+    def as_tags(self) -> dict:
+        return {
+            "deadline.remaining_ms": round(self.remaining() * 1000),
+            "deadline.skipped_requests": self.skipped_requests,
+            "deadline.truncated_requests": self.truncated_requests,
+        }
+
+
+def start_deadline(seconds: float = WEBHOOK_DEADLINE_SECONDS) -> Deadline:
+    g.deadline = Deadline(seconds)
+    return g.deadline
+
+
+def current_deadline() -> Optional[Deadline]:
+    if not has_request_context():
+        return None
+    return g.get("deadline")
+
+
+def request_timeout(default: float) -> float:
+    """
+    Timeout for an outbound request made while handling a webhook, raises DeadlineExceeded when there is no time left
+
+    :param default:
+    :return:
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return default
+    return deadline.request_timeout(default)
+
+
+def record_deadline(deadline: Deadline, span=None):
+    """
+    Tags the request span with how the deadline was spent and logs overruns
+
+    :param deadline:
+    :param span:
+    :return:
+    """
+    tags = deadline.as_tags()
+    if span is not None:
+        for tag, value in tags.items():
+            span.set_tag(tag, value)
+        span.set_tag("deadline.exceeded", deadline.remaining() < 0)
+    if deadline.remaining() < 0 or deadline.skipped_requests:
+        ivr_logger.warning("webhook deadline exceeded: %s", tags)
@@ -37,26 +37,27 @@ class StepEngine:
     def initialize(self, step: Step):
         # Make sure we have a step run object
         step_run = self.workflow_run.get_current_step_run() if step.step_run is None else step.step_run
-        # Make sure we are setup for run by committing the run and state
+        # Make sure we are setup for run by committing the run and state, this is the checkpoint before any step that
+        # interacts with the caller or has external side effects
         self.db_session.add(step_run)
-        self.db_session.commit()
+        self.checkpoint(step)
         self.current_step = step
         self.state = StepEngineState.initialized
-        ivr_logger.info(f"step initalized: {step.name}")
-        ivr_logger.debug(f"step:{step}, step_run: {step_run}")
+        ivr_logger.info("step initalized: %s", step.name)
+        ivr_logger.debug("step:%s, step_run: %s", step, step_run)
 
     def run_step(self, step_input: StepInput = None) -> StepResult:
         result: Optional[StepResult]
         new_step_state: Optional[StepState]
 
-        ivr_logger.debug(f"run_step: step_input: {step_input}")
+        ivr_logger.debug("run_step: step_input: %s", step_input)
         if self.state != StepEngineState.initialized:
             error = StepError("Cannot run engine that is not initialized", retryable=False)
             ivr_logger.critical(error)
             raise error
         assert self.current_step is not None  # nosec
         self.state = StepEngineState.step_in_progress
-        ivr_logger.debug(f"run_step current_step: {self.current_step}")
+        ivr_logger.debug("run_step current_step: %s", self.current_step)
 
         # Steps can throw RunStepExceptions or errors in processing results can raise them
         try:
@@ -66,7 +67,7 @@ class StepEngine:
             self.db_session.add(self.current_step.step_run)
             self.db_session.commit()
             self.state = StepEngineState.step_error
-            ivr_logger.warning(f"Exception: {e.msg}, StepRun: {self.current_step.step_run}")
+            ivr_logger.warning("Exception: %s, StepRun: %s", e.msg, self.current_step.step_run)
             raise e
 
         # If we don't have a result, then we didnt match on the step type, raises exceptions
@@ -79,10 +80,24 @@ class StepEngine:
         # Update the step state object from the run result
         ivr_logger.debug(str(result))
         self.db_session.add(self.current_step.step_run)
-        self.db_session.commit()
+        self.checkpoint()
         self.state = StepEngineState.step_complete
         return result
 
+    def checkpoint(self, step: Optional[Step] = None):
+        """
+        Commits the workflow's progress, or only flushes it when the step is pure. A chain of pure steps is then
+        committed once, by the checkpoint of the step that follows it.
+
+        :param step: defaults to the current step
+        :return:
+        """
+        step = step or self.current_step
+        if step is not None and step.pure:
+            self.db_session.flush()
+        else:
+            self.db_session.commit()
+
     def get_step_error_message(self) -> Optional[str]:
         if self.current_step.step_run.state.error:
             return self.current_step.step_run.state.result['message']
@@ -109,8 +124,8 @@ class StepEngine:
 
     def _run_v1_step_and_process_result(self, step: v1.APIV1Step, step_input: StepInput = None) \
             -> StepResult:
-        ivr_logger.info(f"branch: {self.workflow_run.current_step_branch_name}, step: {step.name}")
-        ivr_logger.debug(f"_run_v1_step_and_process_result step: {step}")
+        ivr_logger.info("branch: %s, step: %s", self.workflow_run.current_step_branch_name, step.name)
+        ivr_logger.debug("_run_v1_step_and_process_result step: %s", step)
         if isinstance(step, v1.InputStep):
             ivr_logger.info("step_type: v1.InputStep")
             return step.run(step_input=step_input)
@@ -94,27 +94,27 @@ class WorkflowEngine:
         """
         # Setup Step engine and registering the first workflow_run step
         if self.workflow_run.step_run_count == 0:
-            ivr_logger.debug(f"WorkflowEngine.initialize StepRunCount: 0, workflow_run: {self.workflow_run}")
+            ivr_logger.debug("WorkflowEngine.initialize StepRunCount: 0, workflow_run: %s", self.workflow_run)
             step = self._get_initial_step_for_workflow_from_config()
-            ivr_logger.debug(f"WorkflowEngine.initialize step: {step}")
+            ivr_logger.debug("WorkflowEngine.initialize step: %s", step)
             # Register first step
             self.workflow_run.initialize_first_step.set(step)
             # Create state for step if needed and initialize a step engine for the current step
             step.step_run = self.workflow_run.get_current_step_run()
-            ivr_logger.debug(f"WorkflowEngine.initialize step_run: {step.step_run}")
+            ivr_logger.debug("WorkflowEngine.initialize step_run: %s", step.step_run)
             self.step_engine.initialize(step)
         else:
-            ivr_logger.debug(f"WorkflowEngine.initialize StepRunCount: {self.workflow_run.step_run_count}")
+            ivr_logger.debug("WorkflowEngine.initialize StepRunCount: %s", self.workflow_run.step_run_count)
             current_step_run = self.workflow_run.get_current_step_run()
-            ivr_logger.debug(f"WorkflowEngine.initialize current_step_run: {current_step_run}")
+            ivr_logger.debug("WorkflowEngine.initialize current_step_run: %s", current_step_run)
             step = self.workflow_service.create_step_for_workflow(self.workflow_run, current_step_run.name)
-            ivr_logger.debug(f"WorkflowEngine.initialize step: {step}")
+            ivr_logger.debug("WorkflowEngine.initialize step: %s", step)
             step.step_run = current_step_run
             self.step_engine.initialize(step)
         self.session.add(self.workflow_run)
         self.session.add(step.step_run)
         self.session.add_all(self.workflow_run.workflow_step_runs)
-        self.session.commit()
+        self.step_engine.checkpoint(step)
         # Mark that we are initialized and ready to run the step
         self._initialize_engine_state_from_workflow()
 
@@ -140,18 +140,18 @@ class WorkflowEngine:
         the WorkflowEngine will mark its internal state as in WorkflowEngineState.error, and raise a WorkflowError
         containing the relevant StepError if it exists
         """
-        ivr_logger.info(f"WorkflowEngine.run_current_workflow_step StepInput: {step_input}")
+        ivr_logger.info("WorkflowEngine.run_current_workflow_step StepInput: %s", step_input)
         result, next_step_or_exit = self._prepare_for_step_engine_execution(step_input=step_input)
         # we should expect a (True, True)
         if result is not True:
-            ivr_logger.debug(f"WorkflowEngine.run_current_workflow_step result: {result}")
+            ivr_logger.debug("WorkflowEngine.run_current_workflow_step result: %s", result)
             return result, next_step_or_exit
         # Use step engine to run the workflow_run step
         try:
             result = self.step_engine.run_step(step_input=step_input)
-            ivr_logger.debug(f"WorkflowEngine.run_current_workflow_step result: {result}")
+            ivr_logger.debug("WorkflowEngine.run_current_workflow_step result: %s", result)
         except StepError as e:
-            ivr_logger.warning(f"WorkflowEngine.run_current_workflow_step StepError: {e.msg}")
+            ivr_logger.warning("WorkflowEngine.run_current_workflow_step StepError: %s", e.msg)
             result = e
 
         return self._handle_step_response(result)
@@ -186,17 +186,17 @@ class WorkflowEngine:
             self.session.commit()
             self.state = WorkflowEngineState.step_in_progress
 
-        ivr_logger.debug(f"WorkflowEngine._prepare_for_step_engine_execution workflow_run: {self.workflow_run}")
+        ivr_logger.debug("WorkflowEngine._prepare_for_step_engine_execution workflow_run: %s", self.workflow_run)
 
         # Validate we are in the correct run state before proceeding
         if self.state in invalid_run_states:
             exception = WorkflowEngineInvalidStateException('Workflow engine can only be called from initialized')
-            ivr_logger.critical(f"WorkflowEngine._prepare_for_step_engine_execution: {exception}")
+            ivr_logger.critical("WorkflowEngine._prepare_for_step_engine_execution: %s", exception)
             raise exception
 
         # Depending on step type we do some other preflight checks
         current_step = self.get_current_step()
-        ivr_logger.debug(f"WorkflowEngine._prepare_for_step_engine_execution current_step: {current_step}")
+        ivr_logger.debug("WorkflowEngine._prepare_for_step_engine_execution current_step: %s", current_step)
         span = tracer.current_span()
         if span is not None:
             span.set_tags({'branch_name': self.workflow_run.current_step_branch_name,
@@ -287,12 +287,12 @@ class WorkflowEngine:
                 step = self.workflow_service.create_step_for_workflow(
                     self.workflow_run, current_step.on_error_reset_to_step
                 )
-                ivr_logger.info(f"Reset to step: {step}")
+                ivr_logger.info("Reset to step: %s", step)
                 existing_step_run = self.workflow_run.get_branch_step_run(
                     self.workflow_run.current_step_branch_name, step.name
                 )
 
-                ivr_logger.debug(f"Reset to step, step_run: {existing_step_run}")
+                ivr_logger.debug("Reset to step, step_run: %s", existing_step_run)
                 self.session.refresh(existing_step_run)
                 if isinstance(step, InputStep) and self.workflow_run.state != WorkflowState.requesting_user_input:
                     ivr_logger.warning("retrying input step")
@@ -321,7 +321,7 @@ class WorkflowEngine:
             if current_step.on_error_switch_to_branch is not None:
                 return self._handle_switch_branch_on_error(current_step, result)
 
-            ivr_logger.critical(f"Unrecoverable Step Error: {result.msg}")
+            ivr_logger.critical("Unrecoverable Step Error: %s", result.msg)
             raise WorkflowEngineUnrecoverableException(
                 f"Step Error Triggered in workflow: {result.msg}", step_error=result
             )
@@ -347,10 +347,10 @@ class WorkflowEngine:
         return StepSuccess(f"Switched branch due to error: {result.msg}"), next_step_or_exit
 
     def _handle_step_replay(self, result: StepReplay) -> Tuple[StepResult, NextStepOrExit]:
-        ivr_logger.info(f"result: {result}")
+        ivr_logger.info("result: %s", result)
         current_step = self.get_current_step()
         # Replay_step, don't change step runs.
-        ivr_logger.debug(f"current_step: {current_step}, workflow_run: {self.workflow_run}")
+        ivr_logger.debug("current_step: %s, workflow_run: %s", current_step, self.workflow_run)
         self.workflow_run.replay_step.set(current_step)
         self.session.add(self.workflow_run)
         self.session.commit()
@@ -360,16 +360,16 @@ class WorkflowEngine:
         return result, current_step
 
     def _handle_step_success(self, result: StepSuccess):
-        ivr_logger.info(f"result: {result}")
+        ivr_logger.info("result: %s", result)
         current_step = self.get_current_step()
-        ivr_logger.debug(f"current step: {current_step}")
+        ivr_logger.debug("current step: %s", current_step)
         if isinstance(current_step, BranchWorkflowStep):
             # Trigger the branch
-            ivr_logger.info(f"branching: {current_step}")
+            ivr_logger.info("branching: %s", current_step)
             self.workflow_run.switch_step_branch(result.result)
             # Use workflow service to process the result into a next step or exit 
         next_step_or_exit = self.workflow_service.process_step_result(self.workflow_run)
-        ivr_logger.info(f"next_step_or_exit: {next_step_or_exit}")
+        ivr_logger.info("next_step_or_exit: %s", next_step_or_exit)
         if isinstance(next_step_or_exit, ExitPath):
             # When we receive an exit path the workflow_run is completed so mark it as "finished"
             # and update the engine state
@@ -390,11 +390,12 @@ class WorkflowEngine:
                                                 CallExternalServiceStep)):
                 self.workflow_run.advance_step.set(next_step_or_exit)
             else:
-                ivr_logger.critical(f"Cannot register next step with workflow_run. Step: {next_step_or_exit}")
+                ivr_logger.critical("Cannot register next step with workflow_run. Step: %s", next_step_or_exit)
                 raise WorkflowEngineException(
                     f"Cannot register next step with workflow_run. Step: {next_step_or_exit}")
             self.session.add(self.workflow_run)
-            self.session.commit()
+            # Only flushed after a pure step, initializing the next step commits unless it is pure too
+            self.step_engine.checkpoint()
             self.state = WorkflowEngineState.step_in_progress
             # Load the next step in case this is an interactive or multi run use
             self.step_engine.initialize(next_step_or_exit)
@@ -0,0 +1,243 @@
+"""
+Invalidation bus for in-process caches of configuration rows.
+
+Every committed change to one of the INVALIDATING_TABLES, whether it comes from the services, the admin API or the CLI,
+is published with a Postgres NOTIFY issued inside the same transaction, so it is only delivered once the change is
+visible. Each web worker runs a listener thread that evicts the affected ConfigCache entries. The committing process
+evicts its own entries on commit without waiting for the round trip.
+
+A ConfigCache only serves from memory while this process is listening (or IVR_CONFIG_CACHE_LOCAL_ONLY is set for single
+process use), otherwise every lookup falls through to its loader.
+"""
+import json
+import os
+import select
+import threading
+from itertools import chain
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import event, orm, text
+from sqlalchemy.engine.url import make_url
+
+from ivr_gateway.logger import ivr_logger
+
+CHANNEL = "ivr_config_invalidation"
+INVALIDATING_TABLES = frozenset([
+    "admin_phone_number",
+    "greeting",
+    "inbound_routing",
+    "queue",
+    "queue_holiday",
+    "queue_hours_of_operation",
+    "transfer_routing",
+    "workflow",
+    "workflow_config",
+])
+# NOTIFY payloads are capped at 8000 bytes, past this the change is published per table only
+MAX_PAYLOAD_BYTES = 7000
+LISTENER_POLL_SECONDS = 5.0
+LISTENER_RECONNECT_SECONDS = 5.0
+_PENDING_CHANGES_KEY = "ivr.pending_invalidations"
+
+# A change to a table, id is None when the rows are not known (bulk statements, oversized payloads)
+Change = Tuple[str, Optional[str]]
+
+
+class ConfigCache:
+    """
+    Process local cache of values derived from configuration tables, cleared whenever any of those tables change
+    """
+
+    def __init__(self, name: str, tables: Iterable[str]):
+        unknown_tables = set(tables) - INVALIDATING_TABLES
+        if unknown_tables:
+            raise ValueError(f"Changes to {sorted(unknown_tables)} are not published, they cannot back a cache")
+        self.name = name
+        self.tables = frozenset(tables)
+        self._values: Dict[Hashable, Any] = {}
+        # Bumped on every clear, a value loaded across a clear may predate the change and is not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        _caches.append(self)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        if not caching_enabled():
+            return loader()
+        try:
+            value = self._values[key]
+            self.hits += 1
+            return value
+        except KeyError:
+            self.misses += 1
+        generation = self._generation
+        value = loader()
+        if generation == self._generation:
+            self._values[key] = value
+        return value
+
+    def invalidate(self, changes: Iterable[Change]):
+        if any(table in self.tables for table, _ in changes):
+            self.clear()
+
+    def clear(self):
+        self._generation += 1
+        self._values.clear()
+
+    def __len__(self):
+        return len(self._values)
+
+
+_caches: List[ConfigCache] = []
+
+
+def invalidate(changes: Iterable[Change]):
+    changes = list(changes)
+    for cache in _caches:
+        cache.invalidate(changes)
+
+
+def invalidate_all():
+    for cache in _caches:
+        cache.clear()
+
+
+def build_payloads(changes: Set[Change]) -> List[str]:
+    payload = json.dumps(sorted(changes, key=lambda change: (change[0], change[1] or "")))
+    if len(payload.encode("utf-8")) <= MAX_PAYLOAD_BYTES:
+        return [payload]
+    return [json.dumps([[table, None]]) for table in sorted({table for table, _ in changes})]
+
+
+def parse_payload(payload: str) -> List[Change]:
+    return [(table, row_id) for table, row_id in json.loads(payload)]
+
+
+def _publish(session: orm.Session, changes: Set[Change]):
+    if not changes:
+        return
+    for payload in build_payloads(changes):
+        session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+    session.info.setdefault(_PENDING_CHANGES_KEY, set()).update(changes)
+
+
+def _change_for(instance) -> Optional[Change]:
+    table = getattr(instance, "__tablename__", None)
+    if table not in INVALIDATING_TABLES:
+        return None
+    row_id = getattr(instance, "id", None)
+    return table, str(row_id) if row_id is not None else None
+
+
+def _after_flush(session: orm.Session, flush_context):
+    modified = (instance for instance in session.dirty if session.is_modified(instance))
+    changes = {_change_for(instance) for instance in chain(session.new, modified, session.deleted)}
+    changes.discard(None)
+    _publish(session, changes)
+
+
+def _after_bulk_statement(update_context):
+    table = update_context.mapper.local_table.name
+    if table in INVALIDATING_TABLES:
+        _publish(update_context.session, {(table, None)})
+
+
+def _after_commit(session: orm.Session):
+    changes = session.info.pop(_PENDING_CHANGES_KEY, None)
+    if changes:
+        invalidate(changes)
+
+
+def _after_rollback(session: orm.Session):
+    session.info.pop(_PENDING_CHANGES_KEY, None)
+
+
+def install_invalidation_publisher():
+    if not event.contains(orm.Session, "after_flush", _after_flush):
+        event.listen(orm.Session, "after_flush", _after_flush)
+        event.listen(orm.Session, "after_bulk_update", _after_bulk_statement)
+        event.listen(orm.Session, "after_bulk_delete", _after_bulk_statement)
+        event.listen(orm.Session, "after_commit", _after_commit)
+        event.listen(orm.Session, "after_rollback", _after_rollback)
+
+
+class InvalidationListener(threading.Thread):
+    """
+    LISTENs on its own connection and evicts cache entries as notifications arrive. While disconnected nothing is
+    cached, and everything is dropped on (re)connect since notifications may have been missed in between.
+    """
+
+    def __init__(self, database_url: str):
+        super().__init__(name="ivr-invalidation-listener", daemon=True)
+        self.connect_args = make_url(database_url).translate_connect_args(username="user", database="dbname")
+        self.connected = threading.Event()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            connection = None
+            try:
+                connection = psycopg2.connect(**self.connect_args)
+                connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                connection.cursor().execute(f"LISTEN {CHANNEL}")
+                invalidate_all()
+                self.connected.set()
+                self._listen(connection)
+            except (psycopg2.Error, OSError) as e:
+                ivr_logger.warning("invalidation listener disconnected: %s", e)
+            finally:
+                self.connected.clear()
+                invalidate_all()
+                if connection is not None:
+                    connection.close()
+            self.stopped.wait(LISTENER_RECONNECT_SECONDS)
+
+    def _listen(self, connection):
+        while not self.stopped.is_set():
+            readable, _, _ = select.select([connection], [], [], LISTENER_POLL_SECONDS)
+            if not readable:
+                continue
+            connection.poll()
+            while connection.notifies:
+                notification = connection.notifies.pop(0)
+                try:
+                    invalidate(parse_payload(notification.payload))
+                except (ValueError, TypeError):
+                    ivr_logger.error("invalid invalidation payload: %s", notification.payload)
+                    invalidate_all()
+
+    def stop(self):
+        self.stopped.set()
+
+
+_listener: Optional[InvalidationListener] = None
+_listener_pid: Optional[int] = None
+
+
+def listener_enabled() -> bool:
+    return os.getenv("IVR_CONFIG_CACHE_LISTENER", os.getenv("GUNICORN_WEBSERVER_ENABLED", "false")) == "true"
+
+
+def ensure_listener() -> Optional[InvalidationListener]:
+    """
+    Starts the listener for this process if it is enabled, checked by pid so forked workers start their own
+
+    :return:
+    """
+    global _listener, _listener_pid
+    if _listener_pid == os.getpid() or not listener_enabled():
+        return _listener
+    from ivr_gateway.db import get_sqlalchemy_url
+    _listener = InvalidationListener(get_sqlalchemy_url())
+    _listener_pid = os.getpid()
+    _listener.start()
+    return _listener
+
+
+def caching_enabled() -> bool:
+    if os.getenv("IVR_CONFIG_CACHE_LOCAL_ONLY", "false") == "true":
+        return True
+    listener = ensure_listener()
+    return listener is not None and listener.connected.is_set()
@@ -1,12 +1,17 @@
 import base64
 import datetime
 
+import atexit
 import binascii
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
 
 from gunicorn.glogging import Logger
 
+from ivr_gateway.query_stats import QUERY_STATS_ENVIRON_KEY
 from ivr_gateway.request_log_formatter import RequestFormatter
 
 ivr_logger = logging.getLogger('ivr.logger')
@@ -31,6 +36,123 @@ def setup_log_handler(logger, handler=None, defined_log_level=None):
     logger.addHandler(handler)
 
 
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hands records to a QueueListener thread instead of writing them from the request thread. When the buffer is full
+    the record is dropped and counted rather than blocking the request on a slow log consumer
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__(queue.Queue(maxsize=maxsize))
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The message is interpolated here, while any models in the args are still safe to touch from this thread,
+        # the request id has to be captured before the request context is gone. Formatting the line and I/O are left
+        # to the listener.
+        if not hasattr(record, "request_id"):
+            RequestFormatter.add_request_id(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class DropReportingQueueListener(QueueListener):
+    """
+    Writes a warning through the downstream handlers whenever the queue handler had to drop records
+    """
+
+    def __init__(self, queue_handler: BoundedQueueHandler, *handlers: logging.Handler):
+        super().__init__(queue_handler.queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self.reported_drops = 0
+
+    def enqueue_sentinel(self):
+        # Block rather than drop, the sentinel has to make it onto a full queue for stop() to return
+        self.queue.put(self._sentinel)
+
+    def handle(self, record: logging.LogRecord):
+        dropped = self.queue_handler.dropped
+        if dropped > self.reported_drops:
+            super().handle(logging.makeLogRecord({
+                "name": record.name,
+                "levelno": logging.WARNING,
+                "levelname": logging.getLevelName(logging.WARNING),
+                "msg": "log queue full, dropped %s records (%s total)",
+                "args": (dropped - self.reported_drops, dropped),
+                "request_id": "NA",
+            }))
+            self.reported_drops = dropped
+        super().handle(record)
+
+
+_queue_listeners: List[DropReportingQueueListener] = []
+
+
+def log_queue_enabled() -> bool:
+    return os.getenv("LOG_QUEUE_ENABLED", "false") == "true"
+
+
+def enable_queued_logging(logger: logging.Logger, maxsize: Optional[int] = None) -> BoundedQueueHandler:
+    """
+    Moves the logger's handlers behind a bounded queue drained by a background thread
+
+    :param logger:
+    :param maxsize: records buffered before new ones are dropped, defaults to LOG_QUEUE_SIZE
+    :return: the queue handler now attached to the logger, its dropped attribute counts discarded records
+    """
+    if maxsize is None:
+        maxsize = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    handlers = list(logger.handlers)
+    queue_handler = BoundedQueueHandler(maxsize)
+    listener = DropReportingQueueListener(queue_handler, *handlers)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(queue_handler)
+    listener.start()
+    _queue_listeners.append(listener)
+    return queue_handler
+
+
+def restart_queued_logging():
+    """
+    Listener threads do not survive a fork, gives a preloaded worker fresh queues and threads of its own
+
+    :return:
+    """
+    for listener in _queue_listeners:
+        listener.queue_handler.queue = queue.Queue(maxsize=listener.queue_handler.queue.maxsize)
+        listener.queue = listener.queue_handler.queue
+        listener._thread = None
+        listener.start()
+
+
+def log_queue_dropped_count() -> int:
+    return sum(listener.queue_handler.dropped for listener in _queue_listeners)
+
+
+def flush_queued_logging():
+    """
+    Drains every queue and stops the listener threads, called on worker exit so buffered records are not lost
+
+    :return:
+    """
+    while _queue_listeners:
+        _queue_listeners.pop().stop()
+
+
+atexit.register(flush_queued_logging)
+
+
 class BearerLogger(Logger):
 
     def _get_user(self, environ):
@@ -53,6 +175,18 @@ class BearerLogger(Logger):
                     user = auth[0]
         return user
 
+    def atoms(self, resp, req, environ, request_time):
+        atoms = super().atoms(resp, req, environ, request_time)
+        # Exposed to --access-logformat as %(db_statements)s, %(db_commits)s, %(db_rows)s and %(db_time)s
+        query_stats = environ.get(QUERY_STATS_ENVIRON_KEY)
+        atoms.update({
+            "db_statements": query_stats.statements if query_stats is not None else "-",
+            "db_commits": query_stats.commits if query_stats is not None else "-",
+            "db_rows": query_stats.rows if query_stats is not None else "-",
+            "db_time": f"{query_stats.db_time * 1000:.1f}" if query_stats is not None else "-",
+        })
+        return atoms
+
     def now(self):
         now = datetime.datetime.now(datetime.timezone.utc)
         return f"[{now.strftime('%d/%b/%Y:')}{now.time().isoformat(timespec='milliseconds')} {now.strftime('%z')}]"
\ No newline at end of file
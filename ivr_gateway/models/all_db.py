@@ -7,3 +7,4 @@ from ivr_gateway.models.steps import *  # NOQA: F401,F403; pragma: no cover
 from ivr_gateway.models.workflows import *  # NOQA: F401,F403; pragma: no cover
 from ivr_gateway.models.queues import *  # NOQA: F401,F403; pragma: no cover
 from ivr_gateway.models.vendors import *  # NOQA: F401,F403; pragma: no cover
+from ivr_gateway.models.webhooks import *  # NOQA: F401,F403; pragma: no cover
@@ -1,17 +1,22 @@
 import uuid
 from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Enum, Integer
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Enum, Integer, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, JSONB
 
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.collections import attribute_mapped_collection
 from sqlalchemy_utils.types.encrypted.encrypted_type import StringEncryptedType, AesEngine
 
 from ivr_gateway.models import Base
 from ivr_gateway.models.encryption import encryption_key, EncryptableJSONB, EncryptionFingerprintedMixin
 from ivr_gateway.models.enums import Partner, ProductCode, Department, TransferType, ContactType
 
-__all__ = ["Contact", "ContactLeg", "InboundRouting", "Greeting", "TransferRouting"]
+__all__ = ["Contact", "ContactPayload", "ContactLeg", "InboundRouting", "Greeting", "TransferRouting"]
+
+if TYPE_CHECKING:
+    from ivr_gateway.models.workflows import WorkflowRun
 
 from ivr_gateway.services.message import SimpleMessageService
 
@@ -30,16 +35,70 @@ class Contact(EncryptionFingerprintedMixin, Base):
                      nullable=False, default={})
     admin_call_id = Column(UUID(as_uuid=True), ForeignKey("admin_call.id"), index=True, nullable=True)
     contact_type = Column(Enum(ContactType), nullable=False, default=ContactType.IVR)
+    # Lineage of the workflows run for this contact in the order they were entered, kept up to date by CallService
+    visited_workflows = Column(ARRAY(String), nullable=False, default=list, server_default="{}")
+    # "<workflow name>:<config tag or step tree sha>" for each of the visited workflows
+    visited_workflow_configs = Column(ARRAY(String), nullable=False, default=list, server_default="{}")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     contact_legs = relationship("ContactLeg", back_populates="contact", passive_deletes=True,
                                 order_by="ContactLeg.created_at.asc()")
     admin_call = relationship("AdminCall", uselist=False, back_populates="contact")
+    # Vendor payloads by payload type, only loaded when a lookup needs one
+    payloads = relationship("ContactPayload", back_populates="contact", passive_deletes=True,
+                            cascade="all, delete-orphan", collection_class=attribute_mapped_collection("payload_type"))
 
     def __repr__(self):  # pragma: no cover
         return f"<Call {self.id}, customer_id={self.customer_id}, admin_call_id={self.admin_call_id}>"
 
+    def get_payload(self, payload_type: str) -> Optional[dict]:
+        payload = self.payloads.get(payload_type)
+        if payload is not None:
+            return payload.payload
+        # Contacts from before payloads were stored out of line kept them in the session
+        return self.session.get(payload_type)
+
+    def set_payload(self, payload_type: str, payload: dict):
+        existing = self.payloads.get(payload_type)
+        if existing is None:
+            self.payloads[payload_type] = ContactPayload(payload_type=payload_type, payload=payload)
+        else:
+            existing.payload = payload
+
+    def record_workflow_visit(self, workflow_run: "WorkflowRun"):
+        workflow_name = workflow_run.workflow.workflow_name
+        # Reassigned rather than appended to, in place changes to an ARRAY column are not tracked
+        if workflow_name not in (self.visited_workflows or []):
+            self.visited_workflows = [*(self.visited_workflows or []), workflow_name]
+        workflow_config = workflow_run.workflow_config
+        if workflow_config is None:
+            return
+        config = f"{workflow_name}:{workflow_config.tag or workflow_config.step_tree_sha}"
+        if config not in (self.visited_workflow_configs or []):
+            self.visited_workflow_configs = [*(self.visited_workflow_configs or []), config]
+
+
+class ContactPayload(EncryptionFingerprintedMixin, Base):
+    """
+    A vendor payload fetched for a contact, e.g. the customer summary. Payloads are kept out of Contact.session so
+    the session, which is rewritten whenever any of its fields change, stays small.
+    """
+    __tablename__ = "contact_payload"
+    __table_args__ = (
+        UniqueConstraint('contact_id', 'payload_type', name='contact_payload_type_unique_constraint'),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    contact_id = Column(UUID(as_uuid=True), ForeignKey("contact.id", ondelete="CASCADE"), index=True, nullable=False)
+    payload_type = Column(String, nullable=False)
+    payload = Column(StringEncryptedType(EncryptableJSONB, encryption_key, AesEngine, 'pkcs5'),
+                     nullable=False, default={})
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    contact = relationship("Contact", back_populates="payloads")
+
 
 class InboundRouting(Base):
     """
@@ -89,13 +148,20 @@ class InboundRouting(Base):
 
 
 class ContactLeg(Base):
+    """
+    Partitioned by month on created_at, like StepState
+    """
     __tablename__ = "contact_leg"
+    __table_args__ = (
+        # Backs the telco transfer lookup, which only matches the latest leg of an ANI
+        Index('ix_contact_leg_ani_created_at', 'ani', 'created_at'),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     contact_id = Column(UUID(as_uuid=True), ForeignKey("contact.id", ondelete="CASCADE"), index=True, nullable=False)
     inbound_routing_id = Column(UUID(as_uuid=True), ForeignKey("inbound_routing.id", ondelete="CASCADE"), index=True,
                                 nullable=True)
-    workflow_run_id = Column(UUID(as_uuid=True), ForeignKey("workflow_run.id"), index=True, nullable=True)
+    workflow_run_id = Column(UUID(as_uuid=True), index=True, nullable=True)
     end_time = Column(DateTime, nullable=True)
     contact_system = Column(String, nullable=False)
     contact_system_id = Column(String, nullable=False, index=True)
@@ -106,13 +172,14 @@ class ContactLeg(Base):
     disposition_type = Column(String, nullable=True)
     disposition_kwargs = Column(JSONB, nullable=True, default={})
     transfer_routing_id = Column(UUID(as_uuid=True), ForeignKey("transfer_routing.id"), index=True, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     contact = relationship("Contact", back_populates="contact_legs")
     inbound_routing = relationship("InboundRouting", back_populates="contact_legs")
     transfer_routing = relationship("TransferRouting", back_populates="contact_legs")
-    workflow_run = relationship("WorkflowRun", uselist=False, back_populates="contact_leg")
+    workflow_run = relationship("WorkflowRun", uselist=False, back_populates="contact_leg",
+                                primaryjoin="WorkflowRun.id == foreign(ContactLeg.workflow_run_id)")
     initial_queue = relationship("Queue", back_populates="contact_legs")
 
     def __repr__(self):  # pragma: no cover
@@ -6,7 +6,7 @@ from sqlalchemy import event, Boolean
 from sqlalchemy.dialects.postgresql.base import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm.session import object_session
-from sqlalchemy.sql.schema import Column, ForeignKey
+from sqlalchemy.sql.schema import Column
 from sqlalchemy.sql.sqltypes import DateTime, String
 from sqlalchemy_utils.types.encrypted.encrypted_type import StringEncryptedType, AesEngine
 
@@ -21,23 +21,29 @@ if TYPE_CHECKING:
 
 
 class StepState(EncryptionFingerprintedMixin, Base):
+    """
+    Partitioned by month on created_at (see ivr_gateway.partitions), which makes created_at part of the primary key.
+    Postgres 11 has no foreign keys to partitioned tables, so the joins to other audit tables are declared on the
+    relationships instead.
+    """
     __tablename__ = "step_state"
     input: Dict
     result: Dict
 
     # ID as GUID
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
-    step_run_id = Column(UUID(as_uuid=True), ForeignKey("step_run.id", ondelete='CASCADE'), index=True, nullable=False)
+    step_run_id = Column(UUID(as_uuid=True), index=True, nullable=False)
     input = Column(StringEncryptedType(EncryptableJSONB, encryption_key, AesEngine, 'pkcs5'),
                    nullable=True, default={})
     result = Column(StringEncryptedType(EncryptableJSONB, encryption_key, AesEngine, 'pkcs5'),
                     nullable=True, default={})
     error = Column(Boolean, default=False, nullable=False)
     retryable = Column(Boolean, default=None)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    step_run = relationship("StepRun", back_populates="step_states")
+    step_run = relationship("StepRun", back_populates="step_states",
+                            primaryjoin="StepRun.id == foreign(StepState.step_run_id)")
 
     # workflow_step_run = relationship("WorkflowStepRun", uselist=False, backref="step_state")
 
@@ -47,20 +53,21 @@ class StepState(EncryptionFingerprintedMixin, Base):
 
 @event.listens_for(StepState, 'before_update')
 def receive_before_update(mapper, connection, target):
-    ivr_logger.info(f"on_before_update_step_state target: {target} - Checking for modification")
+    ivr_logger.info("on_before_update_step_state target: %s - Checking for modification", target)
     object_changes = get_model_changes(target)
     has_been_modified = bool(object_changes)
-    ivr_logger.info(f"on_before_update_step_state, "
-                    f"target: {target} - "
-                    f"Modified: {has_been_modified} - "
-                    f"keys updated: {list(object_changes.keys())}")
+    ivr_logger.info("on_before_update_step_state, target: %s - Modified: %s - keys updated: %s",
+                    target, has_been_modified, list(object_changes))
     if has_been_modified:
         error = NonUpdateableModelError(target)
-        ivr_logger.critical(f"receive_before_update {error}")
+        ivr_logger.critical("receive_before_update %s", error)
         raise error
 
 
 class StepRun(EncryptionFingerprintedMixin, Base):
+    """
+    Partitioned by month on created_at, like StepState
+    """
     __tablename__ = "step_run"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
@@ -69,14 +76,16 @@ class StepRun(EncryptionFingerprintedMixin, Base):
     step_type = Column(String, nullable=False)
     initialization = Column(StringEncryptedType(EncryptableJSONB, encryption_key, AesEngine, 'pkcs5'),
                             nullable=True, default={})
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    step_states = relationship("StepState", back_populates="step_run", passive_deletes=True)
+    step_states = relationship("StepState", back_populates="step_run", passive_deletes=True,
+                               primaryjoin="StepRun.id == foreign(StepState.step_run_id)")
     workflow_step_runs = relationship(
         "WorkflowStepRun",
         uselist=True,
         back_populates="step_run",
+        primaryjoin="StepRun.id == foreign(WorkflowStepRun.step_run_id)",
     )
 
     def __repr__(self):  # pragma: no cover
@@ -12,6 +12,9 @@ __all__ = ["VendorResponse"]
 
 
 class VendorResponse(EncryptionFingerprintedMixin, Base):
+    """
+    Partitioned by month on created_at, like StepState
+    """
     __tablename__ = "vendor_response"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
@@ -22,4 +25,4 @@ class VendorResponse(EncryptionFingerprintedMixin, Base):
     headers = Column(StringEncryptedType(EncryptableJSONB, encryption_key, AesEngine, 'pkcs5'),
                      nullable=False, default={})
     error = Column(StringEncryptedType(String, encryption_key, AesEngine, 'pkcs5'), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, String, Integer, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy_utils.types.encrypted.encrypted_type import StringEncryptedType, AesEngine
+
+from ivr_gateway.models import Base
+from ivr_gateway.models.encryption import encryption_key, EncryptionFingerprintedMixin
+
+__all__ = ["WebhookResponse"]
+
+
+class WebhookResponse(EncryptionFingerprintedMixin, Base):
+    """
+    The response generated for a webhook, replayed when the vendor retries the same request
+    """
+    __tablename__ = "webhook_response"
+    __table_args__ = (
+        UniqueConstraint('call_sid', 'endpoint', 'payload_hash', name='webhook_response_request_unique_constraint'),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    call_sid = Column(String, nullable=False)
+    endpoint = Column(String, nullable=False)
+    payload_hash = Column(String(64), nullable=False)
+    # Null until the request that claimed the row has produced its response, in the same transaction
+    response = Column(StringEncryptedType(String, encryption_key, AesEngine, 'pkcs5'), nullable=True)
+    status_code = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -1,12 +1,13 @@
 import hashlib
 import uuid
 from datetime import datetime
-from typing import Optional, List, TYPE_CHECKING, Dict
+from typing import Optional, List, TYPE_CHECKING, Dict, NamedTuple
 
-from sqlalchemy import Integer, types, event, UniqueConstraint, or_, Enum
+from sqlalchemy import Integer, types, event, UniqueConstraint, or_, Enum, select
 from sqlalchemy.dialects.postgresql.base import UUID
 from sqlalchemy.dialects.postgresql.json import JSONB
 from sqlalchemy.orm import relationship, object_session, Query
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql.schema import Column, ForeignKey
 from sqlalchemy.sql.sqltypes import String, DateTime
 from sqlalchemy.sql.type_api import TypeEngine
@@ -14,11 +15,13 @@ from sqlalchemy_fsm import FSMField, transition
 from sqlalchemy_utils.types.encrypted.encrypted_type import StringEncryptedType, AesEngine
 
 from ivr_gateway.exceptions import NonUpdateableModelError
+from ivr_gateway.invalidation import ConfigCache
 from ivr_gateway.logger import ivr_logger
 from ivr_gateway.models import Base
 from ivr_gateway.models.encryption import EncryptableJSONB, encryption_key, EncryptionFingerprintedMixin
 from ivr_gateway.models.enums import WorkflowState
-from ivr_gateway.models.exceptions import UninitializedWorkflowActionException
+from ivr_gateway.models.exceptions import MissingWorkflowStepConfigurationException, \
+    UninitializedWorkflowActionException
 from ivr_gateway.models.steps import StepState, StepRun
 from ivr_gateway.serde.steps.config import StepTreeSchema
 from ivr_gateway.steps.base import DEFAULT_RETRY_COUNT
@@ -66,6 +69,8 @@ class WorkflowConfig(Base):
     step_tree_sha = Column(String, nullable=True)
     tag = Column(String, nullable=True, index=True)
     minimum_version = Column(String, nullable=True)
+    # Set once, when the first WorkflowRun for the config is inserted, configs that have been run are immutable
+    first_run_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -87,6 +92,10 @@ class WorkflowConfig(Base):
     def update_step_tree_sha(self):
         self.step_tree_sha = self._generate_step_tree_hash()
 
+    @property
+    def has_runs(self) -> bool:
+        return self.first_run_at is not None
+
     @property
     def run_count(self) -> Integer:
         session = object_session(self)
@@ -97,26 +106,41 @@ class WorkflowConfig(Base):
 
 @event.listens_for(WorkflowConfig, 'before_insert')
 def calculate_workflow_hash_on_save(mapper, connection, target: WorkflowConfig):
-    ivr_logger.info(f"target: {target}")
+    ivr_logger.info("target: %s", target)
     target.update_step_tree_sha()
 
 
 @event.listens_for(WorkflowConfig, 'before_update')
 def receive_before_update(mapper, connection, target: WorkflowConfig):
     ivr_logger.info("WorkflowConfig.receive_before_update")
-    ivr_logger.info(f"{target} modified")
+    ivr_logger.info("%s modified", target)
     # Do not modify live configs
 
     object_changes = get_model_changes(target)
-    ivr_logger.debug(f"object_changed, {object_changes}")
+    ivr_logger.debug("object_changed, %s", object_changes)
     has_been_modified = bool(object_changes)
     if has_been_modified:
-        if target.run_count > 0:
+        if target.has_runs or _first_run_at(connection, target.id) is not None:
             raise NonUpdateableModelError(target)
         else:
             target.update_step_tree_sha()
 
 
+def _first_run_at(connection, workflow_config_id: uuid.UUID) -> Optional[datetime]:
+    # The loaded config can be stale when the first run was created by another session
+    table = WorkflowConfig.__table__
+    return connection.execute(select([table.c.first_run_at]).where(table.c.id == workflow_config_id)).scalar()
+
+
+class ResolvedConfig(NamedTuple):
+    workflow_config_id: uuid.UUID
+    step_tree_sha: Optional[str]
+
+
+# Every new call and transfer resolves the active config of its workflow, keyed by (workflow id, active config tag)
+resolved_config_cache = ConfigCache("workflow_resolved_config", ["workflow", "workflow_config"])
+
+
 class Workflow(Base):
     step_tree: StepTree
 
@@ -139,52 +163,87 @@ class Workflow(Base):
 
     @property
     def latest_config(self) -> WorkflowConfig:
+        return self._resolve_config("latest", self._load_latest_config)
+
+    @property
+    def active_config(self) -> WorkflowConfig:
+        if self.active_config_tag in (None, "", "latest"):
+            return self.latest_config
+        return self._resolve_config(self.active_config_tag, self._load_active_config)
+
+    def _load_latest_config(self) -> Optional[WorkflowConfig]:
         session = object_session(self)
         return (session.query(WorkflowConfig)
                 .filter(WorkflowConfig.workflow_id == self.id)
                 .order_by(WorkflowConfig.created_at.desc())
                 .first())
 
-    @property
-    def active_config(self) -> WorkflowConfig:
-        if self.active_config_tag in (None, "", "latest"):
-            return self.latest_config
-        else:
-            session = object_session(self)
-            return (session.query(WorkflowConfig)
-                    .filter(WorkflowConfig.workflow_id == self.id)
-                    .filter(or_(WorkflowConfig.tag == self.active_config_tag,
-                                WorkflowConfig.step_tree_sha == self.active_config_tag))
-                    .one())
+    def _load_active_config(self) -> WorkflowConfig:
+        session = object_session(self)
+        return (session.query(WorkflowConfig)
+                .filter(WorkflowConfig.workflow_id == self.id)
+                .filter(or_(WorkflowConfig.tag == self.active_config_tag,
+                            WorkflowConfig.step_tree_sha == self.active_config_tag))
+                .one())
+
+    def _resolve_config(self, config_tag: str, load_config) -> Optional[WorkflowConfig]:
+        loaded = []
+
+        def resolve_config() -> Optional[ResolvedConfig]:
+            workflow_config = load_config()
+            loaded.append(workflow_config)
+            if workflow_config is None:
+                return None
+            return ResolvedConfig(workflow_config.id, workflow_config.step_tree_sha)
+
+        resolved = resolved_config_cache.get_or_load((self.id, config_tag), resolve_config)
+        if loaded:
+            return loaded[0]
+        if resolved is None:
+            return None
+        # Served from the session's identity map when the config is already loaded
+        workflow_config = object_session(self).query(WorkflowConfig).get(resolved.workflow_config_id)
+        if workflow_config is None:
+            # Resolved from a transaction that was rolled back
+            resolved_config_cache.clear()
+            return load_config()
+        return workflow_config
 
 
 class WorkflowStepRun(Base):
+    """
+    Partitioned by month on created_at, like StepState
+    """
     __tablename__ = "workflow_step_run"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
-    workflow_run_id = Column(UUID(as_uuid=True), ForeignKey("workflow_run.id"), index=True, nullable=False)
-    step_run_id = Column(UUID(as_uuid=True), ForeignKey("step_run.id"), index=True, nullable=False)
-    step_state_id = Column(UUID(as_uuid=True), ForeignKey("step_state.id"), index=True, nullable=True)
+    workflow_run_id = Column(UUID(as_uuid=True), index=True, nullable=False)
+    step_run_id = Column(UUID(as_uuid=True), index=True, nullable=False)
+    step_state_id = Column(UUID(as_uuid=True), index=True, nullable=True)
     run_order = Column(Integer, nullable=False)
     branched_on_error = Column(String, nullable=True)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow, nullable=False)
 
     workflow_run = relationship(
         "WorkflowRun",
         uselist=False,
         back_populates="workflow_step_runs",
-        lazy="joined"
+        lazy="joined",
+        primaryjoin="WorkflowRun.id == foreign(WorkflowStepRun.workflow_run_id)"
     )
     step_run = relationship(
         "StepRun",
         uselist=False,
         back_populates="workflow_step_runs",
-        lazy="joined"
+        lazy="joined",
+        primaryjoin="StepRun.id == foreign(WorkflowStepRun.step_run_id)"
     )
     step_state = relationship(
         "StepState",
         uselist=False,
         backref="workflow_step_run",
-        lazy="joined"
+        lazy="joined",
+        primaryjoin="StepState.id == foreign(WorkflowStepRun.step_state_id)"
     )
 
     def __repr__(self):  # pragma: no cover
@@ -192,6 +251,9 @@ class WorkflowStepRun(Base):
 
 
 class WorkflowRun(EncryptionFingerprintedMixin, Base):
+    """
+    Partitioned by month on created_at, like StepState
+    """
     __tablename__ = "workflow_run"
     __default_step_branch__ = "root"
 
@@ -206,10 +268,11 @@ class WorkflowRun(EncryptionFingerprintedMixin, Base):
                      nullable=True, default={})
     current_step_branch_name = Column(String, nullable=False, index=True, default=__default_step_branch__)
     # Maybe store slug
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     # Relationships
-    contact_leg = relationship("ContactLeg", uselist=False, back_populates="workflow_run")
+    contact_leg = relationship("ContactLeg", uselist=False, back_populates="workflow_run",
+                               primaryjoin="WorkflowRun.id == foreign(ContactLeg.workflow_run_id)")
     workflow = relationship("Workflow", back_populates="workflow_runs")
     workflow_config = relationship("WorkflowConfig", back_populates="workflow_runs")
     exit_path_type = Column(String, nullable=True)
@@ -219,7 +282,8 @@ class WorkflowRun(EncryptionFingerprintedMixin, Base):
         "WorkflowStepRun",
         uselist=True,
         back_populates="workflow_run",
-        passive_deletes=True
+        passive_deletes=True,
+        primaryjoin="WorkflowRun.id == foreign(WorkflowStepRun.workflow_run_id)"
     )
     current_queue = relationship("Queue", uselist=False, back_populates="workflow_runs")
 
@@ -238,8 +302,8 @@ class WorkflowRun(EncryptionFingerprintedMixin, Base):
     @property
     def step_runs_unordered(self) -> Query:
         return (object_session(self).query(StepRun)
-                .join(WorkflowStepRun)
-                .join(WorkflowRun)
+                .join(StepRun.workflow_step_runs)
+                .join(WorkflowStepRun.workflow_run)
                 .filter(WorkflowRun.id == self.id))
 
     @property
@@ -260,8 +324,8 @@ class WorkflowRun(EncryptionFingerprintedMixin, Base):
         :param step: Step to append to the tracking state of the workflow_run
         :return:
         """
-        ivr_logger.info(f"initialize_first_step: {step.name}")
-        ivr_logger.info(f"WorkflowRun: {self.id} - Initializing first step_run: {step.name}")
+        ivr_logger.info("initialize_first_step: %s", step.name)
+        ivr_logger.info("WorkflowRun: %s - Initializing first step_run: %s", self.id, step.name)
         ivr_logger.debug(str(step))
         self.append_step_run_to_workflow(step, initialize=True)
 
@@ -271,7 +335,7 @@ class WorkflowRun(EncryptionFingerprintedMixin, Base):
         Kicks off workflow_run
         :return:
         """
-        ivr_logger.info(f"start Beginning Step {self.get_current_step_run().name}")
+        ivr_logger.info("start Beginning Step %s", self.get_current_step_run().name)
 
     @transition(source=[
         WorkflowState.initialized,
@@ -284,7 +348,7 @@ class WorkflowRun(EncryptionFingerprintedMixin, Base):
         :param step: Step to append to the tracking state of the workflow_run
         :return:
         """
-        ivr_logger.info(f"advance_step: WorkflowRun: {self.id} - Advancing to step: {step.name}")
+        ivr_logger.info("advance_step: WorkflowRun: %s - Advancing to step: %s", self.id, step.name)
         self.append_step_run_to_workflow(step)
 
     @transition(source=[
@@ -296,14 +360,14 @@ class WorkflowRun(EncryptionFingerprintedMixin, Base):
         :param step: Step that is replayed
         :return:
         """
-        ivr_logger.info(f"replay_step: WorkflowRun: {self.id} - Replaying step: {step.name}")
+        ivr_logger.info("replay_step: WorkflowRun: %s - Replaying step: %s", self.id, step.name)
         ivr_logger.debug(str(step))
         self.append_step_run_to_workflow(step, retry_step_run=step.step_run)
 
     @transition(source=[WorkflowState.step_in_progress, WorkflowState.processing_input],
                 target=WorkflowState.requesting_user_input)
     def request_user_input(self, step: "Step"):
-        ivr_logger.info(f"request_user_input, WorkflowRun: {self.id} - Requesting user input.")
+        ivr_logger.info("request_user_input, WorkflowRun: %s - Requesting user input.", self.id)
         ivr_logger.info(str(step))
         # When the first step of a workflow_run is a RequestInputStep, we run it once, to get the input prompt but
         # do not advance the step list as we need to run it 2x to apply the user input
@@ -330,7 +394,7 @@ class WorkflowRun(EncryptionFingerprintedMixin, Base):
         ivr_logger.info(
             f"finish, WorkflowRun Complete: {self.id}"
         )
-        ivr_logger.debug(f"finish, {self}")
+        ivr_logger.debug("finish, %s", self)
 
     @transition(source=[
         WorkflowState.step_in_progress,
@@ -338,17 +402,17 @@ class WorkflowRun(EncryptionFingerprintedMixin, Base):
     ], target=WorkflowState.error)
     def register_error(self, e: StepError):
         appositive_adjective_phase = "a recoverable" if e.retryable else "an"
-        ivr_logger.info(f"register_error, WorkflowRun: {self.id}, experienced {appositive_adjective_phase} error")
-        ivr_logger.info(f"StepError: {e.msg}")
+        ivr_logger.info("register_error, WorkflowRun: %s, experienced %s error", self.id, appositive_adjective_phase)
+        ivr_logger.info("StepError: %s", e.msg)
 
         if not e.retryable:
-            ivr_logger.critical(f"StepError: {e.msg}")
+            ivr_logger.critical("StepError: %s", e.msg)
 
     @transition(source=[
         WorkflowState.error,
     ], target=WorkflowState.requesting_user_input)
     def retry_input_step(self, step: "Step" = None, retry_step_run: StepRun = None):
-        ivr_logger.info(f"WorkflowRun: {self.id}, attempting to recover from error")
+        ivr_logger.info("WorkflowRun: %s, attempting to recover from error", self.id)
         ivr_logger.debug(str(step))
         if retry_step_run is not None:
             ivr_logger.debug(str(retry_step_run))
@@ -358,20 +422,20 @@ class WorkflowRun(EncryptionFingerprintedMixin, Base):
         WorkflowState.error
     ], target=WorkflowState.step_in_progress)
     def retry_step(self, step: "Step" = None, retry_step_run: StepRun = None):
-        ivr_logger.info(f"retry_step, WorkflowRun: {self.id}, attempting to recover from error")
+        ivr_logger.info("retry_step, WorkflowRun: %s, attempting to recover from error", self.id)
         if retry_step_run is not None:
-            ivr_logger.info(f"retry_step, Retrying step run: {retry_step_run}, Step: {step.name}")
-            ivr_logger.debug(f"retry_step {retry_step_run}")
+            ivr_logger.info("retry_step, Retrying step run: %s, Step: %s", retry_step_run, step.name)
+            ivr_logger.debug("retry_step %s", retry_step_run)
             self.append_step_run_to_workflow(step, retry_step_run=retry_step_run)
 
     @transition(source=[
         WorkflowState.error
     ], target=WorkflowState.step_in_progress)
     def unregister_error(self, msg: str = None):
-        ivr_logger.info(f"Changing WorkflowState from error to step_in_progress; {msg}")
+        ivr_logger.info("Changing WorkflowState from error to step_in_progress; %s", msg)
 
     def switch_step_branch(self, branch_name: str):
-        ivr_logger.info(f"Switching workflow to branch: {branch_name}")
+        ivr_logger.info("Switching workflow to branch: %s", branch_name)
         self.current_step_branch_name = branch_name
 
     def get_workflow_step_runs_for_branch_step(self, branch_name: str, step_name: str) -> [WorkflowStepRun]:
@@ -385,15 +449,13 @@ class WorkflowRun(EncryptionFingerprintedMixin, Base):
         return matching_runs[0].step_run
 
     def get_step_retry_count(self, branch_name: str, step_name: str) -> int:
-        for branch in self.workflow_config.branches:
-            if branch.name == branch_name:
-                for step in branch.steps:
-                    if step.name == step_name:
-                        if 'retry_count' in step.step_kwargs:
-                            return step.step_kwargs['retry_count']
-                        else:
-                            return DEFAULT_RETRY_COUNT
-        return DEFAULT_RETRY_COUNT
+        # The service module imports this one
+        from ivr_gateway.services.workflows.utils import get_step_transition_from_workflow
+        try:
+            step, _ = get_step_transition_from_workflow(self, step_name, branch_name=branch_name)
+        except MissingWorkflowStepConfigurationException:
+            return DEFAULT_RETRY_COUNT
+        return step.step_kwargs.get('retry_count', DEFAULT_RETRY_COUNT)
 
     def get_workflow_step_runs_for_branch(self, branch_name: str) -> [WorkflowStepRun]:
         return [wsr for wsr in self.workflow_step_runs if wsr.step_run.branch == branch_name]
@@ -416,9 +478,12 @@ class WorkflowRun(EncryptionFingerprintedMixin, Base):
         return maybe_step_run.step_state
 
     def is_valid_step_branch(self, branch_name: str) -> bool:
-        step_tree = self.workflow_config.step_tree
-        valid_branch = next((x for x in step_tree.branches if x.name == branch_name), None)
-        return valid_branch is not None
+        from ivr_gateway.services.workflows.utils import get_step_branch_from_workflow
+        try:
+            get_step_branch_from_workflow(self, branch_name)
+        except MissingWorkflowStepConfigurationException:
+            return False
+        return True
 
     def get_current_step_name(self) -> str:
         return self.get_current_step_run().name
@@ -469,6 +534,21 @@ class WorkflowRun(EncryptionFingerprintedMixin, Base):
         self.session = session
         db_session.add(self)
 
+
+@event.listens_for(WorkflowRun, 'after_insert')
+def mark_workflow_config_run(mapper, connection, target: WorkflowRun):
+    workflow_config = target.workflow_config
+    if workflow_config is not None and workflow_config.has_runs:
+        return
+    table = WorkflowConfig.__table__
+    connection.execute(table.update()
+                       .where(table.c.id == target.workflow_config_id)
+                       .where(table.c.first_run_at.is_(None))
+                       .values(first_run_at=target.created_at))
+    if workflow_config is not None:
+        # Not a change to flush, the row was updated above (or already had runs)
+        set_committed_value(workflow_config, "first_run_at", target.created_at)
+
 # def on_state_change(instance, source, target):
 #     print("State changed")
 #
@@ -0,0 +1,164 @@
+import re
+from datetime import date, datetime
+from typing import List, Tuple, Union
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Append-only audit tables that are range partitioned by month on created_at
+AUDIT_PARTITIONED_TABLES = (
+    "step_run",
+    "step_state",
+    "workflow_step_run",
+    "workflow_run",
+    "contact_leg",
+    "vendor_response",
+)
+PARTITION_KEY = "created_at"
+
+_partition_suffix_re = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def month_start(value: Union[date, datetime]) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + (value.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def partition_month(name: str) -> date:
+    match = _partition_suffix_re.search(name)
+    if match is None:
+        raise ValueError(f"{name} is not a monthly partition name")
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def _validate_partitioned_table(table: str):
+    # Table names end up in DDL and queries that can't bind identifiers
+    if table not in AUDIT_PARTITIONED_TABLES:
+        raise ValueError(f"{table} is not a partitioned audit table")
+
+
+def create_partition_statement(table: str, month: date) -> str:
+    """
+    Builds the DDL for the monthly partition of table that holds rows created during month. Partition bounds can't be
+    bound parameters in Postgres 11, they are rendered from the dates.
+
+    :param table: partitioned parent table
+    :param month: any date within the month to cover
+    :return:
+    """
+    _validate_partitioned_table(table)
+    start = month_start(month)
+    end = add_months(start, 1)
+    return (f"CREATE TABLE IF NOT EXISTS {partition_name(table, start)} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')")
+
+
+def attach_partition_statement(table: str, month: date) -> str:
+    """
+    Builds the DDL that attaches the standalone table holding the rows of month as a partition of table. Postgres scans
+    the table to validate it unless it already has a CHECK constraint implying the partition bounds.
+
+    :param table: partitioned parent table
+    :param month: any date within the month the partition covers
+    :return:
+    """
+    _validate_partitioned_table(table)
+    start = month_start(month)
+    end = add_months(start, 1)
+    return (f"ALTER TABLE {table} ATTACH PARTITION {partition_name(table, start)} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')")
+
+
+def partition_bounds_check_statement(table: str, month: date) -> str:
+    """
+    Builds the DDL adding a CHECK constraint that matches the bounds of the partition of table for month, so
+    attaching it skips the validation scan that would otherwise run under a lock on the parent table
+
+    :param table: partitioned parent table
+    :param month: any date within the month the partition covers
+    :return:
+    """
+    _validate_partitioned_table(table)
+    start = month_start(month)
+    end = add_months(start, 1)
+    name = partition_name(table, start)
+    return (f"ALTER TABLE {name} ADD CONSTRAINT {name}_bounds CHECK ({PARTITION_KEY} IS NOT NULL AND "
+            f"{PARTITION_KEY} >= '{start.isoformat()}' AND {PARTITION_KEY} < '{end.isoformat()}')")
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def create_default_partition_statement(table: str) -> str:
+    """
+    Builds the DDL for the partition that catches rows outside every monthly partition, so inserts keep working when
+    the monthly partitions were not created ahead of time
+
+    :param table: partitioned parent table
+    :return:
+    """
+    _validate_partitioned_table(table)
+    return f"CREATE TABLE IF NOT EXISTS {default_partition_name(table)} PARTITION OF {table} DEFAULT"
+
+
+def create_partition(connection: Connection, table: str, month: date) -> int:
+    """
+    Creates the monthly partition of table for month. Rows of that month that were already filed under the default
+    partition are moved into the new partition, Postgres refuses to create it while the default partition holds any.
+
+    :param connection:
+    :param table: partitioned parent table
+    :param month: any date within the month to cover
+    :return: number of rows moved out of the default partition
+    """
+    _validate_partitioned_table(table)
+    start = month_start(month)
+    end = add_months(start, 1)
+    name = partition_name(table, start)
+    if connection.execute(text("SELECT to_regclass(:name)"), name=name).scalar() is not None:
+        return 0
+    default = default_partition_name(table)
+    if connection.execute(text("SELECT to_regclass(:name)"), name=default).scalar() is None:
+        connection.execute(create_partition_statement(table, start))
+        return 0
+    quote = connection.dialect.identifier_preparer.quote
+    bounds = {"start": start, "end": end}
+    in_month = f"{quote(PARTITION_KEY)} >= :start AND {quote(PARTITION_KEY)} < :end"
+    # The identifiers all derive from a validated table name and are quoted, the bounds are bound
+    has_rows_in_month = f"SELECT EXISTS (SELECT 1 FROM {quote(default)} WHERE {in_month})"  # nosec
+    if not connection.execute(text(has_rows_in_month), **bounds).scalar():
+        connection.execute(create_partition_statement(table, start))
+        return 0
+    connection.execute(f"CREATE TABLE {quote(name)} (LIKE {quote(table)} INCLUDING DEFAULTS)")
+    move_rows_in_month = f"WITH moved AS (DELETE FROM {quote(default)} WHERE {in_month} RETURNING *) " \
+                         f"INSERT INTO {quote(name)} SELECT * FROM moved"  # nosec
+    moved = connection.execute(text(move_rows_in_month), **bounds).rowcount
+    connection.execute(attach_partition_statement(table, start))
+    return moved
+
+
+def list_partitions(connection: Connection, table: str) -> List[Tuple[str, date]]:
+    """
+    Lists the monthly partitions currently attached to table, oldest first
+
+    :param connection:
+    :param table:
+    :return: list of (partition name, first day of the month it holds)
+    """
+    rows = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table"
+    ), table=table).fetchall()
+    partitions = [(row[0], partition_month(row[0])) for row in rows if _partition_suffix_re.search(row[0])]
+    return sorted(partitions, key=lambda partition: partition[1])
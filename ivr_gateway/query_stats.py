@@ -0,0 +1,111 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from flask import g, has_request_context
+from sqlalchemy import event, orm
+from sqlalchemy.engine import Engine
+
+QUERY_COUNT_HEADER = "X-IVR-Query-Count"
+# WSGI environ key the request totals are handed to the gunicorn access logger under
+QUERY_STATS_ENVIRON_KEY = "ivr.query_stats"
+
+
+class QueryStats:
+    """
+    Database work done while handling a single request (or inside a collect_query_stats block)
+    """
+    __slots__ = ("statements", "commits", "rows", "db_time")
+
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+        self.rows = 0
+        self.db_time = 0.0
+
+    def as_tags(self) -> dict:
+        return {
+            "db.statements": self.statements,
+            "db.commits": self.commits,
+            "db.rows": self.rows,
+            "db.time_ms": round(self.db_time * 1000, 3),
+        }
+
+    def __repr__(self):  # pragma: no cover
+        return f"<QueryStats statements={self.statements}, commits={self.commits}, rows={self.rows}, " \
+               f"db_time={self.db_time:.4f}>"
+
+
+# Collectors opened by collect_query_stats, they see every statement regardless of request context
+_collectors: List[QueryStats] = []
+
+
+def query_count_header_enabled() -> bool:
+    return os.getenv("IVR_EXPOSE_QUERY_COUNT", "false") == "true"
+
+
+def _active_stats() -> List[QueryStats]:
+    active = list(_collectors)
+    if has_request_context():
+        if "query_stats" not in g:
+            g.query_stats = QueryStats()
+        active.append(g.query_stats)
+    return active
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    rows = cursor.rowcount if cursor.description is not None and cursor.rowcount > 0 else 0
+    for stats in _active_stats():
+        stats.statements += 1
+        stats.rows += rows
+        stats.db_time += elapsed
+
+
+def _after_commit(session):
+    for stats in _active_stats():
+        stats.commits += 1
+
+
+def install_query_counter():
+    """
+    Tracks the statements, commits, rows returned and time spent in the database for every request, across all engines
+
+    :return:
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        # Counted on the session rather than the connection so commits joined into an outer transaction still count
+        event.listen(orm.Session, "after_commit", _after_commit)
+
+
+def get_request_query_stats() -> QueryStats:
+    if "query_stats" not in g:
+        g.query_stats = QueryStats()
+    return g.query_stats
+
+
+def get_request_query_count() -> int:
+    return get_request_query_stats().statements
+
+
+@contextmanager
+def collect_query_stats() -> Iterator[QueryStats]:
+    """
+    Collects the database work done inside the block, in or out of a request
+
+    :return: the collected QueryStats
+    """
+    install_query_counter()
+    stats = QueryStats()
+    _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _collectors.remove(stats)
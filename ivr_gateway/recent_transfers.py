@@ -0,0 +1,130 @@
+"""
+In-process ring buffer of the calls this worker transferred out recently, so the telco transfer lookup that follows a
+transfer can usually be answered without a query. Another worker (or a restart) misses and falls back to the indexed
+query in CallService.get_recent_transferred_call.
+
+Every ended call leg is buffered, transferred or not, so a newer call from the same ANI that was not transferred
+replaces the older transfer. A leg is only buffered once the transaction that ended it commits, and is dropped as soon
+as it is too old to be served, the buffer holds decrypted customer ids and secured keys. Newer calls still in progress
+or handled by another worker are not seen here, so a hit is only served once CallService.get_most_recent_call_leg_id
+confirms the leg is still the ANI's latest.
+"""
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import event, orm
+
+from ivr_gateway.models.contacts import ContactLeg, TransferRouting
+
+# Matches the age limit of CallService.get_recent_transferred_call
+RECENT_TRANSFER_MAX_AGE = timedelta(minutes=1)
+RECENT_TRANSFERS_SIZE = int(os.getenv("IVR_RECENT_TRANSFERS_SIZE", "1024"))
+_PENDING_TRANSFERS_KEY = "ivr.pending_recent_transfers"
+
+
+class RecentTransfer(NamedTuple):
+    ani: str
+    # None for a leg that was not transferred, it never matches a lookup
+    destination: Optional[str]
+    end_time: datetime
+    global_id: str
+    customer_id: Optional[str]
+    secured_key: Optional[str]
+    leg_id: UUID
+
+
+class RecentTransfers:
+
+    def __init__(self, size: int = RECENT_TRANSFERS_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        # The most recently ended leg per ANI, oldest first
+        self._transfers: "OrderedDict[str, RecentTransfer]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _transfer(call_leg: ContactLeg, transfer_routing: Optional[TransferRouting]) -> Optional[RecentTransfer]:
+        call = call_leg.contact
+        if call.device_identifier is None or call_leg.end_time is None:
+            return None
+        if transfer_routing is None:
+            return RecentTransfer(ani=call.device_identifier, destination=None, end_time=call_leg.end_time,
+                                  global_id=call.global_id, customer_id=None, secured_key=None, leg_id=call_leg.id)
+        return RecentTransfer(ani=call.device_identifier, destination=transfer_routing.destination,
+                              end_time=call_leg.end_time, global_id=call.global_id, customer_id=call.customer_id,
+                              secured_key=call.secured_key, leg_id=call_leg.id)
+
+    def record(self, call_leg: ContactLeg, transfer_routing: Optional[TransferRouting]):
+        transfer = self._transfer(call_leg, transfer_routing)
+        if transfer is not None:
+            self._add(transfer)
+
+    def record_on_commit(self, session: orm.Session, call_leg: ContactLeg,
+                         transfer_routing: Optional[TransferRouting]):
+        """
+        Records the ended leg once the session's transaction commits, a rolled back transfer is never recorded
+
+        :param session:
+        :param call_leg:
+        :param transfer_routing: None when the leg was not transferred
+        :return:
+        """
+        transfer = self._transfer(call_leg, transfer_routing)
+        if transfer is not None:
+            session.info.setdefault(_PENDING_TRANSFERS_KEY, []).append(transfer)
+
+    def _add(self, transfer: RecentTransfer):
+        with self._lock:
+            self._transfers.pop(transfer.ani, None)
+            self._transfers[transfer.ani] = transfer
+            while len(self._transfers) > self.size:
+                self._transfers.popitem(last=False)
+            self._evict_expired()
+
+    def _evict_expired(self):
+        # Recording order is not end_time order (a leg may be recorded well after it ended), the whole buffer is scanned
+        expires_before = datetime.now() - RECENT_TRANSFER_MAX_AGE
+        expired = [ani for ani, transfer in self._transfers.items() if transfer.end_time < expires_before]
+        for ani in expired:
+            del self._transfers[ani]
+
+    def find(self, ani: str, dnis: str) -> Optional[RecentTransfer]:
+        with self._lock:
+            self._evict_expired()
+            transfer = self._transfers.get(ani)
+        if transfer is None or transfer.destination != dnis \
+                or transfer.end_time < datetime.now() - RECENT_TRANSFER_MAX_AGE:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return transfer
+
+    def clear(self):
+        with self._lock:
+            self._transfers.clear()
+
+    def __len__(self):
+        return len(self._transfers)
+
+
+recent_transfers = RecentTransfers()
+
+
+def _after_commit(session: orm.Session):
+    for transfer in session.info.pop(_PENDING_TRANSFERS_KEY, ()):
+        recent_transfers._add(transfer)
+
+
+def _after_rollback(session: orm.Session):
+    session.info.pop(_PENDING_TRANSFERS_KEY, None)
+
+
+def install_recent_transfers_recorder():
+    if not event.contains(orm.Session, "after_commit", _after_commit):
+        event.listen(orm.Session, "after_commit", _after_commit)
+        event.listen(orm.Session, "after_rollback", _after_rollback)
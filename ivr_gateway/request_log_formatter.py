@@ -2,10 +2,17 @@ import logging
 from flask import request, has_request_context
 
 class RequestFormatter(logging.Formatter):
-    def format(self, record):
+
+    @staticmethod
+    def add_request_id(record):
         record.request_id = 'NA'
 
         if has_request_context():
             record.request_id = request.environ.get("HTTP_X_REQUEST_ID")
 
+    def format(self, record):
+        # Records coming off the log queue already carry the id of the request that produced them
+        if has_request_context() or not hasattr(record, "request_id"):
+            self.add_request_id(record)
+
         return super().format(record)
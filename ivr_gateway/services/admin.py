@@ -1,11 +1,12 @@
 import os
 import secrets
-from typing import Optional, Iterable
+from typing import Dict, Optional, Iterable
 from uuid import UUID
 
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.session import Session as SQLAlchemySession
 
+from ivr_gateway.invalidation import ConfigCache
 from ivr_gateway.models.admin import AdminCall, AdminUser, AdminCallFrom, AdminCallTo, AdminPhoneNumber, ScheduledCall, \
     ApiCredential
 from ivr_gateway.models.contacts import InboundRouting
@@ -14,6 +15,11 @@ from ivr_gateway.models.enums import AdminRole
 from ivr_gateway.models.workflows import Workflow
 from ivr_gateway.utils import modify_object_with_dict
 
+# Every new call checks whether the caller is an admin, almost none are so the admin numbers are cached. They are
+# cached as a single entry, keyed by caller they would grow with every distinct caller until the next config change.
+admin_phone_number_ids_cache = ConfigCache("admin_phone_number_ids", ["admin_phone_number"])
+ADMIN_PHONE_NUMBER_IDS_KEY = "all"
+
 
 class AdminService:
     encryption_key_var = os.environ["ACTIVE_ENCRYPTION_KEY"]
@@ -57,11 +63,19 @@ class AdminService:
                 .first())
 
     def find_admin_phone_number(self, phone_number: str) -> Optional[AdminPhoneNumber]:
+        admin_phone_number_ids = admin_phone_number_ids_cache.get_or_load(ADMIN_PHONE_NUMBER_IDS_KEY,
+                                                                          self._load_admin_phone_number_ids)
+        admin_phone_number_id = admin_phone_number_ids.get(phone_number)
+        if admin_phone_number_id is None:
+            return None
         return (self.session.query(AdminPhoneNumber)
                 .options(joinedload(AdminPhoneNumber.user))
-                .filter(AdminPhoneNumber.phone_number == phone_number)
+                .filter(AdminPhoneNumber.id == admin_phone_number_id)
                 .first())
 
+    def _load_admin_phone_number_ids(self) -> Dict[str, UUID]:
+        return dict(self.session.query(AdminPhoneNumber.phone_number, AdminPhoneNumber.id).all())
+
     def find_admin_user_by_phone_number(self, phone_number: str) -> Optional[AdminUser]:
         return (self.session.query(AdminUser)
                 .join(AdminUser.phone_numbers)
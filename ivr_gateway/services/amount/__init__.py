@@ -8,12 +8,14 @@ import requests
 from requests.exceptions import HTTPError, Timeout, ConnectionError
 from json import JSONDecodeError
 
+from ivr_gateway.circuit_breaker import BulkheadFullError, CircuitOpenError, circuit_breaker_for
 from ivr_gateway.logger import ivr_logger
 from ivr_gateway.models.contacts import Contact
 from ivr_gateway.models.enums import Partner
 from ivr_gateway.utils import get_partner_namespaced_environment_variable
 from ivr_gateway.models.vendors import VendorResponse
 from ivr_gateway.api.exceptions import AmountCardActivationException
+from ivr_gateway.deadline import request_timeout
 
 
 class AmountService:
@@ -52,22 +54,29 @@ class AmountService:
             exception_result: Optional[Any] = None,
             contact: Optional[Contact] = None,
     ) -> Tuple[bool, Any]:
+        # Breakers are per endpoint, the tag name identifies the endpoint without the ids in its url
+        breaker = circuit_breaker_for(tag_name.replace(".status_code", ""))
         try:
-            response = request()
-            span = tracer.current_span()
-            span.set_tag(tag_name, response.status_code)
-            ivr_logger.warning(f"Amount Service: {tag_name}, status_code: {response.status_code}")
-            response.raise_for_status()
+            with breaker.call():
+                response = request()
+                span = tracer.current_span()
+                span.set_tag(tag_name, response.status_code)
+                ivr_logger.warning("Amount Service: %s, status_code: %s", tag_name, response.status_code)
+                response.raise_for_status()
         except (HTTPError, Timeout, ConnectionError) as e:
-            ivr_logger.error(f"{e.__class__.__name__} for {amount_endpoint}")
+            ivr_logger.error("%s for %s", e.__class__.__name__, amount_endpoint)
+            if isinstance(e, (CircuitOpenError, BulkheadFullError)):
+                span = tracer.current_span()
+                if span is not None:
+                    span.set_tag(f"{breaker.name}.circuit_breaker", breaker.state)
             if contact is not None:
-                contact.session["customer_summary"] = {}
+                contact.set_payload("customer_summary", {})
                 self.db_session.add(contact)
                 self.db_session.commit()
             if exception_result is None:
                 raise AvantBasicError()
             return True, exception_result
-        ivr_logger.info(f"successful response for {amount_endpoint}")
+        ivr_logger.info("successful response for %s", amount_endpoint)
         return False, response
 
     def _get_authentication_token(self) -> str:
@@ -76,7 +85,7 @@ class AmountService:
             def request():
                 return requests.post(self.auth_endpoint,
                                      headers={"Authorization": f"Basic {self.secret}"},
-                                     timeout=self.timeout)
+                                     timeout=request_timeout(self.timeout))
             exception_occurred, response = self._attempt_request(
                 request=request,
                 amount_endpoint=self.auth_endpoint,
@@ -8,6 +8,7 @@ from ivr_gateway.models.contacts import Contact
 from ivr_gateway.services.amount import AmountService
 from ivr_gateway.api.exceptions import AmountCardActivationException
 from ivr_gateway.utils import get_partner_namespaced_environment_variable
+from ivr_gateway.deadline import request_timeout
 
 
 class CardActivationService(AmountService):
@@ -34,7 +35,7 @@ class CardActivationService(AmountService):
         with tracer.trace('amount_service.api.account_management.webhook.activation_card'):
             def request():
                 return requests.post(self.activation_endpoint, headers={"Authorization": f"Bearer {access_token}"},
-                                     json=post_body, timeout=self.timeout)
+                                     json=post_body, timeout=request_timeout(self.timeout))
             exception_occurred, response = self._attempt_request(
                 request=request,
                 amount_endpoint=self.activation_endpoint,
@@ -5,6 +5,7 @@ from json import JSONDecodeError
 
 from ivr_gateway.models.contacts import Contact
 from ivr_gateway.services.amount import AmountService
+from ivr_gateway.deadline import request_timeout
 
 
 class CustomerSummaryService(AmountService):
@@ -15,7 +16,7 @@ class CustomerSummaryService(AmountService):
     def get_customer_summary(self, contact: Contact) -> int:
         customer_id = contact.customer_id
         if customer_id is None:
-            contact.session["customer_summary"] = {}
+            contact.set_payload("customer_summary", {})
             self.db_session.add(contact)
             self.db_session.commit()
             return 0
@@ -23,7 +24,8 @@ class CustomerSummaryService(AmountService):
 
         with tracer.trace('amount_service.api.v1.customer_summary'):
             def request():
-                return requests.get(self.endpoint, headers=self.headers, params=parameters, timeout=self.timeout)
+                return requests.get(self.endpoint, headers=self.headers, params=parameters,
+                                    timeout=request_timeout(self.timeout))
             exception_occurred, response = self._attempt_request(
                 request=request,
                 amount_endpoint=self.endpoint,
@@ -32,29 +34,24 @@ class CustomerSummaryService(AmountService):
                 contact=contact)
             if exception_occurred:
                 return response
-        session = contact.session.copy()
 
         try:
-            session.update({"customer_summary": response.json()})
+            customer_summary = response.json()
         except JSONDecodeError:
-            contact.session["customer_summary"] = {}
-            self.db_session.add(contact)
-            self.db_session.commit()
-            return 0
-
-        contact.session = session
+            customer_summary = {}
+        contact.set_payload("customer_summary", customer_summary)
 
         self.db_session.add(contact)
         self.db_session.commit()
-        return len(contact.session.get("customer_summary", {}).get("open_products", []))
+        return len(customer_summary.get("open_products", []))
 
     def download_info_if_not_cached(self, contact: Contact):
-        if contact.session.get("customer_summary") is None:
+        if contact.get_payload("customer_summary") is None:
             self.get_customer_summary(contact)
 
     @staticmethod
     def product_field_lookup(contact: Contact, field_name: str, product_type: str = None):
-        customer_summary = contact.session.get("customer_summary", {})
+        customer_summary = contact.get_payload("customer_summary") or {}
         open_products = customer_summary.get("open_products", None)
         if open_products is None:
             return None
@@ -69,7 +66,7 @@ class CustomerSummaryService(AmountService):
 
     @staticmethod
     def application_field_lookup(contact: Contact, field_name: str, application_type: str = None):
-        customer_summary = contact.session.get("customer_summary", {})
+        customer_summary = contact.get_payload("customer_summary") or {}
         open_applications = customer_summary.get("open_applications", None)
         if open_applications is None:
             return None
@@ -84,7 +81,7 @@ class CustomerSummaryService(AmountService):
 
     @staticmethod
     def open_product_count(contact: Contact, product_type: str = None):
-        customer_summary = contact.session.get("customer_summary", {})
+        customer_summary = contact.get_payload("customer_summary") or {}
         open_products = customer_summary.get("open_products", [])
         if product_type:
             return len([product for product in open_products if product.get("type") == product_type])
@@ -92,7 +89,7 @@ class CustomerSummaryService(AmountService):
 
     @staticmethod
     def open_application_count(contact: Contact, application_type: str = None):
-        customer_summary = contact.session.get("customer_summary", {})
+        customer_summary = contact.get_payload("customer_summary") or {}
         open_applications = customer_summary.get("open_applications", [])
         if application_type:
             return len([app for app in open_applications if app.get("type") == application_type])
@@ -9,6 +9,7 @@ from ivr_gateway.models.contacts import Contact
 from ivr_gateway.models.workflows import WorkflowRun
 from ivr_gateway.services.amount import AmountService
 from ivr_gateway.steps.utils import get_field
+from ivr_gateway.deadline import request_timeout
 
 
 class CustomerLookupService(AmountService):
@@ -23,7 +24,7 @@ class CustomerLookupService(AmountService):
             lookup_phone_number = self.get_customer_phone_number_from_contact(contact)
 
         if lookup_phone_number is None:
-            contact.session["customer_lookup"] = {}
+            contact.set_payload("customer_lookup", {})
             self.db_session.add(contact)
             self.db_session.commit()
             return 0
@@ -32,7 +33,8 @@ class CustomerLookupService(AmountService):
 
         with tracer.trace('amount_service.api.v1.phone_number_customer_lookup'):
             def request():
-                return requests.get(self.endpoint, headers=self.headers, params=parameters, timeout=self.timeout)
+                return requests.get(self.endpoint, headers=self.headers, params=parameters,
+                                    timeout=request_timeout(self.timeout))
             exception_occurred, response = self._attempt_request(
                 request=request,
                 amount_endpoint=self.endpoint,
@@ -42,27 +44,25 @@ class CustomerLookupService(AmountService):
             if exception_occurred:
                 return response
 
-        session = contact.session.copy()
-
         try:
-            session.update({"customer_lookup": response.json()})
+            customer_lookup = response.json()
         except JSONDecodeError:
-            contact.session["customer_lookup"] = {}
+            contact.set_payload("customer_lookup", {})
             self.db_session.add(contact)
             self.db_session.commit()
             return 0
 
-        contact.session = session
+        contact.set_payload("customer_lookup", customer_lookup)
 
-        customer_information = response.json().get("customer_information")
+        customer_information = customer_lookup.get("customer_information")
         if customer_information is not None:
             contact.customer_id = str(customer_information.get("id"))
         self.db_session.add(contact)
         self.db_session.commit()
-        return len(contact.session.get("customer_lookup", {}).get("open_products", []))
+        return len(customer_lookup.get("open_products", []))
 
     def download_info_if_not_cached(self, contact: Contact, service_overrides: dict, workflow_run: WorkflowRun):
-        if contact.session.get("customer_lookup") is None:
+        if contact.get_payload("customer_lookup") is None:
             self.get_customer_info(contact, service_overrides, workflow_run)
 
     @staticmethod
@@ -78,7 +78,7 @@ class CustomerLookupService(AmountService):
 
     @staticmethod
     def product_field_lookup(contact: Contact, field_name: str, product_type: str = None):
-        customer_info = contact.session.get("customer_lookup", {})
+        customer_info = contact.get_payload("customer_lookup") or {}
         open_products = customer_info.get("open_products", None)
         if open_products is None:
             return None
@@ -93,7 +93,7 @@ class CustomerLookupService(AmountService):
 
     @staticmethod
     def application_field_lookup(contact: Contact, field_name: str, application_type: str = None):
-        customer_info = contact.session.get("customer_lookup", {})
+        customer_info = contact.get_payload("customer_lookup") or {}
         open_applications = customer_info.get("open_applications", None)
         if open_applications is None:
             return None
@@ -108,7 +108,7 @@ class CustomerLookupService(AmountService):
 
     @staticmethod
     def customer_field_lookup(contact: Contact, field_name: str):
-        customer_info = contact.session.get("customer_lookup", {})
+        customer_info = contact.get_payload("customer_lookup") or {}
         customer_information = customer_info.get("customer_information", None)
         if customer_information is None:
             return None
@@ -116,7 +116,7 @@ class CustomerLookupService(AmountService):
 
     @staticmethod
     def open_product_count(contact: Contact, product_type: str = None):
-        customer_info = contact.session.get("customer_lookup", {})
+        customer_info = contact.get_payload("customer_lookup") or {}
         open_products = customer_info.get("open_products", [])
         if product_type:
             return len([product for product in open_products if product.get("type") == product_type])
@@ -124,7 +124,7 @@ class CustomerLookupService(AmountService):
 
     @staticmethod
     def open_application_count(contact: Contact, application_type: str = None):
-        customer_info = contact.session.get("customer_lookup", {})
+        customer_info = contact.get_payload("customer_lookup") or {}
         open_applications = customer_info.get("open_applications", [])
         if application_type:
             return len([app for app in open_applications if app.get("type") == application_type])
@@ -9,6 +9,7 @@ from sqlalchemy import orm
 
 from ivr_gateway.models.contacts import Contact
 from ivr_gateway.services.amount import AmountService
+from ivr_gateway.deadline import request_timeout
 
 
 class TelcoService(AmountService):
@@ -32,7 +33,7 @@ class TelcoService(AmountService):
                 "phone_number": customer_number}
         with tracer.trace('amount_service.api.telco.v1.search'):
             def request():
-                return requests.post(url, headers=self.headers, data=data, timeout=self.timeout)
+                return requests.post(url, headers=self.headers, data=data, timeout=request_timeout(self.timeout))
             exception_occurred, response = self._attempt_request(
                 request=request,
                 amount_endpoint=url,
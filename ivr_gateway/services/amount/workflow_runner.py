@@ -9,6 +9,7 @@ from json import JSONDecodeError
 from ivr_gateway.models.workflows import WorkflowRun
 from ivr_gateway.services.amount import AmountService, AvantBasicError
 from ivr_gateway.services.workflows.exceptions import MissingDependentValueException
+from ivr_gateway.deadline import request_timeout
 
 
 class WorkflowRunnerService(AmountService):
@@ -31,7 +32,7 @@ class WorkflowRunnerService(AmountService):
         with tracer.trace('amount_service.api.v1.workflows'):
             def request():
                 return requests.post(url, json=amount_state, headers=self.get_headers(workflow_run),
-                                     timeout=self.timeout)
+                                     timeout=request_timeout(self.timeout))
             exception_occurred, response = self._attempt_request(
                 request=request,
                 amount_endpoint=url,
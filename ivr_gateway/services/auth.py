@@ -32,7 +32,7 @@ class AuthService:
             return None
         try:
             decoded = jwt.decode(token, TOKEN_KEY, algorithms=['HS256'])
-            logger.debug(f"jwt subject: {decoded.get('sub')}")
+            logger.debug("jwt subject: %s", decoded.get('sub'))
             return decoded.get("sub")
         except jwt.exceptions.InvalidTokenError:
             return None
@@ -42,6 +42,6 @@ class AuthService:
         jwt_payload = {"sub": str(user.id),
                        "role": str(user.role),
                        'exp': datetime.utcnow() + timedelta(hours=168)}
-        logger.debug(f"jwt subject: {jwt_payload['sub']}")
+        logger.debug("jwt subject: %s", jwt_payload['sub'])
         encoded = jwt.encode(jwt_payload, TOKEN_KEY, algorithm='HS256')
         return encoded
@@ -4,16 +4,18 @@ from textwrap import dedent
 from typing import Optional, Dict, List
 from uuid import UUID
 
+from sqlalchemy import and_, bindparam, case, cast, exists, update
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.session import Session as SQLAlchemySession
 
 from ivr_gateway.models.admin import ScheduledCall
 from ivr_gateway.models.contacts import ContactLeg, Contact, InboundRouting, TransferRouting, Greeting
-from ivr_gateway.models.enums import OperatingMode
+from ivr_gateway.models.enums import OperatingMode, WorkflowState
 from ivr_gateway.models.queues import Queue
 from ivr_gateway.models.workflows import WorkflowRun
 from ivr_gateway.services.workflows import WorkflowService
 from ivr_gateway.logger import ivr_logger
+from ivr_gateway.recent_transfers import recent_transfers
 
 
 class CallService:
@@ -39,6 +41,7 @@ class CallService:
             workflow_config = self.workflow_service.get_config_for_sha_or_tag(workflow,
                                                                               scheduled_call.workflow_version_tag)
         workflow_run = WorkflowRun(workflow=workflow, workflow_config=workflow_config or workflow.active_config)
+        call.record_workflow_visit(workflow_run)
         leg = ContactLeg()
         admin_call = scheduled_call.admin_call
         leg.contact_system = admin_call.contact_system
@@ -67,6 +70,7 @@ class CallService:
         workflow = self.workflow_service.get_workflow_for_id(call_routing.workflow_id)
         workflow_run = WorkflowRun(current_queue=call_routing.initial_queue, workflow=workflow,
                                    workflow_config=workflow.active_config)
+        call.record_workflow_visit(workflow_run)
         leg = ContactLeg()
         leg.contact_system = telephony_system
         leg.contact_system_id = telephony_system_id
@@ -81,6 +85,41 @@ class CallService:
         self.session.commit()
         return leg
 
+    def end_active_call_legs(self, telephony_system: str, telephony_system_id: str, disposition_type: str,
+                             disposition_kwargs: dict, unfinished_workflow_disposition_kwargs: dict) -> List[UUID]:
+        """
+        Ends the active legs of a call in a single UPDATE, without loading (or decrypting) the legs and their workflow
+        runs, for callbacks that only need to close the call out
+
+        :param telephony_system:
+        :param telephony_system_id:
+        :param disposition_type:
+        :param disposition_kwargs:
+        :param unfinished_workflow_disposition_kwargs: used instead for legs whose workflow run had not finished
+        :return: ids of the legs that were ended, empty when the call was already complete
+        """
+        contact_leg = ContactLeg.__table__
+        workflow_run = WorkflowRun.__table__
+        unfinished_workflow_run = exists().where(and_(
+            workflow_run.c.id == contact_leg.c.workflow_run_id,
+            workflow_run.c.state != WorkflowState.finished.value,
+        ))
+        # Bound JSON is sent as text, without the casts Postgres resolves the CASE to text rather than jsonb
+        kwargs_type = contact_leg.c.disposition_kwargs.type
+        statement = (update(contact_leg)
+                     .where(contact_leg.c.contact_system == telephony_system)
+                     .where(contact_leg.c.contact_system_id == telephony_system_id)
+                     .where(contact_leg.c.end_time.is_(None))
+                     .values(end_time=datetime.now(),
+                             disposition_type=disposition_type,
+                             disposition_kwargs=case(
+                                 [(unfinished_workflow_run,
+                                   cast(bindparam("unfinished_kwargs", unfinished_workflow_disposition_kwargs,
+                                                  type_=kwargs_type), kwargs_type))],
+                                 else_=cast(bindparam("kwargs", disposition_kwargs, type_=kwargs_type), kwargs_type)))
+                     .returning(contact_leg.c.id))
+        return [row.id for row in self.session.execute(statement)]
+
     def end_call_leg(self, call_leg: ContactLeg, disposition_type: str, disposition_kwargs: dict = None):
         if call_leg is None or call_leg.end_time is not None:
             return
@@ -88,6 +127,7 @@ class CallService:
         call_leg.disposition_type = disposition_type
         call_leg.disposition_kwargs = disposition_kwargs or {}
         self.session.add(call_leg)
+        recent_transfers.record_on_commit(self.session, call_leg, call_leg.transfer_routing)
         self.session.commit()
 
     def transfer_call_leg_to_workflow(self, call_leg: ContactLeg, workflow_name: str) -> ContactLeg:
@@ -96,11 +136,14 @@ class CallService:
         workflow_run = WorkflowRun(
             workflow=workflow, current_queue=current_queue, workflow_config=workflow.active_config
         )
+        call_leg.contact.record_workflow_visit(workflow_run)
 
         new_leg = ContactLeg()
         new_leg.contact = call_leg.contact
         new_leg.contact_system = call_leg.contact_system
         new_leg.contact_system_id = call_leg.contact_system_id
+        new_leg.ani = call_leg.ani
+        new_leg.dnis = call_leg.dnis
 
         new_leg.workflow_run = workflow_run
 
@@ -233,11 +276,11 @@ class CallService:
         most_recent_call = self.get_most_recent_call(ani)
 
         if most_recent_call is None:
-            ivr_logger.warning(f"call missing: {ani}")
+            ivr_logger.warning("call missing: %s", ani)
             return None
 
         if len(most_recent_call.contact_legs) == 0:
-            ivr_logger.warning(f"no call legs: {ani}")
+            ivr_logger.warning("no call legs: %s", ani)
             return None
 
         most_recent_call_leg = most_recent_call.contact_legs[0]
@@ -247,21 +290,36 @@ class CallService:
 
         return most_recent_call_leg
 
+    def get_most_recent_call_leg_id(self, ani: str) -> Optional[UUID]:
+        # Served by ix_contact_leg_ani_created_at
+        return (self.session.query(ContactLeg.id)
+                .filter(ContactLeg.ani == ani)
+                .order_by(ContactLeg.created_at.desc())
+                .limit(1)
+                .scalar())
+
     def get_recent_transferred_call(self, ani: str, dnis: str) -> (Optional[Contact], Optional[str]):
-        most_recent_call_leg = self.get_most_recent_call_leg(ani)
+        # Only the ANI's latest leg counts, a newer call that was not transferred must not be matched to an older
+        # transfer. Served by ix_contact_leg_ani_created_at.
+        most_recent_call_leg = (self.session.query(ContactLeg)
+                                .options(joinedload(ContactLeg.contact), joinedload(ContactLeg.transfer_routing))
+                                .filter(ContactLeg.ani == ani)
+                                .order_by(ContactLeg.created_at.desc())
+                                .first())
         if most_recent_call_leg is None:
             return None, "no call"
 
         transfer_routing = most_recent_call_leg.transfer_routing
         if transfer_routing is None:
-            ivr_logger.warning(f"no transfer routing: {ani}")
+            ivr_logger.warning("no transfer routing: %s", ani)
             return None, "not transferred"
         if transfer_routing.destination != dnis:
-            ivr_logger.warning(f"mismatched transfer routing destination call dnis: {dnis} actual destination: {transfer_routing.destination}")
+            ivr_logger.warning("mismatched transfer routing destination call dnis: %s actual destination: %s",
+                               dnis, transfer_routing.destination)
             return None, "dnis mismatch"
 
         if most_recent_call_leg.end_time < (datetime.now() - timedelta(minutes=1)):
-            ivr_logger.warning(f"most recent call too old: {most_recent_call_leg.end_time}")
+            ivr_logger.warning("most recent call too old: %s", most_recent_call_leg.end_time)
             return None, "call too old"
         return most_recent_call_leg.contact, None
 
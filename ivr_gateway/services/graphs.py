@@ -1,8 +1,6 @@
 import random
 from typing import List
 
-import graphviz
-
 from ivr_gateway.models.workflows import Workflow, WorkflowConfig
 from ivr_gateway.steps.config import Step
 
@@ -13,6 +11,8 @@ class StepTreeGraph:
         self.workflow_name = workflow.workflow_name
         self.workflow_config = workflow_config
         self.workflow_branches = workflow_config.branches
+        # Only the scaffold command draws graphs, keep graphviz out of the web workers
+        import graphviz
         self.dot = graphviz.Digraph('workflow', comment='Workflow Graph', filename=self.workflow_name)
 
     def node_exists(self, node: str) -> bool:
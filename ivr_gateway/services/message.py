@@ -1,9 +1,11 @@
 import os
-from typing import Optional
+from typing import Dict, Optional
 import yaml
 
 from ivr_gateway.logger import ivr_logger
 
+# Parsed message catalogs by path, the files only change with a deploy
+_message_configs: Dict[str, dict] = {}
 
 
 class SimpleMessageService:
@@ -27,5 +29,8 @@ class SimpleMessageService:
 
     @property
     def message_config(self):
-        with open(self.config_path) as file:
-            return yaml.safe_load(file.read())
+        config_path = self.config_path
+        if config_path not in _message_configs:
+            with open(config_path) as file:
+                _message_configs[config_path] = yaml.safe_load(file.read())
+        return _message_configs[config_path]
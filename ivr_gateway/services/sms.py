@@ -39,6 +39,7 @@ class SmsService:
         workflow = self.workflow_service.get_workflow_for_id(inbound_routing.workflow_id)
         workflow_run = WorkflowRun(current_queue=inbound_routing.initial_queue, workflow=workflow,
                                    workflow_config=workflow.active_config, session={})
+        contact.record_workflow_visit(workflow_run)
         leg = ContactLeg()
         leg.contact_system = contact_system
         leg.contact_system_id = contact_system_id
@@ -67,6 +68,7 @@ class SmsService:
         workflow_run = WorkflowRun(
             workflow=workflow, current_queue=current_queue, workflow_config=workflow.active_config
         )
+        sms_leg.contact.record_workflow_visit(workflow_run)
 
         new_leg = ContactLeg()
         new_leg.contact = sms_leg.contact
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import orm
+from sqlalchemy.dialects.postgresql import insert
+
+from ivr_gateway.models.encryption import active_encryption_key_fingerprint
+from ivr_gateway.models.webhooks import WebhookResponse
+
+# A retry arriving later than this is processed again rather than replayed
+REPLAY_WINDOW_SECONDS = int(os.getenv("IVR_WEBHOOK_REPLAY_WINDOW_SECONDS", "300"))
+# How long a retry waits for an original that is still being processed before processing the webhook itself
+REPLAY_WAIT_SECONDS = float(os.getenv("IVR_WEBHOOK_REPLAY_WAIT_SECONDS", "5"))
+REPLAY_POLL_SECONDS = 0.1
+
+
+def webhook_payload_hash(form_items: Iterable[Tuple[str, str]], idempotency_token: str) -> str:
+    payload = json.dumps([idempotency_token, sorted(form_items)], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class WebhookReplayService:
+
+    def __init__(self, db_session: orm.Session, replay_window_seconds: int = REPLAY_WINDOW_SECONDS):
+        self.db_session = db_session
+        self.replay_window = timedelta(seconds=replay_window_seconds)
+
+    def claim(self, call_sid: str, endpoint: str, payload_hash: str) \
+            -> Tuple[Optional[uuid.UUID], Optional[WebhookResponse]]:
+        """
+        Claims a webhook for processing. The claim is an INSERT in the request's transaction, so a retry that arrives
+        while the original has not committed yet waits on the unique constraint until the original commits (and is
+        then replayed) or rolls back (and is then processed itself).
+
+        :param call_sid:
+        :param endpoint:
+        :param payload_hash:
+        :return: the id of the claimed row when the webhook has to be processed, otherwise the original's row, whose
+            response is still None when the original committed part of its work but is not done yet
+        """
+        table = WebhookResponse.__table__
+        statement = (insert(table)
+                     .values(encryption_key_fingerprint=active_encryption_key_fingerprint, call_sid=call_sid,
+                             endpoint=endpoint, payload_hash=payload_hash)
+                     .on_conflict_do_nothing(index_elements=[table.c.call_sid, table.c.endpoint, table.c.payload_hash])
+                     .returning(table.c.id))
+        claimed_id = self.db_session.execute(statement).scalar()
+        if claimed_id is not None:
+            return claimed_id, None
+        previous = (self.db_session.query(WebhookResponse)
+                    .filter(WebhookResponse.call_sid == call_sid)
+                    .filter(WebhookResponse.endpoint == endpoint)
+                    .filter(WebhookResponse.payload_hash == payload_hash)
+                    .first())
+        if previous is None or previous.created_at < datetime.utcnow() - self.replay_window:
+            return None, None
+        return None, previous
+
+    def wait_for_response(self, previous: WebhookResponse, timeout: float) -> Optional[WebhookResponse]:
+        expires_at = time.monotonic() + timeout
+        while previous.response is None and time.monotonic() < expires_at:
+            time.sleep(REPLAY_POLL_SECONDS)
+            self.db_session.refresh(previous)
+        return previous if previous.response is not None else None
+
+    def record(self, claimed_id: uuid.UUID, response: str, status_code: int):
+        (self.db_session.query(WebhookResponse)
+         .filter(WebhookResponse.id == claimed_id)
+         .update({"response": response, "status_code": status_code}, synchronize_session=False))
+
+    def release(self, claimed_id: uuid.UUID):
+        """
+        Deletes a claim whose webhook did not produce a response worth replaying, a retry then processes the webhook
+        itself without waiting on it
+
+        :param claimed_id:
+        :return:
+        """
+        (self.db_session.query(WebhookResponse)
+         .filter(WebhookResponse.id == claimed_id)
+         .filter(WebhookResponse.response.is_(None))
+         .delete(synchronize_session=False))
+
+    def purge(self, before: datetime) -> int:
+        return (self.db_session.query(WebhookResponse)
+                .filter(WebhookResponse.created_at < before)
+                .delete(synchronize_session=False))
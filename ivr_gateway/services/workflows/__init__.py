@@ -4,11 +4,13 @@ from sqlalchemy import orm, or_
 
 from ivr_gateway.models.contacts import ContactLeg
 from ivr_gateway.models.enums import Partner
+from ivr_gateway.models.exceptions import MissingWorkflowStepConfigurationException
 from ivr_gateway.models.steps import StepState, StepRun
 from ivr_gateway.models.workflows import WorkflowRun, Workflow, WorkflowConfig, WorkflowStepRun
 from ivr_gateway.services.workflows.exceptions import CreateStepForWorkflowException, MissingWorkflowConfigException, \
     InvalidWorkflowConfigTagException
-from ivr_gateway.services.workflows.utils import get_step_template_from_workflow, get_step_branch_from_workflow
+from ivr_gateway.services.workflows.utils import get_step_template_from_workflow, get_step_branch_from_workflow, \
+    get_step_transition_from_workflow
 from ivr_gateway.steps.base import Step, NextStepOrExit
 from ivr_gateway.steps.config import StepTree
 from ivr_gateway.steps.exceptions import StepInitializationException
@@ -124,17 +126,12 @@ class WorkflowService:
         """
         current_step_run = workflow_run.get_current_step_run()
         # Using the current step run because we might have branched
-        step_template = get_step_template_from_workflow(workflow_run, current_step_run.name,
-                                                        branch_name=current_step_run.branch)
-
-        if step_template.exit_path is not None:
-            # If we have an exit path, then we need to map this out using the dynamic class loader
-            exit_path_config = step_template.exit_path
-            exit_path_type = exit_path_config["exit_path_type"]
-            exit_path_kwargs = exit_path_config.get("exit_path_kwargs", {})
-            exit_path_class = dynamic_class_loader(exit_path_type)
-            exit_path = exit_path_class(**exit_path_kwargs)
-            return exit_path
+        _, transition = get_step_transition_from_workflow(workflow_run, current_step_run.name,
+                                                          branch_name=current_step_run.branch)
+
+        if transition.exit_path_type is not None:
+            # If we have an exit path, its class was resolved when the step tree's transition table was compiled
+            return transition.create_exit_path()
 
         # Otherwise we will create a step dynamically using the last step run as an anchor to find the next
         # Step template for the current step branch (we may have no runs if we are initializing or have just swapped
@@ -159,12 +156,13 @@ class WorkflowService:
         # at the first step
         next_step_on_branch_index = 0
         if last_step_run is not None:
-            for idx, st in enumerate(step_branch.steps):
-                # if the last_step_run is this step, then we store it's index + 1, and use that to access the branch
-                # step list
-                if st.name == last_step_run.name:
-                    next_step_on_branch_index = idx + 1
-                    break
+            try:
+                _, last_transition = get_step_transition_from_workflow(workflow_run, last_step_run.name,
+                                                                       branch_name=step_branch.name)
+                # The last step run is followed by the next step in the branch's step list
+                next_step_on_branch_index = last_transition.step_index + 1
+            except MissingWorkflowStepConfigurationException:
+                pass
         next_step_config = step_branch.steps[next_step_on_branch_index]
         step = self.create_step_for_workflow(
             workflow_run, next_step_config.name, current_branch_name
@@ -2,9 +2,9 @@ from abc import ABC, abstractmethod
 from datetime import datetime as dt
 from typing import Set
 
-import dateparser
 from sqlalchemy import orm
 
+from ivr_gateway.dates import parse_date
 from ivr_gateway.models.workflows import WorkflowRun
 from ivr_gateway.steps.inputs import Numeric
 
@@ -25,7 +25,7 @@ class FieldLookupServiceABC(ABC):
         pass
 
     def get_date_field_by_lookup_key(self, lookup_key: str) -> dt:
-        return dateparser.parse(self.get_field_by_lookup_key(lookup_key))
+        return parse_date(self.get_field_by_lookup_key(lookup_key))
 
     def get_numeric_field_by_lookup_key(self, lookup_key: str, int_cast=False) -> Numeric:
         if int_cast:
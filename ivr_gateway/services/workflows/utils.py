@@ -1,12 +1,29 @@
+from typing import Tuple
+
 from ivr_gateway.models.exceptions import MissingWorkflowStepConfigurationException
 from ivr_gateway.models.workflows import WorkflowRun
 from ivr_gateway.steps.config import Step, StepBranch
+from ivr_gateway.steps.transitions import StepTransition, TransitionTable, transition_table
 
 
 def get_step_template_from_workflow(workflow_run: WorkflowRun, step_name: str, branch_name=None) -> Step:
     """
     Move to workflow service
 
+    :param workflow_run:
+    :param step_name:
+    :param branch_name:
+    :return:
+    """
+    step_template, _ = get_step_transition_from_workflow(workflow_run, step_name, branch_name=branch_name)
+    return step_template
+
+
+def get_step_transition_from_workflow(workflow_run: WorkflowRun, step_name: str,
+                                      branch_name=None) -> Tuple[Step, StepTransition]:
+    """
+    Looks up a step template and its transition in the compiled transition table of the run's step tree
+
     :param workflow_run:
     :param step_name:
     :param branch_name:
@@ -14,16 +31,22 @@ def get_step_template_from_workflow(workflow_run: WorkflowRun, step_name: str, b
     """
     if branch_name is None:
         branch_name = workflow_run.current_step_branch_name
-    # Index into the step_config_branch
+    step_tree = workflow_run.workflow_config.step_tree
+    for table in _transition_tables(workflow_run):
+        transition = table.transition(branch_name, step_name)
+        if transition is None or transition.branch_index >= len(step_tree.branches):
+            continue
+        step_branch = step_tree.branches[transition.branch_index]
+        if step_branch.name != branch_name or transition.step_index >= len(step_branch.steps):
+            continue
+        step_template = step_branch.steps[transition.step_index]
+        if step_template.name == step_name:
+            return step_template, transition
     step_branch = get_step_branch_from_workflow(workflow_run, branch_name)
-    # Extract out the
-    try:
-        return next((x for x in step_branch.steps if x.name == step_name))
-    except StopIteration:
-        raise MissingWorkflowStepConfigurationException(
-            f"Missing step config for {step_name} in "
-            f"{map(lambda x: x.name, step_branch.steps)}"
-        )
+    raise MissingWorkflowStepConfigurationException(
+        f"Missing step config for {step_name} in "
+        f"{map(lambda x: x.name, step_branch.steps)}"
+    )
 
 
 def get_step_branch_from_workflow(workflow_run: WorkflowRun, branch_name: str) -> StepBranch:
@@ -34,13 +57,28 @@ def get_step_branch_from_workflow(workflow_run: WorkflowRun, branch_name: str) -
     :param branch_name:
     :return:
     """
-    # Index into the step_config_branch
-    try:
-        return next((
-            x for x in workflow_run.workflow_config.step_tree.branches if x.name == branch_name
-        ))
-    except StopIteration:
-        raise MissingWorkflowStepConfigurationException(
-            f"Missing step branch for {branch_name} in "
-            f"{map(lambda x: x.name, workflow_run.workflow_config.step_tree.branches)}"
-        )
+    step_tree = workflow_run.workflow_config.step_tree
+    for table in _transition_tables(workflow_run):
+        branch_index = table.branch_index(branch_name)
+        if branch_index is not None and branch_index < len(step_tree.branches) \
+                and step_tree.branches[branch_index].name == branch_name:
+            return step_tree.branches[branch_index]
+    raise MissingWorkflowStepConfigurationException(
+        f"Missing step branch for {branch_name} in "
+        f"{map(lambda x: x.name, step_tree.branches)}"
+    )
+
+
+def _transition_tables(workflow_run: WorkflowRun):
+    """
+    The table compiled for the config's sha, then one compiled from the tree itself in case the tree was changed in
+    memory since the sha was computed
+
+    :param workflow_run:
+    :return:
+    """
+    workflow_config = workflow_run.workflow_config
+    table = transition_table(workflow_config.step_tree, workflow_config.step_tree_sha)
+    yield table
+    if workflow_config.step_tree_sha is not None:
+        yield TransitionTable(workflow_config.step_tree)
@@ -14,6 +14,7 @@ from .update_call import *  # noqa: F401,F403
 REGISTRY = [
     AddFieldToWorkflowSessionStep,  # noqa: F405
     BranchWorkflowStep,  # noqa: F405
+    DecisionTableStep,  # noqa: F405
     JumpBranchStep,  # noqa: F405
     InputStep,  # noqa: F405
     InputActionStep,  # noqa: F405
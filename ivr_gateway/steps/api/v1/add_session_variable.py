@@ -10,6 +10,8 @@ __all__ = [
 
 
 class CopySessionVariable(APIV1Step):
+    pure = True
+
     def __init__(self, name: str, existing_field: str, new_field_name, *args, **kwargs):
         self.existing_field = existing_field
         self.new_field_name = new_field_name
@@ -1,8 +1,8 @@
 from typing import Dict
 
-import dateparser
 from ddtrace import tracer
 
+from ivr_gateway.dates import DTMF_DATE_FORMAT, parse_date
 from ivr_gateway.services.amount.workflow_runner import WorkflowRunnerService, AvantBasicError
 from ivr_gateway.steps.api.v1.base import APIV1Step
 from ivr_gateway.steps.result import StepResult, StepSuccess, UserStepError, StepError
@@ -85,7 +85,7 @@ class AvantBasicWorkflowStep(APIV1Step):
         if item_type == "currency":
             return f"${item_value}"
         elif item_type == "date":
-            date = dateparser.parse(item_value, date_formats=["%m%d%Y"])
+            date = parse_date(item_value, date_formats=[DTMF_DATE_FORMAT])
             return f'{date.strftime("%B %-d, %Y")}'
         else:
             return item_value
@@ -111,7 +111,7 @@ class AvantBasicWorkflowStep(APIV1Step):
                 total_cents = int(dollars) * 100 + int(cents)
                 values[step_name + "_currency"] = total_cents
             elif item_type == "date":
-                date = dateparser.parse(item_value, date_formats=["%m%d%Y"])
+                date = parse_date(item_value, date_formats=[DTMF_DATE_FORMAT])
                 values[step_name + "_date"] = date.date().isoformat()
             elif item_type == "digits":
                 values[step_name + "_digits"] = item_value
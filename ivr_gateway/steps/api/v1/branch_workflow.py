@@ -1,20 +1,24 @@
 from abc import ABC
-from typing import Dict
+from typing import Any, Dict, List
 
 from ddtrace import tracer
 
 from ivr_gateway.steps.api.v1.base import APIV1Step
+from ivr_gateway.steps.api.v1.logic import BOOLEAN_OPERATIONS, BooleanLogicStep
 from ivr_gateway.steps.result import StepResult, StepSuccess, StepError
 from ivr_gateway.steps.utils import get_field
 
 __all__ = [
     "BranchWorkflowStep",
     "BranchMapWorkflowStep",
+    "DecisionTableStep",
     "JumpBranchStep"
 ]
 
 
 class BranchWorkflowStep(APIV1Step, ABC):
+    pure = True
+
     def __init__(self, name: str, *args, **kwargs):
         super().__init__(name, *args, **kwargs)
 
@@ -87,3 +91,75 @@ class JumpBranchStep(BranchWorkflowStep):
     @tracer.wrap()
     def run(self) -> StepResult:
         return self.save_result(result=StepSuccess(result=self.branch))
+
+
+class DecisionTableStep(BranchWorkflowStep):
+    """
+    Routes on an ordered list of boolean rules in a single step, in place of a chain of BooleanLogicStep and
+    BranchMapWorkflowStep steps. Every field the rules reference is read once, the first rule that holds picks the
+    branch.
+
+    Tree Step Config
+    {
+        "name": "step-name",
+        "step_type": DecisionTableStep.get_type_string(),
+        "step_kwargs": {
+            "rules": [
+                # fieldset and op as for a BooleanLogicStep
+                {"fieldset": ["session.card_count", 0], "op": ">", "branch": "card-branch"},
+                {"fieldset": ["session.loan_id"], "op": "nonnull", "branch": "loan-branch"},
+            ],
+            "default_branch": "branch-name", # Used when no rule holds
+            "on_error_reset_to_step": "step-name",
+        }
+    }
+    """
+
+    def __init__(self, name: str, rules: List[Dict] = None, default_branch: str = None, *args, **kwargs):
+        self.rules = rules or []
+        self.default_branch = default_branch
+        kwargs.update({
+            "rules": self.rules,
+            "default_branch": default_branch
+        })
+        for rule in self.rules:
+            op = rule.get("op")
+            if op not in BooleanLogicStep.valid_operations:
+                raise ValueError(f"Op supplied {op}, not supported. Valid operations: "
+                                 f"{BooleanLogicStep.valid_operations}")
+            required_fields = 2 if op in BooleanLogicStep.binary_operations else 1
+            if len(rule.get("fieldset", [])) < required_fields or rule.get("branch") is None:
+                raise ValueError(f"Rule {rule} needs {required_fields} fields and a branch")
+        # Field references of all the rules, in order and without duplicates
+        self.fields = list(dict.fromkeys(
+            field for rule in self.rules for field in rule["fieldset"] if isinstance(field, str)
+        ))
+        super().__init__(name, *args, **kwargs)
+
+    def _evaluate(self, values: Dict[str, Any]) -> str:
+        for rule in self.rules:
+            op = rule["op"]
+            fieldset = [values.get(field, field) if isinstance(field, str) else field for field in rule["fieldset"]]
+            f1 = fieldset[0]
+            f2 = fieldset[1] if op in BooleanLogicStep.binary_operations else None
+            try:
+                holds = BOOLEAN_OPERATIONS[op](f1, f2)
+            except TypeError:
+                raise self.save_result(result=StepError(
+                    f"Cannot perform {op} operation in decision table step on values of types {str(type(f1))} and "
+                    f"{str(type(f2))}", retryable=True, reset_step=self.on_error_reset_to_step))
+            if holds:
+                return rule["branch"]
+        return self.default_branch
+
+    @tracer.wrap()
+    def run(self) -> StepResult:
+        workflow_run = self.step_run.workflow_run
+        values = {field: get_field(field, workflow_run) for field in self.fields}
+        new_branch = self._evaluate(values)
+        if new_branch is not None and workflow_run.is_valid_step_branch(new_branch):
+            return self.save_result(result=StepSuccess(result=new_branch))
+        else:
+            error = StepError(f"Error switching to branch: {new_branch}", retryable=True,
+                              reset_step=self.on_error_reset_to_step)
+            raise self.save_result(result=error)
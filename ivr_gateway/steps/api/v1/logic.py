@@ -1,5 +1,5 @@
 from abc import abstractmethod, ABC
-from typing import Tuple, Any
+from typing import Tuple, Any, Callable, Dict
 
 from ddtrace import tracer
 
@@ -13,6 +13,18 @@ __all__ = [
 
 from ivr_gateway.steps.utils import get_field
 
+BOOLEAN_OPERATIONS: Dict[str, Callable[[Any, Any], Any]] = {
+    "==": lambda f1, f2: f1 == f2,
+    "!=": lambda f1, f2: f1 != f2,
+    ">": lambda f1, f2: f1 > f2,
+    "<": lambda f1, f2: f1 < f2,
+    ">=": lambda f1, f2: f1 >= f2,
+    "<=": lambda f1, f2: f1 <= f2,
+    "&&": lambda f1, f2: f1 and f2,
+    "||": lambda f1, f2: f1 or f2,
+    "nonnull": lambda f1, f2: f1 is not None,
+}
+
 
 class LogicStep(APIV1Step, ABC):
     """
@@ -21,6 +33,7 @@ class LogicStep(APIV1Step, ABC):
 
     Abstract base class used to define required arguments, can operate on a tuple of fields
     """
+    pure = True
 
     def __init__(self, name: str, fieldset: Tuple[str, ...] = None, result_field: str = None, *args, **kwargs):
         """
@@ -109,24 +122,7 @@ class BooleanLogicStep(LogicStep):
         :return: Bool value of operation
         """
         try:
-            if self.op == "==":
-                return f1 == f2
-            elif self.op == "!=":
-                return f1 != f2
-            elif self.op == ">":
-                return f1 > f2
-            elif self.op == "<":
-                return f1 < f2
-            elif self.op == ">=":
-                return f1 >= f2
-            elif self.op == "<=":
-                return f1 <= f2
-            elif self.op == "&&":
-                return f1 and f2
-            elif self.op == "||":
-                return f1 or f2
-            elif self.op == "nonnull":
-                return f1 is not None
+            return BOOLEAN_OPERATIONS[self.op](f1, f2)
         except TypeError:
             if f2:
                 raise StepError(f"Cannot perform {self.op} operation in boolean logic step on values of"
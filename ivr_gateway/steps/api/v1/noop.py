@@ -13,6 +13,7 @@ class NoopStep(APIV1Step):
     Used to represent a step w/ no operation, needs to be ABC b/c we need gateway and external versions that are
     concrete to input
     """
+    pure = True
 
     @tracer.wrap()
     def run(self) -> StepResult:
@@ -1,8 +1,9 @@
 from datetime import datetime as dt
+from functools import lru_cache
 from typing import List, Tuple, Set
 
 from ddtrace import tracer
-from jinja2 import Environment
+from jinja2 import Environment, Template
 
 from ivr_gateway.steps.api.v1 import APIV1Step
 from ivr_gateway.steps.inputs import StepInput
@@ -96,6 +97,17 @@ environment.filters['currency'] = currency
 environment.filters['last_characters'] = last_characters
 
 
+@lru_cache(maxsize=1024)
+def compile_template(template: str) -> Template:
+    """
+    Compiled templates are immutable, steps built from the same template share one
+
+    :param template:
+    :return:
+    """
+    return environment.from_string(template)
+
+
 class PlayMessageStep(APIV1Step):
     """
     Play Message Step Example Usage:
@@ -124,7 +136,7 @@ class PlayMessageStep(APIV1Step):
             self._template = template
         else:
             self._template = self.message_service.get_message_by_key(message_key) or template
-        self._message_template = environment.from_string(self._template)
+        self._message_template = compile_template(self._template)
         self.start_new_message = start_new_message
         self.end_break = end_break
         kwargs.update({
@@ -20,6 +20,9 @@ class Step(ABC):
     Domain object used to record, and track user interactions and be a way to map behavior
     across multiple subclassed types while maintaining centralized audibility
     """
+    # Pure steps only read and write the workflow run, they neither interact with the caller nor have external side
+    # effects. Their state is flushed rather than committed and becomes durable at the next checkpoint.
+    pure = False
 
     def __init__(self, name: str, step_run: StepRun = None, step_state: StepState = None,
                  on_error_reset_to_step: str = None, on_error_switch_to_branch: str = None,
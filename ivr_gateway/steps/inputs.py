@@ -2,8 +2,7 @@ from abc import abstractmethod, ABC
 from datetime import datetime, date, timedelta
 from typing import List, Optional, Type, Union, Generic, TypeVar
 
-import dateparser
-
+from ivr_gateway.dates import DTMF_DATE_FORMAT, parse_date
 from ivr_gateway.steps.action import NumberedStepAction, StepAction
 
 class StepInputBindingException(Exception):
@@ -135,7 +134,7 @@ class DateInput(StepInput[datetime, str]):
         self.check_length()
         self.check_max_stars(0)
         try:
-            self._bound_input = dateparser.parse(self.input_value, date_formats=["%m%d%Y"])
+            self._bound_input = parse_date(self.input_value, date_formats=[DTMF_DATE_FORMAT])
             if not self._bound_input:
                 raise ValueError("Date out of bounds")
             if self.min_date is not None:
@@ -0,0 +1,83 @@
+"""
+Transition tables for step trees.
+
+A table maps every branch name and (branch, step) pair of a step tree to its position in the tree, and each step to
+its exit path class, so the workflow engine routes a step result without scanning the tree. Tables are compiled once per
+step tree sha and shared by every config load with that sha. They hold positions rather than the Step templates
+themselves, the templates are read from the caller's own tree.
+"""
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple, Type
+
+from ivr_gateway.steps.config import StepTree
+from ivr_gateway.utils import dynamic_class_loader
+
+MAX_TRANSITION_TABLES = 512
+
+
+class StepTransition(NamedTuple):
+    branch_index: int
+    step_index: int
+    exit_path_type: Optional[str] = None
+    exit_path_kwargs: Optional[Dict] = None
+    # None when the step has no exit path or its type could not be resolved when compiling
+    exit_path_class: Optional[Type] = None
+
+    def create_exit_path(self):
+        exit_path_class = self.exit_path_class or dynamic_class_loader(self.exit_path_type)
+        return exit_path_class(**self.exit_path_kwargs)
+
+
+class TransitionTable:
+
+    def __init__(self, step_tree: StepTree):
+        self.branch_indexes: Dict[str, int] = {}
+        self.transitions: Dict[Tuple[str, str], StepTransition] = {}
+        for branch_index, branch in enumerate(step_tree.branches):
+            # The first branch or step with a name wins, as with a scan of the tree
+            self.branch_indexes.setdefault(branch.name, branch_index)
+            for step_index, step in enumerate(branch.steps):
+                key = (branch.name, step.name)
+                if key not in self.transitions:
+                    self.transitions[key] = self._compile_step(branch_index, step_index, step.exit_path)
+
+    @staticmethod
+    def _compile_step(branch_index: int, step_index: int, exit_path: Optional[Dict]) -> StepTransition:
+        if exit_path is None:
+            return StepTransition(branch_index, step_index)
+        exit_path_type = exit_path["exit_path_type"]
+        try:
+            exit_path_class = dynamic_class_loader(exit_path_type)
+        except (ImportError, AttributeError):
+            # Raised again when the step routes to it, not when the tree is loaded
+            exit_path_class = None
+        return StepTransition(branch_index, step_index, exit_path_type, exit_path.get("exit_path_kwargs", {}),
+                              exit_path_class)
+
+    def branch_index(self, branch_name: str) -> Optional[int]:
+        return self.branch_indexes.get(branch_name)
+
+    def transition(self, branch_name: str, step_name: str) -> Optional[StepTransition]:
+        return self.transitions.get((branch_name, step_name))
+
+
+_tables: Dict[str, TransitionTable] = {}
+_tables_lock = threading.Lock()
+
+
+def transition_table(step_tree: StepTree, step_tree_sha: Optional[str]) -> TransitionTable:
+    """
+    :param step_tree:
+    :param step_tree_sha: None for a tree that has not been saved, its table is compiled on every call
+    :return:
+    """
+    if step_tree_sha is None:
+        return TransitionTable(step_tree)
+    table = _tables.get(step_tree_sha)
+    if table is None:
+        table = TransitionTable(step_tree)
+        with _tables_lock:
+            if len(_tables) >= MAX_TRANSITION_TABLES:
+                _tables.clear()
+            _tables[step_tree_sha] = table
+    return table
@@ -1,6 +1,6 @@
-import copy
 import re
-from typing import List, Tuple, Dict, Callable, Any
+from functools import lru_cache
+from typing import List, Tuple, Dict, Callable, Any, NamedTuple
 
 from ivr_gateway.models.workflows import WorkflowRun
 from ivr_gateway.steps.exceptions import FieldParsingException
@@ -9,6 +9,20 @@ from ivr_gateway.utils import recursive_dict_fetch
 VALID_STEP_RUN_ACCESS_TYPES = ("initialization",)
 VALID_STEP_STATE_ACCESS_TYPES = ("result", "input")
 VALID_STEP_ACCESS_TYPES = VALID_STEP_RUN_ACCESS_TYPES + VALID_STEP_STATE_ACCESS_TYPES
+STEP_EXTRACTOR_PATTERN = re.compile(r"step\[([A-Za-z0-9_:-]+)]")
+# Field references come from step trees, so there are only so many distinct ones per process
+FIELD_ACCESSOR_CACHE_SIZE = 4096
+
+
+class FieldAccessor(NamedTuple):
+    """
+    A compiled field reference, unpacks to (extractor, extraction_tokens) like the tuples parse_field used to return
+    """
+    extractor: Callable[[WorkflowRun, List[str]], Any]
+    extraction_tokens: List[str]
+
+    def __call__(self, workflow_run: WorkflowRun) -> Any:
+        return self.extractor(workflow_run, self.extraction_tokens)
 
 
 def parse_fields_from_fieldset(fieldset: List[Tuple]) \
@@ -35,18 +49,25 @@ def parse_fields_from_fieldset(fieldset: List[Tuple]) \
     return field_extraction_and_token_mappings
 
 
-def parse_field(field_key: str) -> Tuple[Callable[[WorkflowRun, List[str]], str], List[str]]:
+@lru_cache(maxsize=FIELD_ACCESSOR_CACHE_SIZE)
+def parse_field(field_key: str) -> FieldAccessor:
+    """
+    Compiles a field reference, each distinct reference is only parsed once per process. References that do not parse
+    are not cached and raise again on every call.
 
+    :param field_key:
+    :return:
+    """
     # Split the field extractor on "."
     field_key_tokens = field_key.split(".")
     if field_key_tokens[0].startswith("session"):
-        extraction_tokens = copy.deepcopy(field_key_tokens[1:])
+        extraction_tokens = field_key_tokens[1:]
 
         # Session extractor
         def extractor(wr: WorkflowRun, _extraction_tokens: List[str]) -> str:
             return recursive_dict_fetch(wr.session, _extraction_tokens)
 
-        return (extractor, extraction_tokens)
+        return FieldAccessor(extractor, extraction_tokens)
     elif field_key_tokens[0].startswith("step["):
         if len(field_key_tokens) < 2:
             raise FieldParsingException(
@@ -60,33 +81,29 @@ def parse_field(field_key: str) -> Tuple[Callable[[WorkflowRun, List[str]], str]
                 f"Invalid step_component_extractor {step_component_extractor}, "
                 f"valid types are {VALID_STEP_ACCESS_TYPES}"
             )
-        extraction_tokens = copy.deepcopy(field_key_tokens[2:])
-        m = re.search(r"step\[([A-Za-z0-9_:-]+)]", step_extractor)
+        extraction_tokens = field_key_tokens[2:]
+        m = STEP_EXTRACTOR_PATTERN.search(step_extractor)
         branch_name, step_name = m.group(1).split(":")
 
+        # Resolved here rather than on every extraction, the component was validated above
+        if step_component_extractor in VALID_STEP_RUN_ACCESS_TYPES:
+            scope_getter = "get_branch_step_run"
+        else:
+            scope_getter = "get_step_run_state"
+
         # Step Run extractor
         def extractor(wr: WorkflowRun, _extraction_tokens: List[str]) -> str:
-            if step_component_extractor in VALID_STEP_RUN_ACCESS_TYPES:
-                scope_object = wr.get_branch_step_run(branch_name, step_name)
-            elif step_component_extractor in VALID_STEP_STATE_ACCESS_TYPES:
-                scope_object = wr.get_step_run_state(branch_name, step_name)
-            else:
-                raise FieldParsingException(
-                    f"Invalid step_component_extractor {step_component_extractor}, "
-                    f"valid types are {VALID_STEP_STATE_ACCESS_TYPES}"
-                )
+            scope_object = getattr(wr, scope_getter)(branch_name, step_name)
             return recursive_dict_fetch(
                 scope_object.__getattribute__(step_component_extractor), _extraction_tokens
             )
 
-        return (extractor, extraction_tokens)
+        return FieldAccessor(extractor, extraction_tokens)
     else:
         raise Exception("Cannot parse step extractor fieldset")
 
 
 def get_field(field_name: Any, workflow_run: WorkflowRun) -> Any:
-    if type(field_name) == str:
-        if field_name[:len("session.")] == "session." or field_name[:len("step[")] == "step[":
-            extractor, extractor_tokens = parse_field(field_name)
-            return extractor(workflow_run, extractor_tokens)
+    if type(field_name) == str and field_name.startswith(("session.", "step[")):
+        return parse_field(field_name)(workflow_run)
     return field_name
@@ -1,9 +1,12 @@
 from datetime import datetime
 from typing import List, Type, Optional
 import xml.etree.ElementTree as ET  # nosec
+import logging
 import os
+import random
+import re
 
-from flask import request, Response
+from flask import g, request, Response
 from sqlalchemy.inspection import inspect
 from ivr_gateway.models.enums import Partner
 
@@ -41,9 +44,59 @@ def returns_xml(f):
     return decorated_function
 
 
+# Debug body capture is sampled and truncated so turning on DEBUG in production does not log every payload in full
+LOG_BODY_SAMPLE_RATE = float(os.getenv("LOG_BODY_SAMPLE_RATE", "1.0"))
+LOG_BODY_MAX_BYTES = int(os.getenv("LOG_BODY_MAX_BYTES", "2048"))
+REDACTED_HEADERS = frozenset(["authorization", "cookie", "x-twilio-signature"])
+REDACTED = "[REDACTED]"
+# Caller input (form encoded from twilio, json from livevox), credentials and what is read to the caller in TwiML
+# responses (names, balances, ...), a truncated body may cut a TwiML element off before its closing tag
+_REDACTED_BODY_FIELDS = re.compile(
+    r'(?P<form>(?:^|&)(?:Digits|SpeechResult|UnstableSpeechResult|input|password)=)[^&]*'
+    r'|(?P<json>"(?:input|password|token|ssn|dob|card_number)"\s*:\s*)"(?:[^"\\]|\\.)*"'
+    r'|(?P<xml><(?P<xml_tag>Say|Gather)\b[^>]*(?<!/)>)(?s:.*?)(?P<xml_close></(?P=xml_tag)>|\Z)',
+    re.IGNORECASE
+)
+
+
+def _redact_body_field(match) -> str:
+    if match.group("form"):
+        return match.group("form") + REDACTED
+    if match.group("xml"):
+        return match.group("xml") + REDACTED + match.group("xml_close")
+    return match.group("json") + f'"{REDACTED}"'
+
+
+def redact_body(body: bytes) -> str:
+    text = body[:LOG_BODY_MAX_BYTES].decode("utf-8", errors="replace")
+    text = _REDACTED_BODY_FIELDS.sub(_redact_body_field, text)
+    if len(body) > LOG_BODY_MAX_BYTES:
+        text += f"...({len(body)} bytes)"
+    return text
+
+
+def redact_headers(headers) -> dict:
+    return {key: REDACTED if key.lower() in REDACTED_HEADERS else value for key, value in headers.items()}
+
+
+def _body_sampled() -> bool:
+    if "log_body_sampled" not in g:
+        g.log_body_sampled = random.random() < LOG_BODY_SAMPLE_RATE  # nosec
+    return g.log_body_sampled
+
+
 def log_request_info(logger):
-    logger.debug('Headers: %s', request.headers)
-    logger.debug('Body: %s', request.get_data())
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    logger.debug('Headers: %s', redact_headers(request.headers))
+    if _body_sampled():
+        logger.debug('Body: %s', redact_body(request.get_data()))
+
+
+def log_response_info(logger, response: Response):
+    if not logger.isEnabledFor(logging.DEBUG) or response.direct_passthrough or not _body_sampled():
+        return
+    logger.debug('Response Data: %s', redact_body(response.get_data()))
 
 
 def modify_object_with_dict(object_to_update, update_dict: dict):
@@ -78,12 +131,9 @@ def recursive_dict_fetch(container: dict, keys: List[str]):
     :return:
     :raises KeyError if key does not exist
     """
-    if len(keys) > 1:
-        return recursive_dict_fetch(container[keys[0]], keys[1:])
-    elif len(keys) == 1:
-        return container[keys[0]]
-    else:
-        return container
+    for key in keys:
+        container = container[key]
+    return container
 
 
 def get_model_changes(model):
@@ -0,0 +1,75 @@
+"""
+Pre-fork warm up for `gunicorn --preload` (GUNICORN_PRELOAD=true), see gunicorn.conf.py.
+
+Everything loaded here is immutable for the life of the process, so once it is built in the master the forked workers
+share those pages copy-on-write instead of each building their own.
+"""
+import gc
+
+from ivr_gateway.db import Session, session_scope
+from ivr_gateway.logger import ivr_logger, restart_queued_logging
+from ivr_gateway.models.workflows import Workflow
+from ivr_gateway.services.message import SimpleMessageService
+from ivr_gateway.steps.api.v1.play_message import compile_template
+
+
+def warm_message_catalog() -> int:
+    message_config = SimpleMessageService().message_config or {}
+    for message in message_config.values():
+        if isinstance(message, str):
+            compile_template(message)
+    return len(message_config)
+
+
+def warm_workflow_templates() -> int:
+    """
+    Compiles the message templates of every active workflow config
+
+    :return: number of workflows warmed
+    """
+    message_service = SimpleMessageService()
+    with session_scope() as session:
+        workflows = session.query(Workflow).all()
+        for workflow in workflows:
+            workflow_config = workflow.active_config
+            if workflow_config is None:
+                continue
+            for branch in workflow_config.branches:
+                for step in branch.steps:
+                    template = step.step_kwargs.get("template")
+                    message_key = step.step_kwargs.get("message_key")
+                    if message_key is not None:
+                        template = message_service.get_message_by_key(message_key) or template
+                    if isinstance(template, str):
+                        compile_template(template)
+        return len(workflows)
+
+
+def warm_up():
+    """
+    Called once in the gunicorn master before the first fork. The database is only used to read the active configs,
+    the engine is disposed afterwards so no connection is inherited by the workers.
+
+    :return:
+    """
+    messages = warm_message_catalog()
+    workflows = warm_workflow_templates()
+    reset_database_connections()
+    # Keep the warmed objects out of the collector so gc passes in the workers do not touch (and copy) their pages
+    gc.freeze()
+    ivr_logger.info("warm up loaded %s messages and templates for %s workflows", messages, workflows)
+
+
+def reset_database_connections():
+    Session.remove()
+    Session.session_factory.kw["bind"].dispose()
+
+
+def after_fork():
+    """
+    Called in every worker right after the fork, drops state that cannot be shared with the master
+
+    :return:
+    """
+    reset_database_connections()
+    restart_queued_logging()
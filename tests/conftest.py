@@ -7,6 +7,9 @@ from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session as SQLAlchemySession, sessionmaker, scoped_session
 
 from ivr_gateway import db
+from ivr_gateway.circuit_breaker import reset_circuit_breakers
+from ivr_gateway.invalidation import invalidate_all
+from ivr_gateway.recent_transfers import recent_transfers
 from ivr_gateway.app import app
 from commands import base as commands_base
 from ivr_gateway.models import Base
@@ -44,6 +47,11 @@ def db_session(request, db_connection) -> SQLAlchemySession:
         session.rollback()
         transaction.rollback()
         Session.remove()
+        # Cached configuration may have been loaded from rows that were just rolled back
+        invalidate_all()
+        # Vendor failures simulated by one test must not open circuits for the next
+        reset_circuit_breakers()
+        recent_transfers.clear()
 
     request.addfinalizer(teardown)
     return session
@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, datetime, timedelta
 
 import pytest
 import uuid
@@ -10,9 +10,10 @@ from commands.db import Db
 from ivr_gateway.exit_paths import HangUpExitPath
 from ivr_gateway.models.admin import AdminCall, AdminUser, AdminPhoneNumber, ApiCredential, ScheduledCall, \
     AdminCallFrom, AdminCallTo
-from ivr_gateway.models.contacts import Greeting, InboundRouting, Contact, TransferRouting
+from ivr_gateway.models.contacts import Greeting, InboundRouting, Contact, TransferRouting, ContactLeg
 from ivr_gateway.models.queues import Queue, QueueHoliday, QueueHoursOfOperation
 from ivr_gateway.models.steps import StepRun, StepState
+from ivr_gateway.models.webhooks import WebhookResponse
 from ivr_gateway.models.workflows import Workflow, WorkflowRun
 from ivr_gateway.services.admin import AdminService
 from ivr_gateway.services.queues import QueueService
@@ -205,6 +206,57 @@ class TestDbCommand:
         assert db_session.query(StepRun).count() == 0
         assert db_session.query(StepState).count() == 0
 
+    def test_purge_workflow_runs(self, db_session, test_client, test_cli_runner, workflow, call_routing):
+        form = {"CallSid": "test",
+                "To": "+15555555555",
+                "Digits": "1234"}
+        for i in range(5):
+            form["CallSid"] = f"test-{i}"
+            test_client.post("/api/v1/twilio/new", data=form)
+            test_client.post("/api/v1/twilio/continue", data=form)
+        assert db_session.query(WorkflowRun).count() == 5
+
+        result = test_cli_runner.invoke(Db.purge_workflow_runs, args=["--before", "2020-01-01"])
+        assert "Purged 0 workflow runs." in result.output
+        assert db_session.query(WorkflowRun).count() == 5
+
+        tomorrow = (datetime.utcnow() + timedelta(days=1)).strftime("%Y-%m-%d")
+        result = test_cli_runner.invoke(Db.purge_workflow_runs, args=["--before", tomorrow,
+                                                                      "--workflow", "main_menu",
+                                                                      "--batch-size", "2"])
+        assert "Deleted 2 workflow runs (2 so far)" in result.output
+        assert "Purged 5 workflow runs." in result.output
+        assert db_session.query(WorkflowRun).count() == 0
+        assert db_session.query(StepRun).count() == 0
+        assert db_session.query(StepState).count() == 0
+        assert db_session.query(ContactLeg).filter(ContactLeg.workflow_run_id.isnot(None)).count() == 0
+
+    def test_purge_workflow_runs_respects_retention_in_production(self, db_session, monkeypatch, test_client,
+                                                                  test_cli_runner, workflow, call_routing):
+        form = {"CallSid": "test-1",
+                "To": "+15555555555",
+                "Digits": "1234"}
+        test_client.post("/api/v1/twilio/new", data=form)
+        monkeypatch.setenv("IVR_APP_ENV", "prod")
+        tomorrow = (datetime.utcnow() + timedelta(days=1)).strftime("%Y-%m-%d")
+        result = test_cli_runner.invoke(Db.purge_workflow_runs, args=["--before", tomorrow])
+        assert result.exit_code == 1
+        assert db_session.query(WorkflowRun).count() == 1
+
+    def test_purge_webhook_responses(self, db_session, test_client, test_cli_runner, workflow, call_routing):
+        form = {"CallSid": "test",
+                "To": "+15555555555",
+                "Digits": "1234"}
+        test_client.post("/api/v1/twilio/new", data=form, headers={"I-Twilio-Idempotency-Token": "new-1"})
+        assert db_session.query(WebhookResponse).count() == 1
+
+        result = test_cli_runner.invoke(Db.purge_webhook_responses, args=["--older-than-hours", "1"])
+        assert "Purged 0 webhook responses." in result.output
+        db_session.query(WebhookResponse).update({"created_at": datetime.utcnow() - timedelta(hours=2)})
+        result = test_cli_runner.invoke(Db.purge_webhook_responses, args=["--older-than-hours", "1"])
+        assert "Purged 1 webhook responses." in result.output
+        assert db_session.query(WebhookResponse).count() == 0
+
     def test_clear_call_routing_transfer_and_admin_data(self, db_session, test_client, test_cli_runner, workflow,
                                                         call_routing, admin_call_routing, admin_call, scheduled_call):
         # Add some calls
@@ -13,3 +13,9 @@ def test_ping(test_client):
     response = test_client.get('/ping')
     assert response.status_code == 200
     assert b"pong" in response.data
+
+
+def test_circuit_breakers(test_client):
+    response = test_client.get('/circuit_breakers')
+    assert response.status_code == 200
+    assert response.json == {"circuit_breakers": []}
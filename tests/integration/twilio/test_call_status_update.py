@@ -7,6 +7,7 @@ from ivr_gateway.models.workflows import Workflow, WorkflowRun
 from ivr_gateway.steps.api.v1 import InputStep, PlayMessageStep
 from ivr_gateway.steps.config import StepTree, StepBranch, Step
 from tests.factories import workflow as wcf
+from tests.query_budget import query_budget
 
 
 class TestCallStatusUpdate:
@@ -115,3 +116,22 @@ class TestCallStatusUpdate:
         cl: ContactLeg = call.contact_legs[0]
         assert cl.disposition_type == HangUpExitPath.get_type_string()
         assert cl.disposition_kwargs == {}
+
+    def test_status_callback_is_a_single_statement(self, db_session, workflow, greeting, call_routing, test_client):
+        form = {"CallSid": "test",
+                "To": "+15555555555",
+                "Digits": "1234"}
+        test_client.post("/api/v1/twilio/new", data=form)
+        with query_budget(max_statements=0):
+            response = test_client.post("/api/v1/twilio/status", data={**form, "CallStatus": "ringing"})
+        assert response.status_code == 204
+        with query_budget(max_statements=1):
+            response = test_client.post("/api/v1/twilio/status", data={**form, "CallStatus": "completed"})
+        assert response.status_code == 204
+        cl: ContactLeg = db_session.query(ContactLeg).one()
+        assert cl.end_time is not None
+        assert cl.disposition_kwargs == {"call_status": "disconnect"}
+        # A repeated callback finds nothing left to end
+        with query_budget(max_statements=1):
+            test_client.post("/api/v1/twilio/status", data={**form, "CallStatus": "completed"})
+        assert db_session.query(ContactLeg).one().end_time == cl.end_time
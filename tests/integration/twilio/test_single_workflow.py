@@ -1,13 +1,18 @@
 import pytest
+from flask import Response
+from flask_restx import Resource
 from sqlalchemy.orm import Session as SQLAlchemySession
 
+from ivr_gateway import admission
 from ivr_gateway.exit_paths import HangUpExitPath
 from ivr_gateway.models.contacts import Greeting, InboundRouting, Contact, ContactLeg
 from ivr_gateway.models.steps import StepRun
+from ivr_gateway.models.webhooks import WebhookResponse
 from ivr_gateway.models.workflows import Workflow, WorkflowRun
 from ivr_gateway.steps.api.v1 import InputStep, PlayMessageStep
 from ivr_gateway.steps.config import StepTree, StepBranch, Step
 from tests.factories import workflow as wcf
+from tests.query_budget import query_budget
 
 
 class TestTwilio:
@@ -96,3 +101,64 @@ class TestTwilio:
         assert wr.exit_path_kwargs == {}
         assert cl.disposition_type == HangUpExitPath.get_type_string()
         assert cl.disposition_kwargs == {}
+
+    def test_new_call_query_budget(self, db_session, workflow, greeting, call_routing, test_client):
+        form = {"CallSid": "test",
+                "To": "+15555555555",
+                "Digits": "1234"}
+        # The call and its leg, initializing the input step (step and engine checkpoints), starting the run, requesting
+        # input, and the two request session scopes
+        with query_budget(max_statements=60, max_commits=8) as new_stats:
+            test_client.post("/api/v1/twilio/new", data=form)
+        # Initializing, applying the input, running the input step and initializing the play message step, then
+        # initializing and running the play message step, finishing the run, ending the leg and the two session scopes
+        with query_budget(max_statements=60, max_commits=13) as continue_stats:
+            test_client.post("/api/v1/twilio/continue", data=form)
+        assert new_stats.statements > 0 and new_stats.commits > 0
+        assert continue_stats.statements > 0 and continue_stats.commits > 0
+
+    def test_new_call_shed_under_load(self, db_session, workflow, greeting, call_routing, test_client, monkeypatch):
+        form = {"CallSid": "test",
+                "To": "+15555555555",
+                "Digits": "1234"}
+        test_client.post("/api/v1/twilio/new", data=form)
+        monkeypatch.setattr(admission.admission_controller, "shed_new_calls_at", 1)
+        with query_budget(max_statements=0):
+            response = test_client.post("/api/v1/twilio/new", data={**form, "CallSid": "test-2"})
+        assert response.data.decode() == admission.SHED_RESPONSE
+        # Calls already in the IVR are still served
+        response = test_client.post("/api/v1/twilio/continue", data=form)
+        assert "You input the following value" in response.data.decode()
+        assert db_session.query(Contact).count() == 1
+
+    def test_retried_continue_is_replayed(self, db_session, workflow, greeting, call_routing, test_client):
+        form = {"CallSid": "test",
+                "To": "+15555555555",
+                "Digits": "1234"}
+        test_client.post("/api/v1/twilio/new", data=form, headers={"I-Twilio-Idempotency-Token": "new-1"})
+        step_runs = db_session.query(StepRun).count()
+        headers = {"I-Twilio-Idempotency-Token": "continue-1"}
+        response = test_client.post("/api/v1/twilio/continue", data=form, headers=headers)
+        assert db_session.query(StepRun).count() > step_runs
+        step_runs = db_session.query(StepRun).count()
+
+        with query_budget(max_statements=5):
+            retried_response = test_client.post("/api/v1/twilio/continue", data=form, headers=headers)
+        assert retried_response.status_code == 200
+        assert retried_response.data == response.data
+        assert db_session.query(StepRun).count() == step_runs
+        assert db_session.query(WebhookResponse).count() == 2
+
+    def test_claim_without_response_is_released(self, db_session, workflow, greeting, call_routing, test_client,
+                                                monkeypatch):
+        form = {"CallSid": "test",
+                "To": "+15555555555",
+                "Digits": "1234"}
+        test_client.post("/api/v1/twilio/new", data=form, headers={"I-Twilio-Idempotency-Token": "new-1"})
+        assert db_session.query(WebhookResponse).count() == 1
+        monkeypatch.setattr(Resource, "dispatch_request", lambda *args, **kwargs: Response("error", status=500))
+        headers = {"I-Twilio-Idempotency-Token": "continue-1"}
+        response = test_client.post("/api/v1/twilio/continue", data=form, headers=headers)
+        assert response.status_code == 500
+        # A retry is processed right away instead of waiting on a claim that never gets a response
+        assert db_session.query(WebhookResponse).count() == 1
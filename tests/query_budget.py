@@ -0,0 +1,26 @@
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from ivr_gateway.query_stats import QueryStats, collect_query_stats
+
+
+@contextmanager
+def query_budget(max_statements: Optional[int] = None, max_commits: Optional[int] = None) -> Iterator[QueryStats]:
+    """
+    Collects the database work done inside the block and asserts it stays within budget, e.g.
+
+        with query_budget(max_statements=40, max_commits=6):
+            test_client.post("/api/v1/twilio/continue", data=form)
+
+    :param max_statements:
+    :param max_commits:
+    :return: the collected QueryStats
+    """
+    with collect_query_stats() as stats:
+        yield stats
+    if max_statements is not None:
+        assert stats.statements <= max_statements, \
+            f"Expected at most {max_statements} statements, {stats.statements} were executed"
+    if max_commits is not None:
+        assert stats.commits <= max_commits, \
+            f"Expected at most {max_commits} commits, {stats.commits} were issued"
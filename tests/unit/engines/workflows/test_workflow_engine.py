@@ -1,6 +1,7 @@
 from unittest.mock import patch, Mock
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session as SQLAlchemySession
 
 from ivr_gateway.engines.steps import StepEngine
@@ -9,7 +10,7 @@ from ivr_gateway.engines.workflows import WorkflowEngine, WorkflowEngineState, W
 from ivr_gateway.exit_paths import HangUpExitPath
 from ivr_gateway.models.enums import WorkflowState
 from ivr_gateway.models.workflows import WorkflowRun, Workflow
-from ivr_gateway.steps.api.v1 import PlayMessageStep, InputActionStep
+from ivr_gateway.steps.api.v1 import PlayMessageStep, InputActionStep, NoopStep
 from ivr_gateway.steps.config import StepTree, StepBranch, Step
 from ivr_gateway.steps.inputs import MenuActionInput
 from ivr_gateway.steps.result import StepSuccess, StepError
@@ -237,3 +238,62 @@ class TestWorkflowEngine:
         engine2 = WorkflowEngine(db_session, workflow_run)
         engine2.initialize()
         assert engine2.state == WorkflowEngineState.error
+
+    @pytest.fixture
+    def pure_steps_workflow_run(self, db_session: SQLAlchemySession) -> WorkflowRun:
+        workflow = workflow_factory(db_session, "pure_steps", step_tree=StepTree(
+            branches=[
+                StepBranch(
+                    name="root",
+                    steps=[
+                        Step(name="noop-1", step_type=NoopStep.get_type_string(), step_kwargs={}),
+                        Step(name="noop-2", step_type=NoopStep.get_type_string(), step_kwargs={}),
+                        Step(
+                            name="play-message",
+                            step_type=PlayMessageStep.get_type_string(),
+                            step_kwargs={"template": "Goodbye"},
+                            exit_path={"exit_path_type": HangUpExitPath.get_type_string()}
+                        ),
+                    ]
+                )
+            ]
+        )).create()
+        workflow_run = WorkflowRun(workflow=workflow, workflow_config=workflow.latest_config)
+        db_session.add(workflow_run)
+        db_session.commit()
+        return workflow_run
+
+    def test_pure_steps_are_committed_at_the_next_checkpoint(self, db_session: SQLAlchemySession,
+                                                             pure_steps_workflow_run: WorkflowRun):
+        workflow_run = pure_steps_workflow_run
+        engine = WorkflowEngine(db_session, workflow_run)
+        engine.initialize()
+        engine.run_current_workflow_step()
+        commits = []
+
+        def on_commit(session):
+            commits.append(session)
+
+        event.listen(db_session, "after_commit", on_commit)
+        try:
+            # Only initializing the play message step, which is not pure, commits
+            result, next_step_or_exit = engine.run_current_workflow_step()
+            assert isinstance(next_step_or_exit, PlayMessageStep)
+            assert len(commits) == 1
+        finally:
+            event.remove(db_session, "after_commit", on_commit)
+        result, next_step_or_exit = engine.run_current_workflow_step()
+        assert isinstance(next_step_or_exit, HangUpExitPath)
+        assert workflow_run.step_run_count == 3
+
+    def test_failing_pure_step_commits_its_error(self, db_session: SQLAlchemySession,
+                                                pure_steps_workflow_run: WorkflowRun):
+        engine = WorkflowEngine(db_session, pure_steps_workflow_run)
+        engine.initialize()
+        with patch.object(NoopStep, "run", autospec=True, side_effect=lambda step: step.save_result(
+                result=StepError(msg="A retryable step error occurred", retryable=True))):
+            result, next_step_or_exit = engine.run_current_workflow_step()
+        assert isinstance(result, StepError)
+        # Anything only flushed would be lost by the rollback
+        db_session.rollback()
+        assert engine.step_engine.get_current_step_run().state.error
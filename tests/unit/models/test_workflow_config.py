@@ -1,3 +1,4 @@
+from datetime import datetime
 from uuid import uuid4
 
 import pytest
@@ -7,7 +8,7 @@ from ivr_gateway.engines.workflows import WorkflowEngine
 from ivr_gateway.exceptions import NonUpdateableModelError
 from ivr_gateway.exit_paths import HangUpExitPath
 from ivr_gateway.models.contacts import Contact, Greeting, InboundRouting, ContactLeg
-from ivr_gateway.models.workflows import WorkflowConfig, Workflow, WorkflowRun
+from ivr_gateway.models.workflows import WorkflowConfig, Workflow, WorkflowRun, ResolvedConfig, resolved_config_cache
 from ivr_gateway.steps.api.v1 import PlayMessageStep, InputActionStep
 from ivr_gateway.steps.config import StepTree, StepBranch, Step
 from tests.factories import workflow as wcf
@@ -127,3 +128,44 @@ class TestWorkflowConfigs:
             db_session.commit()
 
 
+
+    def test_first_run_marks_config(self, db_session: orm.Session, workflow: Workflow):
+        workflow_config = workflow.latest_config
+        assert not workflow_config.has_runs
+        run = WorkflowRun(workflow=workflow, workflow_config=workflow_config)
+        db_session.add(run)
+        db_session.commit()
+        assert workflow_config.first_run_at == run.created_at
+        db_session.add(WorkflowRun(workflow=workflow, workflow_config=workflow_config))
+        db_session.commit()
+        db_session.refresh(workflow_config)
+        assert workflow_config.first_run_at == run.created_at
+
+    def test_config_run_from_another_session_cannot_be_updated(self, db_session: orm.Session, workflow: Workflow):
+        workflow_config = workflow.latest_config
+        table = WorkflowConfig.__table__
+        db_session.execute(table.update()
+                           .where(table.c.id == workflow_config.id)
+                           .values(first_run_at=datetime.utcnow()))
+        assert not workflow_config.has_runs
+        workflow_config.step_tree = StepTree(branches=[])
+        db_session.add(workflow_config)
+        with pytest.raises(NonUpdateableModelError):
+            db_session.commit()
+
+    def test_active_config_resolved_until_changed(self, monkeypatch, db_session: orm.Session, workflow: Workflow):
+        monkeypatch.setenv("IVR_CONFIG_CACHE_LOCAL_ONLY", "true")
+        initial_wc = workflow.active_config
+        assert resolved_config_cache.get_or_load((workflow.id, "latest"), lambda: None) == \
+            ResolvedConfig(initial_wc.id, initial_wc.step_tree_sha)
+        assert workflow.active_config is initial_wc
+        # Committing a new config evicts the resolved one
+        wc = WorkflowConfig(workflow=workflow, step_tree=StepTree(branches=[]), tag="v2")
+        db_session.add(wc)
+        db_session.commit()
+        assert len(resolved_config_cache) == 0
+        assert workflow.active_config == wc
+        workflow.active_config_tag = initial_wc.step_tree_sha
+        db_session.add(workflow)
+        db_session.commit()
+        assert workflow.active_config == initial_wc
@@ -5,7 +5,7 @@ import pytest
 from ivr_gateway.models.admin import AdminUser, AdminPhoneNumber, AdminCall, ScheduledCall, AdminCallFrom, AdminCallTo
 from ivr_gateway.models.contacts import Greeting, InboundRouting
 from ivr_gateway.models.workflows import Workflow
-from ivr_gateway.services.admin import AdminService
+from ivr_gateway.services.admin import ADMIN_PHONE_NUMBER_IDS_KEY, AdminService, admin_phone_number_ids_cache
 
 from tests.factories import workflow as wcf
 from tests.fixtures.step_trees.loan_origination import loan_origination_step_tree
@@ -157,6 +157,20 @@ class TestAdmin:
         result = admin_service.find_admin_phone_number(admin_phone_number.phone_number)
         assert result.id == admin_phone_number.id
 
+    def test_find_admin_phone_number_cached_until_changed(self, monkeypatch, db_session, admin_service, admin_user):
+        monkeypatch.setenv("IVR_CONFIG_CACHE_LOCAL_ONLY", "true")
+        assert admin_service.find_admin_phone_number("15555550100") is None
+        assert admin_service.find_admin_phone_number("15555550101") is None
+        # Misses for any number of callers share the one cached entry
+        assert len(admin_phone_number_ids_cache) == 1
+        assert "15555550100" not in admin_phone_number_ids_cache.get_or_load(ADMIN_PHONE_NUMBER_IDS_KEY, dict)
+        # Committing a new admin number evicts the cached numbers
+        admin_service.create_admin_phone_number(admin_user.short_id, "desk", "15555550100")
+        assert len(admin_phone_number_ids_cache) == 0
+        result = admin_service.find_admin_phone_number("15555550100")
+        assert result.phone_number == "15555550100"
+        assert admin_service.find_admin_phone_number("15555550100").id == result.id
+
     def test_find_admin_user_by_phone_number(self, db_session, admin_service, admin_phone_number, admin_user):
         result = admin_service.find_admin_user_by_phone_number(admin_phone_number.phone_number)
         assert result.id == admin_user.id
@@ -1,10 +1,11 @@
 import pytest
 from datetime import datetime, timedelta
 
-from ivr_gateway.models.contacts import TransferRouting
+from ivr_gateway.models.contacts import TransferRouting, InboundRouting, Greeting
 from ivr_gateway.models.queues import Queue
 from ivr_gateway.services.calls import CallService
 from tests.factories import queues as qf
+from tests.factories import workflow as wcf
 
 from tests.factories import calls as cf
 
@@ -188,3 +189,21 @@ class TestCallsService:
         call_service = CallService(db_session)
         test_call_leg = test_call.contact_legs[0]
         assert call_service.get_sip_headers(test_call_leg) == headers
+
+    def test_workflow_lineage(self, db_session, queue):
+        main_menu = wcf.workflow_factory(db_session, "Iivr.main_menu").create()
+        banking_menu = wcf.workflow_factory(db_session, "shared.ivr.banking_menu").create()
+        greeting = Greeting(message="hello")
+        call_routing = InboundRouting(inbound_target=DNIS, workflow=main_menu, active=True, greeting=greeting,
+                                      operating_mode="normal", initial_queue=queue)
+        db_session.add_all([greeting, call_routing])
+        db_session.commit()
+
+        call_service = CallService(db_session)
+        call = call_service.create_call("twilio", "test", call_routing, ANI1, DNIS)
+        assert call.visited_workflows == ["Iivr.main_menu"]
+        call_service.transfer_call_leg_to_workflow(call.contact_legs[0], "shared.ivr.banking_menu")
+        call_service.transfer_call_leg_to_workflow(call.contact_legs[1], "Iivr.main_menu")
+        assert call.visited_workflows == ["Iivr.main_menu", "shared.ivr.banking_menu"]
+        assert call.visited_workflow_configs == [f"Iivr.main_menu:{main_menu.configs[0].step_tree_sha}",
+                                                 f"shared.ivr.banking_menu:{banking_menu.configs[0].step_tree_sha}"]
@@ -7,6 +7,8 @@ import requests
 from datetime import timedelta
 from json import JSONDecodeError
 
+from ivr_gateway.app import app
+from ivr_gateway.deadline import start_deadline
 from ivr_gateway.models.contacts import Contact, ContactLeg
 from ivr_gateway.models.queues import Queue
 from ivr_gateway.services.amount.customer import CustomerSummaryService
@@ -207,3 +209,34 @@ class TestCustomerService:
             application_id = customer_service.application_field_lookup(call, "id")
             assert application_id == 123025289
             assert mock_get.call_count == 2
+
+    def test_spent_deadline_skips_request(self, db_session, call, call_leg):
+        with app.test_request_context(), patch.object(requests, "get") as mock_get:
+            deadline = start_deadline(0)
+            customer_service = CustomerSummaryService(db_session, call)
+            assert customer_service.get_customer_summary(call) == 0
+            assert mock_get.call_count == 0
+            assert deadline.skipped_requests == 1
+
+    def test_summary_is_stored_out_of_the_session(self, db_session, call, call_leg, customer_product_dict):
+        mock_customer = Mock()
+        mock_customer.json.return_value = customer_product_dict
+        mock_customer.status_code = 200
+        with patch.object(requests, "get", return_value=mock_customer) as mock_get:
+            customer_service = CustomerSummaryService(db_session, call)
+            customer_service.download_info_if_not_cached(call)
+            customer_service.download_info_if_not_cached(call)
+            assert mock_get.call_count == 1
+        assert "customer_summary" not in call.session
+        assert call.payloads["customer_summary"].payload == customer_product_dict
+        assert call.get_payload("customer_summary") == customer_product_dict
+
+    def test_summary_stored_in_session_is_still_read(self, db_session, call, call_leg, customer_product_dict):
+        call.session = {"customer_summary": customer_product_dict}
+        db_session.add(call)
+        db_session.commit()
+        with patch.object(requests, "get") as mock_get:
+            customer_service = CustomerSummaryService(db_session, call)
+            customer_service.download_info_if_not_cached(call)
+            assert mock_get.call_count == 0
+            assert customer_service.open_product_count(call) == 3
@@ -1,6 +1,7 @@
 
 import pytest
 
+from ivr_gateway.services import message
 from ivr_gateway.services.message import SimpleMessageService
 
 
@@ -18,3 +19,9 @@ class TestSimpleMessageService:
         monkeypatch.setenv("IVR_APP_ENV", "test")
         assert not message_service.get_message_by_key("nonexistent_key")
 
+    def test_message_config_is_read_once(self, monkeypatch, message_service: SimpleMessageService):
+        monkeypatch.setenv("IVR_APP_ENV", "test")
+        monkeypatch.setattr(message, "_message_configs", {})
+        assert message_service.get_message_by_key("test") == "This is a test"
+        monkeypatch.setattr(message, "open", lambda *args: pytest.fail("message config read twice"), raising=False)
+        assert message_service.get_message_by_key("test") == "This is a test"
@@ -0,0 +1,10 @@
+from ivr_gateway.services.webhooks import webhook_payload_hash
+
+
+def test_webhook_payload_hash():
+    form = [("CallSid", "test"), ("Digits", "1")]
+    assert webhook_payload_hash(form, "token-1") == webhook_payload_hash(list(reversed(form)), "token-1")
+    assert webhook_payload_hash(form, "token-1") != webhook_payload_hash(form, "token-2")
+    assert webhook_payload_hash(form, "token-1") != webhook_payload_hash([("CallSid", "test"), ("Digits", "2")],
+                                                                         "token-1")
+    assert len(webhook_payload_hash(form, "token-1")) == 64
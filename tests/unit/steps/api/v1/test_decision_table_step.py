@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import orm
+
+from ivr_gateway.engines.steps import StepEngine, StepEngineState
+from ivr_gateway.models.steps import StepRun
+from ivr_gateway.steps.api.v1 import DecisionTableStep
+from ivr_gateway.steps.config import Step
+from ivr_gateway.steps.result import StepError, StepSuccess
+
+from tests.unit.steps import BaseStepTestMixin
+
+RULES = [
+    {"fieldset": ["session.card_count", 0], "op": ">", "branch": "step-tree-branch-card"},
+    {"fieldset": ["session.loan_id"], "op": "nonnull", "branch": "root"},
+]
+
+
+class TestDecisionTableStep(BaseStepTestMixin):
+
+    def initialize_decision_table(self, db_session: orm.Session, workflow_session: dict, rules=None, default_branch=None):
+        step_template = Step(
+            name="step-1",
+            step_type=DecisionTableStep.get_type_string(),
+            step_kwargs={
+                "rules": rules or RULES,
+                "default_branch": default_branch,
+            },
+        )
+        call, \
+            call_leg, \
+            call_routing, \
+            greeting, \
+            workflow, \
+            workflow_run, \
+            step = self.create_test_objects_for_step_template(db_session, step_template,
+                                                              workflow_session=workflow_session)
+        engine = StepEngine(db_session, workflow_run)
+        engine.initialize(step)
+        return engine
+
+    def test_first_rule_that_holds_picks_the_branch(self, db_session: orm.Session):
+        engine = self.initialize_decision_table(db_session, {"card_count": 0, "loan_id": 1234})
+        result = engine.run_step()
+        assert isinstance(result, StepSuccess)
+        assert result.result == "root"
+        step_run: StepRun = db_session.query(StepRun).first()
+        assert step_run.state.result["value"] == "root"
+        assert engine.state == StepEngineState.step_complete
+
+    def test_default_branch(self, db_session: orm.Session):
+        engine = self.initialize_decision_table(db_session, {"card_count": 0, "loan_id": None}, default_branch="root")
+        assert engine.run_step().result == "root"
+
+    def test_invalid_branch_is_an_error(self, db_session: orm.Session):
+        engine = self.initialize_decision_table(db_session, {"card_count": 2, "loan_id": None})
+        with pytest.raises(StepError):
+            engine.run_step()
+
+    def test_fields_are_read_once(self):
+        step = DecisionTableStep("step-1", rules=RULES + [
+            {"fieldset": ["session.loan_id", "session.card_count"], "op": "==", "branch": "root"},
+        ])
+        assert step.fields == ["session.card_count", "session.loan_id"]
+
+    def test_invalid_rules(self):
+        with pytest.raises(ValueError):
+            DecisionTableStep("step-1", rules=[{"fieldset": ["session.loan_id"], "op": "~", "branch": "root"}])
+        with pytest.raises(ValueError):
+            DecisionTableStep("step-1", rules=[{"fieldset": ["session.loan_id"], "op": "==", "branch": "root"}])
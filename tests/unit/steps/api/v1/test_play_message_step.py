@@ -6,6 +6,7 @@ from sqlalchemy import orm
 from ivr_gateway.engines.steps import StepEngine, StepEngineState
 from ivr_gateway.models.steps import StepRun
 from ivr_gateway.steps.api.v1 import PlayMessageStep
+from ivr_gateway.steps.api.v1.play_message import compile_template
 from ivr_gateway.steps.config import Step
 from ivr_gateway.steps.result import StepSuccess
 from tests.unit.steps import BaseStepTestMixin
@@ -386,3 +387,9 @@ class TestPlayMessageStep(BaseStepTestMixin):
         assert not step_run.state.error
         assert step_run.state.result["value"] == expected_message
         assert engine.state == StepEngineState.step_complete
+
+    def test_steps_share_compiled_template(self):
+        first = PlayMessageStep("first", template="Hello {{ session.name }}")
+        second = PlayMessageStep("second", template="Hello {{ session.name }}")
+        assert first._message_template is second._message_template
+        assert compile_template("Hello {{ session.name }}") is first._message_template
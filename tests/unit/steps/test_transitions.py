@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+from ivr_gateway.exit_paths import HangUpExitPath
+from ivr_gateway.models.workflows import WorkflowRun
+from ivr_gateway.steps.api.v1 import PlayMessageStep
+from ivr_gateway.steps.base import DEFAULT_RETRY_COUNT
+from ivr_gateway.steps.config import Step, StepBranch, StepTree
+from ivr_gateway.steps.transitions import TransitionTable, transition_table
+
+
+class TestTransitionTable:
+
+    @staticmethod
+    def step(name: str, exit_path: dict = None) -> Step:
+        return Step(name=name, step_type=PlayMessageStep.get_type_string(), step_kwargs={"template": name},
+                    exit_path=exit_path)
+
+    def step_tree(self) -> StepTree:
+        return StepTree(branches=[
+            StepBranch(name="root", steps=[self.step("step-1"), self.step("step-2")]),
+            StepBranch(name="other", steps=[
+                self.step("step-1"),
+                self.step("hang-up", exit_path={"exit_path_type": HangUpExitPath.get_type_string()}),
+            ]),
+        ])
+
+    def test_positions(self):
+        table = TransitionTable(self.step_tree())
+        assert table.branch_index("root") == 0
+        assert table.branch_index("other") == 1
+        assert table.branch_index("missing") is None
+        assert table.transition("root", "step-2").step_index == 1
+        assert table.transition("other", "step-1").branch_index == 1
+        assert table.transition("root", "hang-up") is None
+
+    def test_exit_paths_are_resolved_when_compiled(self):
+        table = TransitionTable(self.step_tree())
+        assert table.transition("root", "step-1").exit_path_type is None
+        transition = table.transition("other", "hang-up")
+        assert transition.exit_path_class is HangUpExitPath
+        assert isinstance(transition.create_exit_path(), HangUpExitPath)
+
+    def test_tables_are_shared_by_sha(self):
+        assert transition_table(self.step_tree(), "sha") is transition_table(self.step_tree(), "sha")
+        assert transition_table(self.step_tree(), None) is not transition_table(self.step_tree(), None)
+
+    def test_retry_count_ignores_stale_positions(self):
+        step_tree = self.step_tree()
+        step_tree.branches[0].steps[1].step_kwargs["retry_count"] = 5
+        workflow_run = SimpleNamespace(workflow_config=SimpleNamespace(step_tree=step_tree, step_tree_sha="edited"),
+                                       current_step_branch_name="root")
+        transition_table(step_tree, "edited")
+        assert WorkflowRun.get_step_retry_count(workflow_run, "root", "step-2") == 5
+        # Edited in memory without recomputing the sha, the cached table still has step-2 at index 1
+        step_tree.branches[0].steps.pop(0)
+        assert WorkflowRun.get_step_retry_count(workflow_run, "root", "step-2") == 5
+        step_tree.branches[0].steps.pop(0)
+        assert WorkflowRun.get_step_retry_count(workflow_run, "root", "step-2") == DEFAULT_RETRY_COUNT
@@ -0,0 +1,33 @@
+from types import SimpleNamespace
+
+import pytest
+
+from ivr_gateway.steps.exceptions import FieldParsingException
+from ivr_gateway.steps.utils import get_field, parse_field
+
+
+class TestFieldAccessors:
+
+    def test_references_are_compiled_once(self):
+        assert parse_field("session.customer.id") is parse_field("session.customer.id")
+        extractor, extraction_tokens = parse_field("session.customer.id")
+        assert extraction_tokens == ["customer", "id"]
+
+    def test_session_fields(self):
+        workflow_run = SimpleNamespace(session={"customer": {"id": 1234}, "loan_id": None})
+        assert get_field("session.customer.id", workflow_run) == 1234
+        assert get_field("session.loan_id", workflow_run) is None
+        assert get_field("static value", workflow_run) == "static value"
+        assert get_field(42, workflow_run) == 42
+        with pytest.raises(KeyError):
+            get_field("session.customer.name", workflow_run)
+
+    def test_step_fields(self):
+        step_state = SimpleNamespace(result={"value": "1"})
+        workflow_run = SimpleNamespace(get_step_run_state=lambda branch, step: step_state)
+        assert get_field("step[root:menu].result.value", workflow_run) == "1"
+
+    def test_invalid_references_raise_every_time(self):
+        for _ in range(2):
+            with pytest.raises(FieldParsingException):
+                parse_field("step[root:menu].output.value")
@@ -0,0 +1,46 @@
+from ivr_gateway.admission import AdmissionController, queue_time_ms, render_shed_response
+from ivr_gateway.app import app
+
+
+class TestAdmissionController:
+
+    def test_sheds_only_sheddable_requests(self):
+        controller = AdmissionController(shed_new_calls_at=2, shed_new_calls_queue_ms=0)
+        with app.test_request_context("/api/v1/twilio/new", method="POST") as context:
+            with controller.admit(context.request, sheddable=False) as admitted:
+                assert admitted
+                with controller.admit(context.request, sheddable=True) as admitted_new:
+                    assert not admitted_new
+                with controller.admit(context.request, sheddable=False) as admitted_continue:
+                    assert admitted_continue
+            with controller.admit(context.request, sheddable=True) as admitted:
+                assert admitted
+        assert controller.in_flight == 0
+        assert controller.snapshot()["shed"] == 1
+        assert controller.snapshot()["admitted"] == 3
+
+    def test_sheds_on_queue_time(self, monkeypatch):
+        controller = AdmissionController(shed_new_calls_at=10, shed_new_calls_queue_ms=500)
+        with app.test_request_context("/api/v1/twilio/new", method="POST",
+                                      headers={"X-Request-Start": "t=1000000000000"}) as context:
+            with controller.admit(context.request, sheddable=True) as admitted:
+                assert not admitted
+        with app.test_request_context("/api/v1/twilio/new", method="POST") as context:
+            with controller.admit(context.request, sheddable=True) as admitted:
+                assert admitted
+
+    def test_queue_time_ms(self):
+        headers = {"X-Request-Start": "t=1600000000.5"}
+        with app.test_request_context(headers=headers) as context:
+            assert queue_time_ms(context.request, now=1600000001) == 500
+        for header in ["1600000000500", "t=1600000000500000"]:
+            with app.test_request_context(headers={"X-Request-Start": header}) as context:
+                assert queue_time_ms(context.request, now=1600000001) == 500
+        for headers in [{}, {"X-Request-Start": "bogus"}]:
+            with app.test_request_context(headers=headers) as context:
+                assert queue_time_ms(context.request) is None
+
+    def test_render_shed_response(self):
+        assert "<Enqueue>overflow</Enqueue>" in render_shed_response(enqueue_queue="overflow")
+        response = render_shed_response(enqueue_queue=None, message="busy")
+        assert "<Say>busy</Say><Hangup />" in response
@@ -0,0 +1,50 @@
+import inspect
+
+from benchmarks import SUITE_VERSION, BenchmarkResult, baseline_results, find_regressions
+from benchmarks.startup import ImportTime, parse_import_times
+from benchmarks.steps import INPUT_SAMPLES
+from ivr_gateway.steps import inputs
+
+
+def test_input_samples_cover_every_input_type():
+    concrete_inputs = {
+        cls for _, cls in inspect.getmembers(inputs, inspect.isclass)
+        if issubclass(cls, inputs.StepInput) and cls is not inputs.StepInput and not cls.__name__.endswith("ABC")
+    }
+    assert concrete_inputs == set(INPUT_SAMPLES)
+
+
+def test_input_samples_bind():
+    for input_cls, sample in INPUT_SAMPLES.items():
+        step_input = input_cls(input_key="benchmark", **sample())
+        step_input.bind()
+        assert step_input.is_bound
+
+
+def test_find_regressions_uses_threshold():
+    results = [
+        BenchmarkResult("fast", 1.0, baseline=1.0),
+        BenchmarkResult("slightly-slower", 1.1, baseline=1.0),
+        BenchmarkResult("much-slower", 1.5, baseline=1.0),
+        BenchmarkResult("new-case", 5.0),
+    ]
+    assert [r.name for r in find_regressions(results, threshold=0.2)] == ["much-slower"]
+
+
+def test_baseline_results_ignores_other_suite_versions():
+    assert baseline_results({"suite_version": SUITE_VERSION, "results": {"a": 1.0}}) == {"a": 1.0}
+    assert baseline_results({"suite_version": SUITE_VERSION - 1, "results": {"a": 1.0}}) == {}
+    assert baseline_results(None) == {}
+
+
+def test_parse_import_times():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       412 |        412 |     ivr_gateway.steps.action\n"
+        "import time:      1390 |       1802 |   ivr_gateway.steps.inputs\n"
+        "some other warning\n"
+    )
+    assert parse_import_times(stderr) == [
+        ImportTime("ivr_gateway.steps.action", 412, 412),
+        ImportTime("ivr_gateway.steps.inputs", 1390, 1802),
+    ]
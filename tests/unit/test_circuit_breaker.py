@@ -0,0 +1,72 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from requests.exceptions import HTTPError, Timeout
+
+from ivr_gateway import circuit_breaker
+from ivr_gateway.circuit_breaker import CLOSED, HALF_OPEN, OPEN, BulkheadFullError, CircuitBreaker, \
+    CircuitOpenError, is_failure
+
+
+def fail(breaker: CircuitBreaker, exception=None):
+    with pytest.raises(Timeout):
+        with breaker.call():
+            raise exception or Timeout()
+
+
+def succeed(breaker: CircuitBreaker):
+    with breaker.call():
+        pass
+
+
+class TestCircuitBreaker:
+
+    @pytest.fixture
+    def breaker(self) -> CircuitBreaker:
+        return CircuitBreaker("amount_service.test", failure_rate_threshold=0.5, minimum_calls=4, window_size=4,
+                              open_seconds=30, half_open_probes=1, max_concurrent_calls=2)
+
+    def test_opens_at_failure_rate(self, breaker):
+        succeed(breaker)
+        succeed(breaker)
+        fail(breaker)
+        assert breaker.state == CLOSED
+        fail(breaker)
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            succeed(breaker)
+        assert breaker.rejected_calls == 1
+
+    def test_half_open_probe_closes(self, breaker):
+        for _ in range(4):
+            fail(breaker)
+        assert breaker.state == OPEN
+        with patch.object(circuit_breaker.time, "monotonic", return_value=breaker.opened_at + 31):
+            with breaker.call():
+                assert breaker.state == HALF_OPEN
+                # Only one probe at a time
+                with pytest.raises(CircuitOpenError):
+                    succeed(breaker)
+        assert breaker.state == CLOSED
+        assert breaker.failure_rate == 0
+
+    def test_half_open_probe_failure_reopens(self, breaker):
+        for _ in range(4):
+            fail(breaker)
+        with patch.object(circuit_breaker.time, "monotonic", return_value=breaker.opened_at + 31):
+            fail(breaker)
+        assert breaker.state == OPEN
+
+    def test_bulkhead(self, breaker):
+        with breaker.call(), breaker.call():
+            with pytest.raises(BulkheadFullError):
+                succeed(breaker)
+        assert breaker.in_flight == 0
+        succeed(breaker)
+
+    def test_client_errors_do_not_count(self):
+        assert not is_failure(HTTPError(response=Mock(status_code=404)))
+        assert is_failure(HTTPError(response=Mock(status_code=503)))
+        assert is_failure(Timeout())
+        assert not is_failure(CircuitOpenError())
+        assert not is_failure(ValueError())
@@ -0,0 +1,34 @@
+import sys
+from datetime import datetime
+
+import pytest
+
+from ivr_gateway.dates import DTMF_DATE_FORMAT, parse_date
+
+
+@pytest.mark.parametrize("value, date_formats, expected", [
+    ("01151990", [DTMF_DATE_FORMAT], datetime(1990, 1, 15)),
+    (" 09152021 ", [DTMF_DATE_FORMAT], datetime(2021, 9, 15)),
+    ("2021-09-15", [DTMF_DATE_FORMAT], datetime(2021, 9, 15)),
+    ("2021-09-15", [], datetime(2021, 9, 15)),
+    ("2021-09-15T10:30:00", [], datetime(2021, 9, 15, 10, 30)),
+    ("13451990", [DTMF_DATE_FORMAT], None),
+    ("20210915", [], None),
+    ("", [DTMF_DATE_FORMAT], None),
+    (None, [DTMF_DATE_FORMAT], None),
+])
+def test_parse_date(value, date_formats, expected):
+    assert parse_date(value, date_formats=date_formats) == expected
+
+
+def test_parse_date_falls_back_to_dateparser_for_free_form_input():
+    assert parse_date("September 15, 2021") == datetime(2021, 9, 15)
+    assert parse_date("not a date") is None
+
+
+def test_parse_date_fixed_formats_do_not_load_dateparser(monkeypatch):
+    # A None entry makes `import dateparser` raise ImportError
+    monkeypatch.setitem(sys.modules, "dateparser", None)
+    assert parse_date("01151990", date_formats=[DTMF_DATE_FORMAT]) == datetime(1990, 1, 15)
+    assert parse_date("2021-09-15") == datetime(2021, 9, 15)
+    assert parse_date("99999999", date_formats=[DTMF_DATE_FORMAT]) is None
@@ -0,0 +1,38 @@
+import pytest
+from flask import Flask
+
+from ivr_gateway.deadline import Deadline, DeadlineExceeded, MINIMUM_REQUEST_SECONDS, current_deadline, \
+    request_timeout, start_deadline
+
+
+@pytest.fixture
+def request_context():
+    with Flask(__name__).test_request_context():
+        yield
+
+
+def test_request_timeout_without_deadline():
+    assert request_timeout(5) == 5
+
+
+def test_request_timeout_capped_by_deadline(request_context):
+    deadline = start_deadline(2)
+    assert current_deadline() is deadline
+    assert request_timeout(5) <= 2
+    assert request_timeout(1) == 1
+    assert deadline.truncated_requests == 1
+
+
+def test_request_skipped_when_deadline_spent(request_context):
+    deadline = start_deadline(MINIMUM_REQUEST_SECONDS / 2)
+    with pytest.raises(DeadlineExceeded):
+        request_timeout(5)
+    assert deadline.skipped_requests == 1
+
+
+def test_as_tags():
+    deadline = Deadline(0)
+    tags = deadline.as_tags()
+    assert tags["deadline.remaining_ms"] <= 0
+    assert tags["deadline.skipped_requests"] == 0
+    assert tags["deadline.truncated_requests"] == 0
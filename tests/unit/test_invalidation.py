@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from ivr_gateway import invalidation
+from ivr_gateway.invalidation import ConfigCache, build_payloads, parse_payload
+
+
+class TestConfigCache:
+
+    @pytest.fixture(autouse=True)
+    def local_only(self, monkeypatch):
+        monkeypatch.setenv("IVR_CONFIG_CACHE_LOCAL_ONLY", "true")
+
+    @pytest.fixture
+    def cache(self, monkeypatch) -> ConfigCache:
+        monkeypatch.setattr(invalidation, "_caches", [])
+        return ConfigCache("test", ["inbound_routing"])
+
+    def test_serves_loaded_values(self, cache):
+        assert cache.get_or_load("15555555555", lambda: "routing-1") == "routing-1"
+        assert cache.get_or_load("15555555555", lambda: "routing-2") == "routing-1"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_only_dependent_tables_invalidate(self, cache):
+        cache.get_or_load("15555555555", lambda: "routing-1")
+        invalidation.invalidate([("queue", "a")])
+        assert len(cache) == 1
+        invalidation.invalidate([("inbound_routing", None)])
+        assert len(cache) == 0
+
+    def test_value_loaded_across_invalidation_is_not_stored(self, cache):
+        def loader():
+            invalidation.invalidate([("inbound_routing", "a")])
+            return "stale"
+
+        assert cache.get_or_load("15555555555", loader) == "stale"
+        assert len(cache) == 0
+
+    def test_uncached_without_listener(self, cache, monkeypatch):
+        monkeypatch.setenv("IVR_CONFIG_CACHE_LOCAL_ONLY", "false")
+        monkeypatch.setenv("IVR_CONFIG_CACHE_LISTENER", "false")
+        cache.get_or_load("15555555555", lambda: "routing-1")
+        assert cache.get_or_load("15555555555", lambda: "routing-2") == "routing-2"
+
+    def test_unpublished_tables_rejected(self):
+        with pytest.raises(ValueError):
+            ConfigCache("test", ["contact"])
+
+
+def test_payload_round_trip():
+    changes = {("queue", "b"), ("inbound_routing", "a"), ("workflow", None)}
+    payloads = build_payloads(changes)
+    assert len(payloads) == 1
+    assert set(parse_payload(payloads[0])) == changes
+
+
+def test_oversized_payload_falls_back_to_tables():
+    changes = {("inbound_routing", str(i) * 40) for i in range(500)} | {("queue", "a")}
+    payloads = build_payloads(changes)
+    assert [json.loads(payload) for payload in payloads] == [[["inbound_routing", None]], [["queue", None]]]
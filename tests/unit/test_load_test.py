@@ -0,0 +1,38 @@
+from commands.load_test import build_dtmf_script, percentile, DEFAULT_DIGITS
+from ivr_gateway.steps.api.v1 import InputStep, NumberedInputActionStep, PlayMessageStep
+from ivr_gateway.steps.config import StepTree, StepBranch, Step
+from ivr_gateway.steps.inputs import BirthdayInput, ZipCodeInput
+
+
+def test_build_dtmf_script_follows_root_branch_inputs():
+    step_tree = StepTree(branches=[
+        StepBranch(name="root", steps=[
+            Step(name="greeting", step_type=PlayMessageStep.get_type_string(), step_kwargs={"template": "Hi"}),
+            Step(name="menu", step_type=NumberedInputActionStep.get_type_string(), step_kwargs={
+                "input_key": "menu",
+                "actions": [
+                    {"name": "repeat", "display_name": "To hear this again", "number": "9", "is_replay": True},
+                    {"name": "pay", "display_name": "To make a payment", "number": "2"},
+                ]
+            }),
+            Step(name="dob", step_type=InputStep.get_type_string(), step_kwargs={
+                "input_key": "dob", "input_type": BirthdayInput.get_type_string()
+            }),
+            Step(name="zip", step_type=InputStep.get_type_string(), step_kwargs={
+                "input_key": "zip", "input_type": ZipCodeInput.get_type_string()
+            }),
+            Step(name="anything", step_type=InputStep.get_type_string(), step_kwargs={"input_key": "anything"}),
+        ]),
+        StepBranch(name="other", steps=[
+            Step(name="ignored", step_type=InputStep.get_type_string(), step_kwargs={"input_key": "ignored"}),
+        ]),
+    ])
+    assert build_dtmf_script(step_tree) == ["2", "01151990", "10001", DEFAULT_DIGITS]
+
+
+def test_percentile_uses_nearest_rank():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile([], 99) == 0.0
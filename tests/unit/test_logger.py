@@ -0,0 +1,84 @@
+import logging
+
+from ivr_gateway.logger import BoundedQueueHandler, DropReportingQueueListener, enable_queued_logging, \
+    flush_queued_logging, log_queue_dropped_count
+
+
+class CollectingHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestQueuedLogging:
+
+    def test_full_queue_drops_and_counts(self):
+        handler = BoundedQueueHandler(maxsize=2)
+        logger = logging.getLogger("tests.logger.full")
+        logger.propagate = False
+        logger.addHandler(handler)
+        try:
+            for i in range(5):
+                logger.warning("record %s", i)
+        finally:
+            logger.removeHandler(handler)
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+
+    def test_prepare_interpolates_message_and_keeps_request_id(self):
+        handler = BoundedQueueHandler(maxsize=1)
+        record = logging.makeLogRecord({"msg": "step: %s", "args": ("greeting",)})
+        prepared = handler.prepare(record)
+        assert prepared.msg == "step: greeting"
+        assert prepared.args is None
+        assert prepared.request_id == "NA"
+
+    def test_listener_reports_drops(self):
+        collector = CollectingHandler()
+        handler = BoundedQueueHandler(maxsize=10)
+        listener = DropReportingQueueListener(handler, collector)
+        handler.dropped = 4
+        # respect_handler_level compares levelno, which makeLogRecord leaves unset
+        listener.handle(logging.makeLogRecord({
+            "levelno": logging.INFO,
+            "levelname": logging.getLevelName(logging.INFO),
+            "msg": "after the drops",
+        }))
+        assert [r.getMessage() for r in collector.records] == [
+            "log queue full, dropped 4 records (4 total)",
+            "after the drops",
+        ]
+
+    def test_flush_drains_queue(self):
+        collector = CollectingHandler()
+        logger = logging.getLogger("tests.logger.flush")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.addHandler(collector)
+        queue_handler = enable_queued_logging(logger, maxsize=100)
+        try:
+            for i in range(20):
+                logger.info("record %s", i)
+            flush_queued_logging()
+        finally:
+            logger.removeHandler(queue_handler)
+        # Every record reached the target handler, with no drop warning among them
+        assert [r.getMessage() for r in collector.records] == [f"record {i}" for i in range(20)]
+        assert queue_handler.dropped == 0
+
+    def test_dropped_count_covers_running_listeners(self):
+        logger = logging.getLogger("tests.logger.dropped")
+        logger.propagate = False
+        logger.addHandler(CollectingHandler())
+        queue_handler = enable_queued_logging(logger, maxsize=100)
+        try:
+            queue_handler.dropped = 3
+            assert log_queue_dropped_count() == 3
+        finally:
+            flush_queued_logging()
+            logger.removeHandler(queue_handler)
+        assert log_queue_dropped_count() == 0
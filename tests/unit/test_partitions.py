@@ -0,0 +1,97 @@
+from datetime import date, datetime
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from ivr_gateway.models.all_db import Base
+from ivr_gateway.partitions import AUDIT_PARTITIONED_TABLES, add_months, attach_partition_statement, \
+    create_default_partition_statement, create_partition, create_partition_statement, month_start, \
+    partition_bounds_check_statement, partition_month, partition_name
+
+
+@pytest.mark.parametrize("value, months, expected", [
+    (date(2021, 1, 1), 1, date(2021, 2, 1)),
+    (date(2021, 12, 1), 1, date(2022, 1, 1)),
+    (date(2021, 1, 1), -1, date(2020, 12, 1)),
+    (date(2021, 6, 1), -18, date(2019, 12, 1)),
+])
+def test_add_months(value, months, expected):
+    assert add_months(value, months) == expected
+
+
+def test_partition_name_round_trips():
+    month = month_start(datetime(2021, 9, 17, 12, 30))
+    name = partition_name("contact_leg", month)
+    assert name == "contact_leg_p202109"
+    assert partition_month(name) == date(2021, 9, 1)
+
+
+def test_partition_month_rejects_non_partition_names():
+    with pytest.raises(ValueError):
+        partition_month("contact_leg")
+
+
+def test_create_partition_statement_covers_whole_month():
+    statement = create_partition_statement("step_run", date(2021, 12, 15))
+    assert statement == ("CREATE TABLE IF NOT EXISTS step_run_p202112 PARTITION OF step_run "
+                         "FOR VALUES FROM ('2021-12-01') TO ('2022-01-01')")
+
+
+def test_create_default_partition_statement():
+    assert create_default_partition_statement("step_run") == \
+        "CREATE TABLE IF NOT EXISTS step_run_default PARTITION OF step_run DEFAULT"
+
+
+def test_reattach_statements_cover_whole_month():
+    assert partition_bounds_check_statement("step_run", date(2021, 12, 15)) == (
+        "ALTER TABLE step_run_p202112 ADD CONSTRAINT step_run_p202112_bounds CHECK (created_at IS NOT NULL AND "
+        "created_at >= '2021-12-01' AND created_at < '2022-01-01')"
+    )
+    assert attach_partition_statement("step_run", date(2021, 12, 15)) == \
+        "ALTER TABLE step_run ATTACH PARTITION step_run_p202112 FOR VALUES FROM ('2021-12-01') TO ('2022-01-01')"
+
+
+def test_partition_statements_reject_other_tables():
+    with pytest.raises(ValueError):
+        create_partition_statement("step_run; DROP TABLE contact", date(2021, 12, 15))
+    with pytest.raises(ValueError):
+        create_default_partition_statement("contact")
+    with pytest.raises(ValueError):
+        create_partition(_connection(), "contact", date(2021, 12, 15))
+
+
+def _connection(*scalars) -> Mock:
+    connection = Mock()
+    connection.dialect = postgresql.dialect()
+    connection.execute.return_value.scalar.side_effect = scalars
+    connection.execute.return_value.rowcount = 12
+    return connection
+
+
+def test_create_partition_skips_existing_partition():
+    connection = _connection("step_run_p202112")
+    assert create_partition(connection, "step_run", date(2021, 12, 15)) == 0
+    assert connection.execute.call_count == 1
+
+
+def test_create_partition_without_rows_in_default_partition():
+    connection = _connection(None, "step_run_default", False)
+    assert create_partition(connection, "step_run", date(2021, 12, 15)) == 0
+    connection.execute.assert_called_with(create_partition_statement("step_run", date(2021, 12, 1)))
+
+
+def test_create_partition_moves_rows_out_of_default_partition():
+    connection = _connection(None, "step_run_default", True)
+    assert create_partition(connection, "step_run", date(2021, 12, 15)) == 12
+    connection.execute.assert_called_with(
+        "ALTER TABLE step_run ATTACH PARTITION step_run_p202112 FOR VALUES FROM ('2021-12-01') TO ('2022-01-01')"
+    )
+
+
+@pytest.mark.parametrize("table_name", AUDIT_PARTITIONED_TABLES)
+def test_audit_models_match_partitioned_schema(table_name):
+    table = Base.metadata.tables[table_name]
+    assert [column.name for column in table.primary_key] == ["id", "created_at"]
+    assert [fk.target_fullname for fk in table.foreign_keys
+            if fk.target_fullname.split(".")[0] in AUDIT_PARTITIONED_TABLES] == []
@@ -0,0 +1,32 @@
+import pytest
+
+from ivr_gateway.query_stats import QueryStats, _collectors
+from tests.query_budget import query_budget
+
+
+class TestQueryStats:
+
+    def test_as_tags(self):
+        stats = QueryStats()
+        stats.statements = 3
+        stats.commits = 1
+        stats.rows = 7
+        stats.db_time = 0.0125
+        assert stats.as_tags() == {
+            "db.statements": 3,
+            "db.commits": 1,
+            "db.rows": 7,
+            "db.time_ms": 12.5,
+        }
+
+    def test_query_budget_exceeded(self):
+        with pytest.raises(AssertionError, match="at most 1 statements, 2 were executed"):
+            with query_budget(max_statements=1) as stats:
+                stats.statements += 2
+        assert _collectors == []
+
+    def test_query_budget_within_limits(self):
+        with query_budget(max_statements=2, max_commits=1) as stats:
+            stats.statements += 2
+            stats.commits += 1
+        assert _collectors == []
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from ivr_gateway.recent_transfers import RecentTransfers, _after_commit, _after_rollback, recent_transfers
+
+ANI = "15555555556"
+DNIS = "12345678901"
+
+
+def transferred_leg(ani: str = ANI, end_time: datetime = None) -> Mock:
+    contact = Mock(device_identifier=ani, global_id=f"twilio:{ani}", customer_id="71568378", secured_key="632776ab")
+    return Mock(contact=contact, end_time=end_time or datetime.now())
+
+
+class TestRecentTransfers:
+
+    def test_find(self):
+        transfers = RecentTransfers(size=10)
+        transfers.record(transferred_leg(), Mock(destination=DNIS))
+        transfer = transfers.find(ANI, DNIS)
+        assert transfer.global_id == f"twilio:{ANI}"
+        assert transfer.secured_key == "632776ab"
+        assert transfers.find(ANI, "15555555555") is None
+        assert transfers.find("15555555557", DNIS) is None
+        assert (transfers.hits, transfers.misses) == (1, 2)
+
+    def test_too_old(self):
+        transfers = RecentTransfers(size=10)
+        transfers.record(transferred_leg(end_time=datetime.now() - timedelta(minutes=2)), Mock(destination=DNIS))
+        assert transfers.find(ANI, DNIS) is None
+
+    def test_oldest_transfers_are_evicted(self):
+        transfers = RecentTransfers(size=2)
+        for ani in ["1", "2", "1", "3"]:
+            transfers.record(transferred_leg(ani), Mock(destination=DNIS))
+        assert len(transfers) == 2
+        assert transfers.find("2", DNIS) is None
+        assert transfers.find("1", DNIS) is not None
+        assert transfers.find("3", DNIS) is not None
+
+    def test_skips_unknown_ani(self):
+        transfers = RecentTransfers(size=2)
+        transfers.record(transferred_leg(ani=None), Mock(destination=DNIS))
+        assert len(transfers) == 0
+
+    def test_expired_transfers_are_dropped(self):
+        transfers = RecentTransfers(size=10)
+        transfers.record(transferred_leg("1"), Mock(destination=DNIS))
+        transfers.record(transferred_leg("2", end_time=datetime.now() - timedelta(minutes=2)), Mock(destination=DNIS))
+        assert len(transfers) == 1
+        transfers._transfers["1"] = transfers._transfers["1"]._replace(end_time=datetime.now() - timedelta(minutes=2))
+        assert transfers.find("1", DNIS) is None
+        assert len(transfers) == 0
+
+    def test_stale_transfer_recorded_after_fresh_one_is_dropped(self):
+        transfers = RecentTransfers(size=10)
+        transfers.record(transferred_leg("1"), Mock(destination=DNIS))
+        transfers.record(transferred_leg("2", end_time=datetime.now() - timedelta(minutes=2)), Mock(destination=DNIS))
+        assert list(transfers._transfers) == ["1"]
+
+    def test_newer_untransferred_leg_replaces_transfer(self):
+        transfers = RecentTransfers(size=10)
+        transfers.record(transferred_leg(), Mock(destination=DNIS))
+        transfers.record(transferred_leg(), None)
+        assert transfers.find(ANI, DNIS) is None
+        assert len(transfers) == 1
+        assert transfers._transfers[ANI].secured_key is None
+
+    def test_recorded_on_commit(self):
+        session = Mock(info={})
+        recent_transfers.record_on_commit(session, transferred_leg(), Mock(destination=DNIS))
+        assert recent_transfers.find(ANI, DNIS) is None
+        _after_commit(session)
+        assert recent_transfers.find(ANI, DNIS) is not None
+        assert session.info == {}
+
+    def test_not_recorded_on_rollback(self):
+        session = Mock(info={})
+        recent_transfers.record_on_commit(session, transferred_leg(), Mock(destination=DNIS))
+        _after_rollback(session)
+        _after_commit(session)
+        assert recent_transfers.find(ANI, DNIS) is None
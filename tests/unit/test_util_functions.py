@@ -1,5 +1,5 @@
 import pytest
-from ivr_gateway.utils import format_as_sentence, trailing_digits
+from ivr_gateway.utils import LOG_BODY_MAX_BYTES, format_as_sentence, redact_body, redact_headers, trailing_digits
 
 
 @pytest.mark.parametrize("msg, expected", [
@@ -22,3 +22,36 @@ def test_format_as_sentence(msg, expected):
 ])
 def test_trailing_digits(s, expected):
     assert trailing_digits(s) == expected
+
+
+@pytest.mark.parametrize("body, expected", [
+    (b"CallSid=abc&Digits=123456789&To=%2B15555555555", "CallSid=abc&Digits=[REDACTED]&To=%2B15555555555"),
+    (b'{"thread_id": "abc", "input": "01151990", "workflow": "main"}',
+     '{"thread_id": "abc", "input": "[REDACTED]", "workflow": "main"}'),
+    (b"CallSid=abc&CallStatus=completed", "CallSid=abc&CallStatus=completed"),
+    (b'<?xml version="1.0" encoding="UTF-8"?><Response><Say voice="Polly.Joanna">Hello Jane, your balance is '
+     b'$125.50</Say><Gather action="/continue" input="dtmf"><Say>Enter your date of birth</Say></Gather>'
+     b'<Gather action="/continue"/><Hangup/></Response>',
+     '<?xml version="1.0" encoding="UTF-8"?><Response><Say voice="Polly.Joanna">[REDACTED]</Say>'
+     '<Gather action="/continue" input="dtmf">[REDACTED]</Gather><Gather action="/continue"/><Hangup/></Response>'),
+])
+def test_redact_body(body, expected):
+    assert redact_body(body) == expected
+
+
+def test_redact_body_truncates():
+    body = b"a" * (LOG_BODY_MAX_BYTES + 10)
+    assert redact_body(body) == "a" * LOG_BODY_MAX_BYTES + f"...({LOG_BODY_MAX_BYTES + 10} bytes)"
+
+
+def test_redact_body_redacts_truncated_twiml():
+    body = b"<Response><Say>" + b"a" * LOG_BODY_MAX_BYTES + b"</Say></Response>"
+    assert redact_body(body) == f"<Response><Say>[REDACTED]...({len(body)} bytes)"
+
+
+def test_redact_headers():
+    assert redact_headers({"Authorization": "Bearer abc", "X-Twilio-Signature": "sig", "Host": "localhost"}) == {
+        "Authorization": "[REDACTED]",
+        "X-Twilio-Signature": "[REDACTED]",
+        "Host": "localhost",
+    }
@@ -0,0 +1,17 @@
+from commands.workflow_registry import StepTreeRegistry, workflow_step_tree_registry
+from ivr_gateway.steps.config import StepTree
+
+
+def test_registry_imports_step_tree_on_lookup():
+    registry = StepTreeRegistry({
+        "noop": "step_trees.shared.ivr.noop_queue_transfer:noop_queue_transfer_step_tree"
+    })
+    assert list(registry) == ["noop"]
+    assert registry._loaded == {}
+    assert isinstance(registry["noop"], StepTree)
+    assert list(registry._loaded) == ["noop"]
+
+
+def test_registry_entries_resolve():
+    for workflow_name in workflow_step_tree_registry:
+        assert isinstance(workflow_step_tree_registry[workflow_name], StepTree)